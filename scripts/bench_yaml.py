@@ -0,0 +1,79 @@
+"""
+Benchmark du chargement / de l'écriture d'un users.yml selon le nombre d'utilisateurs,
+avec l'implémentation Python pure de PyYAML et avec libyaml (CSafeLoader / CSafeDumper).
+
+Usage : uv run python scripts/bench_yaml.py [--sizes 1000 10000 100000] [--repeat 3]
+"""
+
+import argparse
+import random
+import time
+
+import yaml
+
+
+def make_users(count: int) -> dict:
+    """users.yml réaliste : compte lié + stats en cache pour les deux files."""
+    tiers = ["IRON", "BRONZE", "SILVER", "GOLD", "PLATINUM", "EMERALD", "DIAMOND"]
+    ranks = ["IV", "III", "II", "I"]
+
+    def ranked() -> dict:
+        wins, losses = random.randint(0, 300), random.randint(0, 300)
+        return {
+            "tier": random.choice(tiers),
+            "rank": random.choice(ranks),
+            "lp": random.randint(0, 99),
+            "wins": wins,
+            "losses": losses,
+            "winrate": round(wins / max(1, wins + losses) * 100, 1),
+        }
+
+    users = {}
+    for i in range(count):
+        discord_id = str(100_000_000_000_000_000 + i)
+        users[discord_id] = {
+            "puuid": f"{i:078d}",
+            "pseudo": f"Joueur{i}",
+            "tag": "EUW",
+            "cached_stats": {"name": f"Joueur{i}", "tag": "EUW", "level": random.randint(30, 800), "soloq": ranked(), "flex": ranked()},
+        }
+    return users
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    implementations = [("python", yaml.SafeLoader, yaml.SafeDumper)]
+    if hasattr(yaml, "CSafeLoader"):
+        implementations.append(("libyaml", yaml.CSafeLoader, yaml.CSafeDumper))
+    else:
+        print("⚠️ PyYAML compilé sans libyaml : seule l'implémentation Python est mesurée")
+
+    print(f"{'utilisateurs':>12} | {'impl':>8} | {'taille':>9} | {'load (s)':>9} | {'dump (s)':>9}")
+    print("-" * 60)
+
+    random.seed(0)
+    for size in args.sizes:
+        users = make_users(size)
+        text = yaml.dump(users, Dumper=yaml.SafeDumper, default_flow_style=False, allow_unicode=True)
+
+        for name, loader, dumper in implementations:
+            load_time = best_of(args.repeat, lambda: yaml.load(text, Loader=loader))
+            dump_time = best_of(args.repeat, lambda: yaml.dump(users, Dumper=dumper, default_flow_style=False, allow_unicode=True))
+            print(f"{size:>12} | {name:>8} | {len(text) / 1024 / 1024:>6.1f} Mo | {load_time:>9.3f} | {dump_time:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,21 +4,37 @@ from datetime import date, datetime
 from zoneinfo import ZoneInfo
 
 import discord
-import yaml
 from discord import app_commands
 from discord.ext import commands, tasks
 from loguru import logger
 
+from src.storage.yaml_store import YamlStore, default_store
+from src.utils.boards import edit_board
+from src.utils.embed_hash import EmbedHashes
+from src.utils.refresh_coordinator import RefreshCoordinator
+
 paris_tz = ZoneInfo("Europe/Paris")
 
 MOIS_FR = ["janvier", "février", "mars", "avril", "mai", "juin", "juillet", "août", "septembre", "octobre", "novembre", "décembre"]
 
 
 class Birthday(commands.Cog):
-    def __init__(self, bot: commands.Bot, db_path: str = "./data/birthdays.yml", config_path: str = "./data/birthday_config.yml"):
+    def __init__(
+        self,
+        bot: commands.Bot,
+        db_path: str = "./data/birthdays.yml",
+        config_path: str = "./data/birthday_config.yml",
+        store: YamlStore | None = None,
+    ):
         self.bot = bot
         self.db_path = db_path
         self.config_path = config_path
+        # Fichiers gardés en mémoire, écrits en différé
+        self.store = store or default_store
+        # Contenu déjà affiché par chaque message permanent (évite les edits sans changement)
+        self._board_hashes = EmbedHashes()
+        # Rafraîchissements demandés par les commandes, regroupés par serveur
+        self._display_refresher = RefreshCoordinator(self._refresh_displays)
 
         # Création des dossiers si nécessaire
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
@@ -32,29 +48,24 @@ class Birthday(commands.Cog):
     def cog_unload(self):
         """Arrêt des tâches au déchargement"""
         self.reminder_task.cancel()
+        self._display_refresher.cancel()
+        self.store.flush()
 
     # ============================================================================
     # GESTION DES DONNÉES (YAML)
     # ============================================================================
 
     def _load_data(self, path: str) -> dict:
-        """Charge un fichier YAML."""
-        if not os.path.exists(path):
-            return {}
+        """Charge un fichier YAML (lu une seule fois, puis servi depuis la mémoire)."""
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                return yaml.safe_load(f) or {}
+            return self.store.get(path)
         except Exception as e:
             logger.error(f"Erreur lecture YAML {path}: {e}")
             return {}
 
     def _save_data(self, path: str, data: dict):
-        """Sauvegarde des données dans un fichier YAML."""
-        try:
-            with open(path, "w", encoding="utf-8") as f:
-                yaml.dump(data, f, default_flow_style=False, allow_unicode=True)
-        except Exception as e:
-            logger.error(f"Erreur écriture YAML {path}: {e}")
+        """Sauvegarde des données dans un fichier YAML (écriture différée)."""
+        self.store.set(path, data)
 
     # ============================================================================
     # SETUP & CONFIGURATION
@@ -141,7 +152,7 @@ class Birthday(commands.Cog):
         await interaction.response.send_message(f"✅ Anniversaire enregistré : **{jour:02d}/{mois:02d}/{annee}**", ephemeral=True)
 
         if interaction.guild:
-            await self._refresh_displays(interaction.guild.id)
+            self._display_refresher.request(interaction.guild.id)
 
     @app_commands.command(name="birthday_delete", description="Supprime votre date d'anniversaire")
     async def birthday_delete(self, interaction: discord.Interaction):
@@ -153,7 +164,7 @@ class Birthday(commands.Cog):
             self._save_data(self.db_path, birthdays)
             await interaction.response.send_message("🗑️ Anniversaire supprimé.", ephemeral=True)
             if interaction.guild:
-                await self._refresh_displays(interaction.guild.id)
+                self._display_refresher.request(interaction.guild.id)
         else:
             await interaction.response.send_message("❌ Aucun anniversaire enregistré.", ephemeral=True)
 
@@ -184,20 +195,24 @@ class Birthday(commands.Cog):
             return
 
         # Update Global List
-        try:
-            msg = await channel.fetch_message(cfg["msg_global_id"])
-            embed = await self._generate_global_embed()
-            await msg.edit(embed=embed)
-        except discord.NotFound:
-            logger.warning("Message birthday global introuvable")
+        await self._update_display(guild_id, channel, "msg_global_id", await self._generate_global_embed())
 
         # Update Month List
-        try:
-            msg = await channel.fetch_message(cfg["msg_month_id"])
-            embed = await self._generate_month_embed()
-            await msg.edit(embed=embed)
-        except discord.NotFound:
-            logger.warning("Message birthday mois introuvable")
+        await self._update_display(guild_id, channel, "msg_month_id", await self._generate_month_embed())
+
+    async def _update_display(self, guild_id: int, channel: discord.TextChannel, key: str, embed: discord.Embed):
+        """Édite un message persistant, sauf si son contenu n'a pas changé (recréé s'il a été supprimé)."""
+        config = self._load_data(self.config_path)
+        message_id = config[str(guild_id)][key]
+        if self._board_hashes.unchanged(message_id, embed):
+            return
+
+        message = await edit_board(channel, message_id, embed)
+        if message:
+            self._board_hashes.forget(message_id)
+            config[str(guild_id)][key] = message_id = message.id
+            self._save_data(self.config_path, config)
+        self._board_hashes.remember(message_id, embed)
 
     async def _generate_global_embed(self) -> discord.Embed:
         birthdays = self._load_data(self.db_path)
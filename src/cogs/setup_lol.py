@@ -1,19 +1,42 @@
 # src/cogs/setup_lol.py - Version corrigée (Doublon supprimé & Path fix)
 
+import asyncio
 import os
-from datetime import datetime
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
 from datetime import time as dt_time
-from typing import Any, Optional, TypedDict
+from typing import Any, Awaitable, Callable, Optional, TypedDict
 
 import discord
-import yaml
 from discord import app_commands
 from discord.ext import commands, tasks
 from loguru import logger
 
-from src.lol.client import RiotApiClient
+from src.lol.client import AsyncRiotApiClient
 from src.lol.exceptions import InvalidApiKey, PlayerNotFound, RateLimited
+from src.lol.lp_history import LpHistory
+from src.lol.match_cache import MatchCache
+from src.lol.rate_limiter import Priority
+from src.lol.refresh_scheduler import RefreshScheduler
 from src.lol.service import LeagueService
+from src.storage.base import BOARD_SECTIONS, LolStorage
+from src.storage.sqlite_storage import SqliteStorage, import_from
+from src.storage.yaml_storage import YamlStorage
+from src.utils.boards import edit_board
+from src.utils.embed_hash import EmbedHashes
+from src.utils.refresh_coordinator import RefreshCoordinator
+
+# Nouvel essai du reset LP de minuit pour les joueurs en échec : toutes les 15 min, 4 fois
+RESET_RETRY_MINUTES = 15
+RESET_MAX_RETRIES = 4
+
+# Salons dont les messages permanents sont mis à jour en parallèle (un salon = un bucket de rate limit Discord)
+BOARD_UPDATE_CONCURRENCY = 8
+BOARD_LABELS = {"leaderboard": "Leaderboard", "lp_recap": "LP recap"}
+
+# Périodes de /lol_lp_progress : libellé et durée en jours (None = depuis le début de saison)
+LP_PERIODS: dict[str, tuple[str, int | None]] = {"week": ("7 derniers jours", 7), "month": ("30 derniers jours", 30), "season": ("Saison", None)}
 
 
 class LPChange(TypedDict):
@@ -30,6 +53,10 @@ class SetupLol(commands.Cog):
         config_path: str = "./data/config.yml",
         history_path: str = "./data/lp_history.yml",
         start_tasks: bool = True,
+        storage: LolStorage | None = None,
+        lp_history: LpHistory | None = None,
+        season_start: datetime | None = None,
+        refresh_scheduler: RefreshScheduler | None = None,
     ):
         self.bot = bot
         self.league_service = league_service
@@ -38,10 +65,26 @@ class SetupLol(commands.Cog):
         # CORRECTION : On assigne history_path à lp_tracking_path pour éviter l'AttributeError
         self.lp_tracking_path = history_path
 
-        # Création des dossiers
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
-        os.makedirs(os.path.dirname(self.lp_tracking_path), exist_ok=True)
+        # Par défaut, stockage YAML (crée les dossiers des fichiers)
+        self.storage = storage or YamlStorage(self.db_path, self.config_path, self.lp_tracking_path)
+        # Journal des LP (séries temporelles), à côté du tracking quotidien
+        self.lp_history = lp_history or LpHistory(os.path.join(os.path.dirname(self.lp_tracking_path), "lp_samples.jsonl"))
+        # Début de la saison classée (par défaut le 1er janvier UTC)
+        self.season_start = season_start
+
+        # Rafraîchissement des leaderboards étalé sur l'heure : un créneau par passage de la boucle
+        self.refresh_scheduler = refresh_scheduler or RefreshScheduler()
+        self.refresh_leaderboard.change_interval(seconds=self.refresh_scheduler.slot_seconds)
+        # Instantané des profils (PUUID -> profil, None si le dernier appel a échoué), mis à jour créneau par créneau
+        self._profiles: dict[str, dict | None] = {}
+        # Contenu déjà affiché par chaque message permanent (évite les edits sans changement)
+        self._board_hashes = EmbedHashes()
+        # Leaderboards à reconstruire après un /lol_link, regroupés par serveur
+        self._board_refresher = RefreshCoordinator(self._refresh_guild_leaderboards)
+
+        # Joueurs dont le reset LP de minuit a échoué, réessayés plus tard dans la nuit
+        self._pending_resets: dict[str, dict] = {}
+        self._reset_day = ""
 
         self._start_tasks = start_tasks
 
@@ -52,10 +95,14 @@ class SetupLol(commands.Cog):
         self.daily_lp_reset.start()
         logger.success("Tasks refresh_leaderboard et daily_lp_reset démarrées")
 
-    def cog_unload(self):
+    async def cog_unload(self):
         """Appelé quand le cog est déchargé"""
         self.refresh_leaderboard.cancel()
         self.daily_lp_reset.cancel()
+        self.retry_failed_resets.cancel()
+        self._board_refresher.cancel()
+        await self.league_service.close()
+        self.storage.close()
 
     # ============================================================================
     # GESTION DES DONNÉES
@@ -63,89 +110,78 @@ class SetupLol(commands.Cog):
 
     def _save_user(self, discord_id: int, puuid: str, pseudo: str, tag: str, stats):
         """Enregistre l'utilisateur et met en cache ses dernières stats connues."""
-        logger.debug(f"Sauvegarde YAML pour {discord_id} ({pseudo}#{tag})")
-
-        data: dict[str, Any] = {}
-
-        if os.path.exists(self.db_path):
-            with open(self.db_path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
+        logger.debug(f"Sauvegarde de {discord_id} ({pseudo}#{tag})")
 
         user_entry = {"puuid": puuid, "pseudo": pseudo, "tag": tag}
 
         if stats:
             user_entry["cached_stats"] = stats
-        elif str(discord_id) in data and "cached_stats" in data[str(discord_id)]:
-            user_entry["cached_stats"] = data[str(discord_id)]["cached_stats"]
-
-        data[str(discord_id)] = user_entry
-
-        with open(self.db_path, "w", encoding="utf-8") as f:
-            yaml.dump(data, f, default_flow_style=False, allow_unicode=True)
-
-    def _load_users(self) -> dict:
-        """Charge tous les utilisateurs depuis le fichier YAML."""
-        if not os.path.exists(self.db_path):
-            return {}
+        else:
+            existing = self.storage.get_user(str(discord_id))
+            if existing and "cached_stats" in existing:
+                user_entry["cached_stats"] = existing["cached_stats"]
 
-        with open(self.db_path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f) or {}
+        self.storage.upsert_user(str(discord_id), user_entry)
 
-    def _save_config(self, guild_id: int, channel_id: int, message_id: int, queue_type: str = "soloq", config_type: str = "leaderboard"):
-        """Sauvegarde la config des messages permanents."""
-        config: dict[str, Any] = {}
-        if os.path.exists(self.config_path):
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                config = yaml.safe_load(f) or {}
+    def _save_users(self, data: dict):
+        """Enregistre plusieurs utilisateurs en une seule écriture."""
+        self.storage.upsert_users(data)
 
-        if config_type == "leaderboard":
-            if "leaderboards" not in config:
-                config["leaderboards"] = {}
+    def _store_cached_stats(self, profiles: dict[str, dict | None]):
+        """Met en cache les stats de tous les profils récupérés, en une seule écriture par cycle."""
+        users = self._load_users()
+        updated = {}
 
-            if str(guild_id) not in config["leaderboards"]:
-                config["leaderboards"][str(guild_id)] = {}
+        for d_id, u_data in users.items():
+            profile = profiles.get(u_data["puuid"])
+            if profile:
+                u_data["cached_stats"] = self._cached_stats_from_profile(profile)
+                updated[d_id] = u_data
+
+        if updated:
+            self._save_users(updated)
+            logger.debug(f"Stats en cache mises à jour pour {len(updated)} joueurs")
+
+    def _sync_riot_ids(self, profiles: dict[str, dict | None]):
+        """Reporte les changements de Riot ID (profils récupérés sans riot_id, donc avec le nom de Riot)."""
+        renamed = {}
+        for d_id, u_data in self._load_users().items():
+            profile = profiles.get(u_data["puuid"])
+            if not profile or not profile.get("name"):
+                continue
 
-            config["leaderboards"][str(guild_id)][queue_type] = {
-                "channel_id": channel_id,
-                "message_id": message_id,
-            }
-        elif config_type == "lp_recap":
-            if "lp_recaps" not in config:
-                config["lp_recaps"] = {}
+            if (profile["name"], profile["tag"]) != (u_data["pseudo"], u_data["tag"]):
+                logger.info(f"Riot ID mis à jour : {u_data['pseudo']}#{u_data['tag']} -> {profile['name']}#{profile['tag']}")
+                renamed[d_id] = {**u_data, "pseudo": profile["name"], "tag": profile["tag"]}
 
-            if str(guild_id) not in config["lp_recaps"]:
-                config["lp_recaps"][str(guild_id)] = {}
+        if renamed:
+            self._save_users(renamed)
 
-            config["lp_recaps"][str(guild_id)][queue_type] = {
-                "channel_id": channel_id,
-                "message_id": message_id,
-            }
+    @staticmethod
+    def _cached_stats_from_profile(profile: dict) -> dict:
+        """Données conservées pour le mode hors-ligne (les deux files)."""
+        return {"name": profile["name"], "tag": profile["tag"], "level": profile["level"], **profile["rankedStats"]}
 
-        with open(self.config_path, "w", encoding="utf-8") as f:
-            yaml.dump(config, f, default_flow_style=False)
+    def _load_users(self) -> dict:
+        """Charge tous les utilisateurs."""
+        return self.storage.load_users()
 
+    def _save_config(self, guild_id: int, channel_id: int, message_id: int, queue_type: str = "soloq", config_type: str = "leaderboard"):
+        """Sauvegarde la config des messages permanents."""
+        self.storage.upsert_board(config_type, str(guild_id), queue_type, channel_id, message_id)
         logger.success(f"Config {config_type} {queue_type} sauvegardée pour guild {guild_id}")
 
     def _load_config(self) -> dict:
         """Charge la configuration."""
-        if not os.path.exists(self.config_path):
-            return {}
-
-        with open(self.config_path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f) or {}
+        return self.storage.load_config()
 
     def _save_lp_tracking(self, data: dict):
-        """Sauvegarde les données de tracking LP."""
-        with open(self.lp_tracking_path, "w", encoding="utf-8") as f:
-            yaml.dump(data, f, default_flow_style=False)
+        """Sauvegarde les données de tracking LP (seules les entrées fournies sont réécrites)."""
+        self.storage.upsert_lp_tracking(data)
 
     def _load_lp_tracking(self) -> dict:
         """Charge les données de tracking LP."""
-        if not os.path.exists(self.lp_tracking_path):
-            return {}
-
-        with open(self.lp_tracking_path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f) or {}
+        return self.storage.load_lp_tracking()
 
     def _get_total_lp(self, rank_data: dict) -> int:
         """Convertit un rang en LP total pour comparaison."""
@@ -172,51 +208,101 @@ class SetupLol(commands.Cog):
 
         return tier_values.get(tier, 0) + rank_values.get(rank, 0) + lp
 
+    def _record_lp(self, profiles: dict[str, dict | None]):
+        """Ajoute au journal LP les rangs des profils récupérés (seuls les changements sont écrits)."""
+        measures = []
+        for puuid, profile in profiles.items():
+            if not profile:
+                continue
+            for queue_type in ["soloq", "flex"]:
+                rank_data = profile["rankedStats"].get(queue_type)
+                if rank_data:
+                    measures.append((puuid, queue_type, self._get_total_lp(rank_data)))
+
+        recorded = self.lp_history.record_many(measures)
+        if recorded:
+            logger.debug(f"Historique LP : {recorded} nouvelles mesures")
+
+    def _apply_daily_reset(self, tracking: dict, d_id: str, u_data: dict, profile: dict, today: str) -> bool:
+        """Fixe le LP de référence du jour pour chaque file classée du joueur (False en cas d'erreur)."""
+        try:
+            for queue_type in ["soloq", "flex"]:
+                if profile["rankedStats"][queue_type]:
+                    current_lp = self._get_total_lp(profile["rankedStats"][queue_type])
+                    user_key = str(d_id)
+
+                    if user_key not in tracking:
+                        tracking[user_key] = {}
+
+                    if queue_type not in tracking[user_key]:
+                        tracking[user_key][queue_type] = {
+                            "start_lp": current_lp,
+                            "start_date": today,
+                        }
+
+                    entry = tracking[user_key][queue_type]
+                    # La référence de la veille est conservée pour le récapitulatif
+                    # (un reset forcé dans la journée ne la remplace pas)
+                    if "daily_lp" in entry and entry.get("last_reset") != today:
+                        entry["previous_daily_lp"] = entry["daily_lp"]
+                        entry["previous_reset"] = entry.get("last_reset", today)
+
+                    entry["daily_lp"] = current_lp
+                    entry["last_reset"] = today
+
+            logger.debug(f"LP reset pour {u_data['pseudo']}#{u_data['tag']}")
+            return str(d_id) in tracking
+
+        except Exception as e:
+            logger.warning(f"Erreur reset LP pour {u_data.get('pseudo', 'unknown')}: {e}")
+            return False
+
     def _initialize_lp_tracking(self, discord_id: int, queue_type: str, current_lp: int):
         """Initialise le tracking LP pour un utilisateur."""
-        tracking = self._load_lp_tracking()
         user_key = str(discord_id)
 
-        if user_key not in tracking:
-            tracking[user_key] = {}
-
-        if queue_type not in tracking[user_key]:
-            tracking[user_key][queue_type] = {
+        if self.storage.get_lp_tracking(user_key, queue_type) is None:
+            entry = {
                 "start_lp": current_lp,
                 "start_date": datetime.utcnow().strftime("%d/%m/%Y"),
                 "daily_lp": current_lp,
                 "last_reset": datetime.utcnow().strftime("%d/%m/%Y"),
             }
-            self._save_lp_tracking(tracking)
+            self._save_lp_tracking({user_key: {queue_type: entry}})
             logger.info(f"LP tracking initialisé pour {discord_id} ({queue_type}): {current_lp} LP")
 
     def _get_lp_change(self, discord_id: int, queue_type: str, current_lp: int) -> int:
         """Calcule le changement de LP depuis le dernier reset."""
-        tracking = self._load_lp_tracking()
-        user_key = str(discord_id)
+        entry = self.storage.get_lp_tracking(str(discord_id), queue_type)
 
-        if user_key not in tracking or queue_type not in tracking[user_key]:
+        if entry is None:
             return 0
 
-        daily_lp = int(tracking[user_key][queue_type].get("daily_lp", current_lp))
+        daily_lp = int(entry.get("daily_lp", current_lp))
         return current_lp - daily_lp
 
-    async def _link_account(self, interaction: discord.Interaction, pseudo: str, tag: str):
+    async def _link_account(self, interaction: discord.Interaction, pseudo: str, tag: str) -> dict | None:
+        """Lie le compte Riot et initialise son tracking ; renvoie son profil s'il a pu être récupéré."""
         await interaction.response.defer(ephemeral=True)
+        profile = None
 
         try:
-            puuid = self.league_service.get_puuid(pseudo, tag)
+            # Riot ID enregistré avec la casse de Riot, pas celle saisie
+            account = await self.league_service.get_account(pseudo, tag)
+            puuid, pseudo, tag = account["puuid"], account["gameName"], account["tagLine"]
             self._save_user(interaction.user.id, puuid, pseudo, tag, stats=None)
 
             # Initialiser le tracking LP
             try:
-                profile = self.league_service.make_profile(puuid)
+                profile = await self.league_service.make_profile(puuid, riot_id=(pseudo, tag))
+                self._record_lp({puuid: profile})
                 for queue_type in ["soloq", "flex"]:
                     if profile["rankedStats"][queue_type]:
                         current_lp = self._get_total_lp(profile["rankedStats"][queue_type])
                         self._initialize_lp_tracking(interaction.user.id, queue_type, current_lp)
             except Exception as e:
                 logger.warning(f"Impossible d'initialiser le tracking LP: {e}")
+                profile = None
 
             embed = discord.Embed(
                 title="✅ Compte lié avec succès !",
@@ -226,6 +312,7 @@ class SetupLol(commands.Cog):
             embed.add_field(name="PUUID", value=f"`{puuid[:15]}...`", inline=False)
 
             await interaction.followup.send(embed=embed, ephemeral=True)
+            return profile
 
         except PlayerNotFound:
             logger.warning(f"Joueur introuvable lors du link : {pseudo}#{tag}")
@@ -240,6 +327,39 @@ class SetupLol(commands.Cog):
             logger.exception(f"Erreur inattendue lors du link : {e}")
             await interaction.followup.send("💥 Une erreur interne est survenue.", ephemeral=True)
 
+        return None
+
+    def _refresh_player_boards(self, discord_id: int, profile: dict):
+        """
+        Ajoute un joueur aux leaderboards des seuls serveurs dont il est membre.
+
+        Son profil (déjà récupéré) est fusionné dans l'instantané des profils ; les
+        autres joueurs gardent leur dernier état connu, sans nouvel appel à l'API.
+        Les leaderboards concernés sont reconstruits en différé, une fois par rafale.
+        """
+        user = self.storage.get_user(str(discord_id))
+        if not user:
+            return
+
+        self._profiles[user["puuid"]] = profile
+        self._store_cached_stats({user["puuid"]: profile})
+
+        for guild_id in self._load_config().get("leaderboards", {}):
+            guild = self.bot.get_guild(int(guild_id))
+            if guild and guild.get_member(discord_id):
+                self._board_refresher.request(guild_id)
+
+    async def _refresh_guild_leaderboards(self, guild_id: str):
+        """Reconstruit les leaderboards d'un serveur depuis l'instantané des profils."""
+        boards = self._load_config().get("leaderboards", {}).get(guild_id)
+        if not boards:
+            return
+
+        async def render(guild: discord.Guild, queue_type: str) -> discord.Embed:
+            return await self._create_leaderboard_embed(guild, queue_type, profiles=self._profiles)
+
+        await self._update_boards({"leaderboards": {guild_id: boards}}, "leaderboard", render)
+
     # ============================================================================
     # COMMANDES SLASH
     # ============================================================================
@@ -250,11 +370,14 @@ class SetupLol(commands.Cog):
             return await interaction.response.send_message("❌ Format invalide. Utilisez : `Pseudo#TAG`", ephemeral=True)
         pseudo, tag = riot_id.split("#", 1)
         logger.info(f"Requête /lol_link par {interaction.user} pour {pseudo}#{tag}")
-        await self._link_account(interaction, pseudo, tag)
+        profile = await self._link_account(interaction, pseudo, tag)
 
-        # Pour forcer le refresh, on appelle directement la coroutine interne du Loop
-        # car refresh_leaderboard est un objet Loop non awaitable directement.
-        await self.refresh_leaderboard.coro(self)
+        # Seuls les leaderboards des serveurs du joueur sont mis à jour, avec son seul profil
+        if profile:
+            try:
+                self._refresh_player_boards(interaction.user.id, profile)
+            except Exception as e:
+                logger.warning(f"Impossible de mettre à jour les leaderboards après le link: {e}")
 
     @app_commands.command(name="lol_stats", description="Affiche les statistiques LoL d'un joueur")
     @app_commands.describe(member="Le membre dont vous voulez voir les stats (laissez vide pour vos propres stats)")
@@ -265,20 +388,18 @@ class SetupLol(commands.Cog):
 
         await interaction.response.defer()
 
-        users = self._load_users()
-        user_id = str(target.id)
+        user_data = self.storage.get_user(str(target.id))
 
-        if user_id not in users:
+        if not user_data:
             if target == interaction.user:
                 return await interaction.followup.send("❌ Vous n'avez pas lié votre compte ! Utilisez `/lol_link`")
             else:
                 return await interaction.followup.send(f"❌ {target.mention} n'a pas lié son compte.")
 
-        user_data = users[user_id]
         puuid = user_data["puuid"]
 
         try:
-            profile = self.league_service.make_profile(puuid)
+            profile = await self.league_service.make_profile(puuid)
 
             embed = discord.Embed(
                 title="📊 Profil League of Legends",
@@ -364,6 +485,7 @@ class SetupLol(commands.Cog):
         try:
             embed = await self._create_leaderboard_embed(interaction.guild, queue_type)
             message = await channel.send(embed=embed)
+            self._board_hashes.remember(message.id, embed)
             self._save_config(interaction.guild.id, channel.id, message.id, queue_type)
 
             queue_name = "Solo/Duo" if queue_type == "soloq" else "Flex 5v5"
@@ -389,8 +511,9 @@ class SetupLol(commands.Cog):
         await interaction.response.defer(ephemeral=True)
 
         try:
-            embed = await self._create_lp_recap_embed(interaction.guild, queue_type)
+            embed = self._create_lp_recap_embed(interaction.guild, queue_type)
             message = await channel.send(embed=embed)
+            self._board_hashes.remember(message.id, embed)
             self._save_config(interaction.guild.id, channel.id, message.id, queue_type, "lp_recap")
 
             queue_name = "Solo/Duo" if queue_type == "soloq" else "Flex 5v5"
@@ -403,6 +526,30 @@ class SetupLol(commands.Cog):
             logger.exception("Erreur lors du setup du LP recap")
             await interaction.followup.send(f"❌ Erreur lors de la création du récapitulatif LP : {e}", ephemeral=True)
 
+    @app_commands.command(name="lol_lp_progress", description="Progression LP sur la semaine, le mois ou la saison")
+    @app_commands.describe(
+        periode="Période à afficher",
+        queue_type="Type de file (Solo/Duo ou Flex)",
+        member="Le joueur à afficher (laissez vide pour tout le serveur)",
+    )
+    @app_commands.choices(
+        periode=[
+            app_commands.Choice(name="Semaine", value="week"),
+            app_commands.Choice(name="Mois", value="month"),
+            app_commands.Choice(name="Saison", value="season"),
+        ],
+        queue_type=[app_commands.Choice(name="Solo/Duo", value="soloq"), app_commands.Choice(name="Flex 5v5", value="flex")],
+    )
+    async def lol_lp_progress(
+        self, interaction: discord.Interaction, periode: str = "week", queue_type: str = "soloq", member: Optional[discord.Member] = None
+    ):
+        """Progression LP calculée depuis l'historique (aucun appel à l'API Riot)."""
+        if not interaction.guild and not member:
+            return await interaction.response.send_message("❌ Cette commande doit être utilisée sur un serveur.", ephemeral=True)
+
+        logger.info(f"Requête /lol_lp_progress {periode} {queue_type} par {interaction.user}")
+        embed = self._create_lp_progress_embed(interaction.guild, periode, queue_type, member)
+        await interaction.response.send_message(embed=embed)
 
     @app_commands.command(name="lol_admin_force_update", description="Force la mise à jour manuelle de tous les joueurs (Admin)")
     @app_commands.default_permissions(administrator=True)
@@ -416,123 +563,136 @@ class SetupLol(commands.Cog):
         except Exception as e:
             logger.exception("Erreur lors de la mise à jour forcée")
             await interaction.followup.send(f"❌ Erreur : {e}")
-            
+
     # ============================================================================
     # TÂCHES PÉRIODIQUES
     # ============================================================================
 
-    @tasks.loop(hours=1)
+    @tasks.loop(hours=1)  # Intervalle remplacé par la durée d'un créneau de refresh_scheduler
     async def refresh_leaderboard(self):
-        """Rafraîchit tous les leaderboards permanents toutes les heures."""
-        logger.info("Début du refresh des leaderboards permanents")
+        """
+        Rafraîchit les joueurs du créneau courant puis tous les leaderboards permanents.
 
+        Chaque passage n'interroge qu'un créneau de joueurs (cf. RefreshScheduler) et
+        met à jour l'instantané des profils ; les leaderboards sont reconstruits
+        depuis cet instantané, avec au plus un intervalle de retard par joueur.
+        """
         config = self._load_config()
         if "leaderboards" not in config:
             return
 
-        for guild_id, lb_configs in config["leaderboards"].items():
-            try:
-                guild = self.bot.get_guild(int(guild_id))
-                if not guild:
-                    logger.warning(f"Guild {guild_id} introuvable")
-                    continue
+        # Un seul profil par joueur pour tout le cycle, partagé entre serveurs et files
+        users = self._load_users()
+        guilds = [self.bot.get_guild(int(guild_id)) for guild_id in config["leaderboards"]]
+        members = self._members_of(users, [g for g in guilds if g])
 
-                # Rafraîchir chaque type de leaderboard (soloq et flex)
-                for queue_type, lb_config in lb_configs.items():
-                    try:
-                        channel = guild.get_channel(lb_config["channel_id"])
-                        if not channel:
-                            logger.warning(f"Channel {lb_config['channel_id']} introuvable")
-                            continue
+        slot = self.refresh_scheduler.next_slot()
+        due = self.refresh_scheduler.shard((u_data["puuid"] for u_data in members.values()), slot)
+        logger.info(f"Refresh des leaderboards : créneau {slot + 1}/{self.refresh_scheduler.slots}, {len(due)}/{len(members)} joueurs")
 
-                        try:
-                            message = await channel.fetch_message(lb_config["message_id"])
-                        except discord.NotFound:
-                            logger.warning(f"Message leaderboard {lb_config['message_id']} introuvable")
-                            continue
+        profiles = await self._fetch_profiles(
+            {d_id: u_data for d_id, u_data in members.items() if u_data["puuid"] in due}, jitter=self.refresh_scheduler.delay
+        )
+        self._store_cached_stats(profiles)
+        self._record_lp(profiles)
 
-                        embed = await self._create_leaderboard_embed(guild, queue_type)
-                        await message.edit(embed=embed)
-                        logger.success(f"Leaderboard {queue_type} rafraîchi pour guild {guild_id}")
+        # Les joueurs qui ne sont plus dans aucun serveur suivi sortent de l'instantané
+        tracked = {u_data["puuid"] for u_data in members.values()}
+        self._profiles = {puuid: profile for puuid, profile in {**self._profiles, **profiles}.items() if puuid in tracked}
+        profiles = self._profiles
 
-                    except Exception:
-                        logger.exception(f"Erreur lors du refresh du leaderboard {queue_type} pour guild {guild_id}")
+        async def render(guild: discord.Guild, queue_type: str) -> discord.Embed:
+            return await self._create_leaderboard_embed(guild, queue_type, profiles=profiles)
 
-            except Exception:
-                logger.exception(f"Erreur lors du refresh des leaderboards pour guild {guild_id}")
+        await self._update_boards(config, "leaderboard", render)
 
     @tasks.loop(time=dt_time(hour=0, minute=0))  # Tous les jours à minuit UTC
     async def daily_lp_reset(self):
         """Reset quotidien du tracking LP et mise à jour des récapitulatifs."""
         logger.info("Début du reset quotidien LP")
+        started = time.monotonic()
 
         users = self._load_users()
         tracking = self._load_lp_tracking()
         today = datetime.utcnow().strftime("%d/%m/%Y")
 
+        # Profils récupérés une seule fois, en parallèle, avec le compte Riot à jour (renommages)
+        profiles = await self._fetch_profiles(users, progress="Reset LP", riot_ids=False)
+        self._record_lp(profiles)
+        self._sync_riot_ids(profiles)
+
         # Reset des LP pour tous les utilisateurs
+        updated = {}
+        self._pending_resets = {}
         for d_id, u_data in users.items():
-            try:
-                profile = self.league_service.make_profile(u_data["puuid"])
+            profile = profiles.get(u_data["puuid"])
+            if not profile:
+                # Réessayé plus tard dans la nuit par retry_failed_resets
+                self._pending_resets[d_id] = u_data
+                continue
 
-                for queue_type in ["soloq", "flex"]:
-                    if profile["rankedStats"][queue_type]:
-                        current_lp = self._get_total_lp(profile["rankedStats"][queue_type])
-                        user_key = str(d_id)
+            if self._apply_daily_reset(tracking, d_id, u_data, profile, today):
+                updated[d_id] = tracking[d_id]
 
-                        if user_key not in tracking:
-                            tracking[user_key] = {}
+        self._save_lp_tracking(updated)
+        self.lp_history.compact()
+        self._reset_day = today
 
-                        if queue_type not in tracking[user_key]:
-                            tracking[user_key][queue_type] = {
-                                "start_lp": current_lp,
-                                "start_date": today,
-                            }
+        elapsed = time.monotonic() - started
+        logger.info(f"Reset quotidien LP terminé en {elapsed:.1f}s : {len(updated)}/{len(users)} joueurs, {len(self._pending_resets)} en échec")
+        if self._pending_resets and self._start_tasks and not self.retry_failed_resets.is_running():
+            self.retry_failed_resets.start()
 
-                        tracking[user_key][queue_type]["daily_lp"] = current_lp
-                        tracking[user_key][queue_type]["last_reset"] = today
+        # Mise à jour des récapitulatifs LP permanents
+        await self._update_lp_recaps()
 
-                logger.debug(f"LP reset pour {u_data['pseudo']}#{u_data['tag']}")
+    async def _update_lp_recaps(self):
+        """Reconstruit les récapitulatifs LP permanents depuis le tracking (les messages inchangés ne sont pas édités)."""
+        config = self._load_config()
+        if "lp_recaps" not in config:
+            return
 
-            except Exception as e:
-                logger.warning(f"Erreur reset LP pour {u_data.get('pseudo', 'unknown')}: {e}")
+        async def render(guild: discord.Guild, queue_type: str) -> discord.Embed:
+            return self._create_lp_recap_embed(guild, queue_type)
 
-        self._save_lp_tracking(tracking)
+        await self._update_boards(config, "lp_recap", render)
 
-        # Mise à jour des récapitulatifs LP permanents
-        config = self._load_config()
-        if "lp_recaps" not in config:
+    @tasks.loop(minutes=RESET_RETRY_MINUTES, count=RESET_MAX_RETRIES)
+    async def retry_failed_resets(self):
+        """Réessaie le reset LP des seuls joueurs dont le profil était indisponible à minuit."""
+        if not self._pending_resets:
+            self.retry_failed_resets.stop()
             return
 
-        for guild_id, recap_configs in config["lp_recaps"].items():
-            try:
-                guild = self.bot.get_guild(int(guild_id))
-                if not guild:
-                    logger.warning(f"Guild {guild_id} introuvable")
-                    continue
+        logger.info(f"Nouvel essai du reset LP pour {len(self._pending_resets)} joueurs")
+        tracking = self._load_lp_tracking()
+        profiles = await self._fetch_profiles(self._pending_resets)
+        self._record_lp(profiles)
+
+        updated = {}
+        for d_id, u_data in list(self._pending_resets.items()):
+            profile = profiles.get(u_data["puuid"])
+            if not profile:
+                continue
 
-                for queue_type, recap_config in recap_configs.items():
-                    try:
-                        channel = guild.get_channel(recap_config["channel_id"])
-                        if not channel:
-                            logger.warning(f"Channel {recap_config['channel_id']} introuvable")
-                            continue
+            del self._pending_resets[d_id]
+            if self._apply_daily_reset(tracking, d_id, u_data, profile, self._reset_day):
+                updated[d_id] = tracking[d_id]
 
-                        try:
-                            message = await channel.fetch_message(recap_config["message_id"])
-                        except discord.NotFound:
-                            logger.warning(f"Message recap {recap_config['message_id']} introuvable")
-                            continue
+        self._save_lp_tracking(updated)
+        logger.info(f"Reset LP rattrapé pour {len(updated)} joueurs, {len(self._pending_resets)} toujours en échec")
 
-                        embed = await self._create_lp_recap_embed(guild, queue_type)
-                        await message.edit(embed=embed)
-                        logger.success(f"LP recap {queue_type} mis à jour pour guild {guild_id}")
+        # Les joueurs rattrapés apparaissent dans les récapitulatifs sans attendre minuit
+        if updated:
+            await self._update_lp_recaps()
 
-                    except Exception:
-                        logger.exception(f"Erreur lors de la mise à jour du recap {queue_type} pour guild {guild_id}")
+        if not self._pending_resets:
+            self.retry_failed_resets.stop()
 
-            except Exception:
-                logger.exception(f"Erreur lors de la mise à jour des recaps pour guild {guild_id}")
+    @retry_failed_resets.before_loop
+    async def before_retry(self):
+        """Laisse passer l'incident (rate limit, API indisponible) avant le premier essai."""
+        await asyncio.sleep(RESET_RETRY_MINUTES * 60)
 
     @refresh_leaderboard.before_loop
     @daily_lp_reset.before_loop
@@ -544,28 +704,197 @@ class SetupLol(commands.Cog):
     # FONCTIONS UTILITAIRES
     # ============================================================================
 
-    async def _create_lp_recap_embed(self, guild: discord.Guild, queue_type: str = "soloq") -> discord.Embed:
-        """Génère l'embed de récapitulatif LP quotidien."""
+    async def _update_boards(self, config: dict, config_type: str, render: Callable[[discord.Guild, str], Awaitable[discord.Embed]]):
+        """
+        Met à jour tous les messages permanents d'un type, en parallèle par salon.
+
+        Les messages d'un même salon partagent un bucket de rate limit Discord : ils
+        sont mis à jour l'un après l'autre, tandis que les salons sont traités en
+        parallèle (au plus BOARD_UPDATE_CONCURRENCY à la fois). Un salon lent ne
+        retarde donc plus les autres serveurs.
+        """
+        started = time.monotonic()
+        by_channel: dict[int, list[tuple[str, discord.Guild, str, dict]]] = defaultdict(list)
+
+        for guild_id, board_configs in config.get(BOARD_SECTIONS[config_type], {}).items():
+            guild = self.bot.get_guild(int(guild_id))
+            if not guild:
+                logger.warning(f"Guild {guild_id} introuvable")
+                continue
+
+            for queue_type, board_config in board_configs.items():
+                by_channel[board_config["channel_id"]].append((guild_id, guild, queue_type, board_config))
+
+        semaphore = asyncio.Semaphore(BOARD_UPDATE_CONCURRENCY)
+
+        async def update_channel(boards: list[tuple[str, discord.Guild, str, dict]]):
+            async with semaphore:
+                for guild_id, guild, queue_type, board_config in boards:
+                    await self._update_board(guild_id, guild, queue_type, board_config, config_type, render)
+
+        await asyncio.gather(*(update_channel(boards) for boards in by_channel.values()))
+
+        elapsed = time.monotonic() - started
+        logger.debug(f"{BOARD_LABELS[config_type]} : {len(by_channel)} salons traités en {elapsed:.1f}s")
+
+    async def _update_board(
+        self,
+        guild_id: str,
+        guild: discord.Guild,
+        queue_type: str,
+        board_config: dict,
+        config_type: str,
+        render: Callable[[discord.Guild, str], Awaitable[discord.Embed]],
+    ):
+        """Met à jour un message permanent (les erreurs sont loggées sans interrompre les autres)."""
+        label = BOARD_LABELS[config_type]
+        try:
+            channel = guild.get_channel(board_config["channel_id"])
+            if not channel:
+                logger.warning(f"Channel {board_config['channel_id']} introuvable")
+                return
+
+            embed = await render(guild, queue_type)
+            if self._board_hashes.unchanged(board_config["message_id"], embed):
+                logger.debug(f"{label} {queue_type} inchangé pour guild {guild_id}")
+                return
+
+            await self._publish_board(guild_id, channel, board_config["message_id"], embed, queue_type, config_type)
+            logger.success(f"{label} {queue_type} mis à jour pour guild {guild_id}")
+
+        except Exception:
+            logger.exception(f"Erreur lors de la mise à jour du {label} {queue_type} pour guild {guild_id}")
+
+    async def _publish_board(self, guild_id: str, channel, message_id: int, embed: discord.Embed, queue_type: str, config_type: str):
+        """Édite un message permanent ; s'il a été supprimé, le recrée et enregistre son nouvel ID."""
+        message = await edit_board(channel, message_id, embed)
+        if message:
+            self._board_hashes.forget(message_id)
+            self._save_config(int(guild_id), channel.id, message.id, queue_type, config_type)
+            message_id = message.id
+        self._board_hashes.remember(message_id, embed)
+
+    def _members_of(self, users: dict, guilds: list[discord.Guild]) -> dict:
+        """Utilisateurs liés présents dans au moins un des serveurs donnés."""
+        return {d_id: u_data for d_id, u_data in users.items() if any(guild.get_member(int(d_id)) for guild in guilds)}
+
+    async def _fetch_profiles(
+        self,
+        users: dict,
+        priority: Priority = Priority.REFRESH,
+        progress: str | None = None,
+        jitter: Callable[[], float] | None = None,
+        riot_ids: bool = True,
+    ) -> dict[str, dict | None]:
+        """
+        Récupère en parallèle le profil de chaque PUUID unique (None en cas d'échec).
+
+        Le résultat sert d'instantané pour tout un cycle : chaque joueur n'est
+        interrogé qu'une fois, quel que soit le nombre de serveurs et de files.
+        Avec `progress`, l'avancement est loggé par tranches de 10 % ; avec
+        `jitter`, chaque requête est décalée du délai (en secondes) qu'il renvoie.
+        Avec `riot_ids=False`, le Riot ID enregistré n'est pas réutilisé : le compte
+        est relu chez Riot (un appel de plus par joueur) pour suivre les renommages.
+        """
+        unique_users = {u_data["puuid"]: u_data for u_data in users.values()}
+        total = len(unique_users)
+        step = max(1, total // 10)
+        done = 0
+
+        async def fetch(u_data: dict) -> dict | None:
+            nonlocal done
+            if jitter:
+                await asyncio.sleep(jitter())
+            try:
+                riot_id = (u_data["pseudo"], u_data["tag"]) if riot_ids else None
+                profile: dict = await self.league_service.make_profile(u_data["puuid"], riot_id=riot_id, priority=priority)
+                return profile
+            except Exception as e:
+                logger.warning(f"Profil indisponible pour {u_data.get('pseudo', 'unknown')}: {e}")
+                return None
+            finally:
+                done += 1
+                if progress and (done % step == 0 or done == total):
+                    logger.info(f"{progress} : {done}/{total} profils récupérés")
+
+        results = await asyncio.gather(*(fetch(u_data) for u_data in unique_users.values()))
+        return dict(zip(unique_users, results))
+
+    def _period_start(self, period: str, now: datetime) -> datetime:
+        """Début de la fenêtre d'une période de /lol_lp_progress (`now` en UTC)."""
+        days = LP_PERIODS[period][1]
+        if days is None:
+            return self.season_start or datetime(now.year, 1, 1, tzinfo=timezone.utc)
+        return now - timedelta(days=days)
+
+    def _create_lp_progress_embed(self, guild: discord.Guild | None, period: str, queue_type: str, member: discord.Member | None = None) -> discord.Embed:
+        """Génère l'embed de progression LP d'un joueur ou de tout un serveur sur une période."""
+        if member:
+            user_data = self.storage.get_user(str(member.id))
+            targets = {str(member.id): user_data} if user_data else {}
+        else:
+            targets = self._members_of(self._load_users(), [guild]) if guild else {}
+
+        now = datetime.now(timezone.utc)
+        since = self._period_start(period, now)
+        windows = self.lp_history.windows([u_data["puuid"] for u_data in targets.values()], queue_type, int(since.timestamp()), int(now.timestamp()))
+
+        rows = [(u_data, windows[u_data["puuid"]]) for u_data in targets.values() if u_data["puuid"] in windows]
+        rows.sort(key=lambda row: row[1].delta, reverse=True)
+
+        queue_name = "Solo/Duo" if queue_type == "soloq" else "Flex 5v5"
+        embed = discord.Embed(title=f"📈 Progression LP {queue_name} — {LP_PERIODS[period][0]}", color=discord.Color.gold())
+
+        if not rows:
+            embed.description = "Aucune donnée disponible"
+        else:
+            lines = []
+            for u_data, window in rows[:20]:
+                lines.append(
+                    f"{self._lp_trend_emoji(window.delta)} {u_data['pseudo']}#{u_data['tag']} : {window.delta:+d} LP "
+                    f"(pic {window.peak - window.start:+d}, creux {window.low - window.start:+d})"
+                )
+            embed.description = "\n".join(lines)
+
+        embed.set_footer(text=f"Depuis le {since.strftime('%d/%m/%Y')}")
+        embed.timestamp = discord.utils.utcnow()
+        return embed
+
+    @staticmethod
+    def _lp_trend_emoji(amount: int) -> str:
+        if amount > 0:
+            return "📈"
+        if amount < 0:
+            return "📉"
+        return "➖"
+
+    def _create_lp_recap_embed(self, guild: discord.Guild, queue_type: str = "soloq") -> discord.Embed:
+        """
+        Génère l'embed de récapitulatif LP de la dernière journée.
+
+        Fonction pure du tracking enregistré par daily_lp_reset (référence de la
+        veille et du jour) : aucun appel réseau, un seul chargement du tracking.
+        Seuls les joueurs dont le reset du jour a réussi sont affichés.
+        """
         users = self._load_users()
         tracking = self._load_lp_tracking()
         changes: list[LPChange] = []
+        reset_day = self._reset_day or datetime.now(timezone.utc).strftime("%d/%m/%Y")
 
         for d_id, u_data in users.items():
             member = guild.get_member(int(d_id))
             if not member:
                 continue
 
-            try:
-                profile = self.league_service.make_profile(u_data["puuid"])
-
-                if profile["rankedStats"][queue_type]:
-                    current_lp = self._get_total_lp(profile["rankedStats"][queue_type])
-                    lp_change = self._get_lp_change(int(d_id), queue_type, current_lp)
-
-                    changes.append({"name": f"{u_data['pseudo']}#{u_data['tag']}", "change": lp_change})
-            except Exception as e:
-                logger.warning(f"Erreur lors du recap LP pour {u_data.get('pseudo', 'unknown')}: {e}")
+            entry = tracking.get(str(d_id), {}).get(queue_type)
+            if not entry or "previous_daily_lp" not in entry:
+                # Pas encore de journée complète suivie pour ce joueur
                 continue
+            if entry.get("last_reset") != reset_day:
+                # Reset du jour en échec : la variation enregistrée est celle de la veille
+                continue
+
+            changes.append({"name": f"{u_data['pseudo']}#{u_data['tag']}", "change": int(entry["daily_lp"]) - int(entry["previous_daily_lp"])})
 
         # Tri par changement décroissant
         changes.sort(key=lambda x: x["change"], reverse=True)
@@ -581,61 +910,44 @@ class SetupLol(commands.Cog):
             for change_data in changes:
                 amount = change_data["change"]
                 sign = "+" if amount >= 0 else ""
-
-                if amount > 0:
-                    emoji = "📈"
-                elif amount < 0:
-                    emoji = "📉"
-                else:
-                    emoji = "➖"
-
-                lines.append(f"{emoji} {change_data['name']} : {sign}{amount} LP")
+                lines.append(f"{self._lp_trend_emoji(amount)} {change_data['name']} : {sign}{amount} LP")
 
             embed.description = "\n".join(lines)
 
-        # Footer avec les dates
-        today = datetime.utcnow().strftime("%d/%m")
-        yesterday_date = (datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)).strftime("%d/%m")
-
-        # Trouver la date de début (depuis le dernier reset)
-        start_date = yesterday_date
-        if tracking:
-            for user_data in tracking.values():
-                if queue_type in user_data:
-                    start_date = user_data[queue_type].get("last_reset", yesterday_date)
-                    if "/" in start_date and len(start_date) > 5:  # Format dd/mm/yyyy
-                        start_date = "/".join(start_date.split("/")[:2])  # Garder dd/mm
-                    break
-
-        embed.set_footer(text=f"Mise à jour à 0h - Récolte du {start_date} au {today}")
+        # Footer avec les dates de la journée récoltée (dd/mm)
+        end_date = datetime.strptime(reset_day, "%d/%m/%Y")
+        start_date = end_date - timedelta(days=1)
+        embed.set_footer(text=f"Mise à jour à 0h - Récolte du {start_date:%d/%m} au {end_date:%d/%m}")
         embed.timestamp = discord.utils.utcnow()
 
         return embed
 
-    async def _create_leaderboard_embed(self, guild: discord.Guild, queue_type: str = "soloq") -> discord.Embed:
-        """Génère le leaderboard avec le nouveau format."""
+    async def _create_leaderboard_embed(self, guild: discord.Guild, queue_type: str = "soloq", profiles: dict | None = None) -> discord.Embed:
+        """Génère le leaderboard avec le nouveau format (à partir de l'instantané `profiles` s'il est fourni)."""
         users = self._load_users()
         players: list[dict[str, Any]] = []
         api_down = False
 
+        if profiles is None:
+            # Appelé depuis une commande : priorité sur les balayages en arrière-plan
+            profiles = await self._fetch_profiles(self._members_of(users, [guild]), priority=Priority.INTERACTIVE)
+            self._store_cached_stats(profiles)
+
         for d_id, u_data in users.items():
             member = guild.get_member(int(d_id))
             if not member:
                 continue
 
             p = None
-            try:
-                profile = self.league_service.make_profile(u_data["puuid"])
-
-                s = profile["rankedStats"][queue_type]
-                cached_data = {"name": profile["name"], "tag": profile["tag"], "level": profile["level"], queue_type: s}
+            profile = profiles.get(u_data["puuid"])
+            if profile:
+                # Le cache hors-ligne est écrit en une fois par _store_cached_stats
+                p = self._cached_stats_from_profile(profile)
 
-                self._save_user(int(d_id), u_data["puuid"], u_data["pseudo"], u_data["tag"], stats=cached_data)
-                p = cached_data
-
-            except Exception:
-                # logger.warning(...)
-                api_down = True
+            else:
+                # Absent de l'instantané : pas encore interrogé (créneau à venir), pas une panne
+                if u_data["puuid"] in profiles:
+                    api_down = True
                 if "cached_stats" in u_data:
                     p = u_data["cached_stats"]
                 else:
@@ -723,7 +1035,9 @@ class SetupLol(commands.Cog):
 
         embed = discord.Embed(title=title, description=description, color=color)
 
-        footer_text = "Mis à jour toutes les heures • Rouge < 50% • Vert > 50%"
+        interval = self.refresh_scheduler.interval
+        freshness = "toutes les heures" if interval == 3600 else f"toutes les {interval / 60:g} min"
+        footer_text = f"Mis à jour {freshness} • Rouge < 50% • Vert > 50%"
         if api_down:
             footer_text = "⚠️ API Riot indisponible • Affichage des dernières données connues"
 
@@ -783,9 +1097,28 @@ async def setup(bot):
     if not api_key:
         logger.warning("⚠️ LOLAPI non défini ! Le bot fonctionnera uniquement avec le CACHE existant.")
 
-    client = RiotApiClient(api_key if api_key else "NO_KEY")
+    cache_max_mb = int(os.getenv("MATCH_CACHE_MAX_MB", "500"))
+    match_cache = MatchCache("./data/matches", max_bytes=cache_max_mb * 1024 * 1024)
+
+    client = AsyncRiotApiClient(api_key if api_key else "NO_KEY", match_cache=match_cache)
     service = LeagueService(client)
 
-    cog = SetupLol(bot, service)
+    storage: LolStorage | None = None
+    if os.getenv("LOL_STORAGE", "yaml") == "sqlite":
+        storage = SqliteStorage(os.getenv("LOL_SQLITE_PATH", "./data/floshy.db"))
+        if storage.is_empty():
+            # Premier démarrage en SQLite : import unique des fichiers YAML existants
+            import_from(YamlStorage(), storage)
+
+    season_start = None
+    if os.getenv("LOL_SEASON_START"):
+        season_start = datetime.strptime(os.environ["LOL_SEASON_START"], "%d/%m/%Y").replace(tzinfo=timezone.utc)
+
+    refresh_scheduler = RefreshScheduler(
+        interval=int(os.getenv("LOL_REFRESH_MINUTES", "60")) * 60,
+        slots=int(os.getenv("LOL_REFRESH_SLOTS", "12")),
+    )
+
+    cog = SetupLol(bot, service, storage=storage, season_start=season_start, refresh_scheduler=refresh_scheduler)
     await bot.add_cog(cog)
     logger.info("Cog SetupLol ajouté au bot.")
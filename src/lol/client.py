@@ -1,105 +1,232 @@
-from riotwatcher import LolWatcher, RiotWatcher
+import asyncio
+from collections.abc import AsyncIterator
+from urllib.parse import quote
+
+import aiohttp
+from loguru import logger
+
+from src.lol.match_cache import MatchCache
+from src.lol.match_record import MatchRecord
+from src.lol.rate_limiter import Priority, RateLimiter
+
+
+def _build_profile(account: dict, summoner: dict, ranked_entries: list) -> dict:
+    """Assemble le profil à partir des réponses account, summoner et league."""
+
+    def extract(queue_type):
+        for entry in ranked_entries:
+            if entry["queueType"] == queue_type:
+                wins = entry["wins"]
+                losses = entry["losses"]
+                total = wins + losses
+
+                return {
+                    "tier": entry["tier"],
+                    "rank": entry["rank"],
+                    "lp": entry["leaguePoints"],
+                    "wins": wins,
+                    "losses": losses,
+                    "winrate": round((wins / total) * 100, 1) if total else 0.0,
+                }
+        return None
+
+    return {
+        "name": account["gameName"],
+        "tag": account["tagLine"],
+        "level": summoner["summonerLevel"],
+        "profileIconId": summoner["profileIconId"],
+        "rankedStats": {
+            "soloq": extract("RANKED_SOLO_5x5"),
+            "flex": extract("RANKED_FLEX_SR"),
+        },
+    }
+
+
+class AsyncRiotApiClient:
+    """
+    Client asynchrone de l'API Riot.
+
+    Toutes les requêtes passent par une seule session aiohttp : les connexions
+    restent ouvertes (keep-alive) et leur nombre est borné par hôte.
+    Chaque requête attend son tour auprès du RateLimiter, selon sa priorité
+    (INTERACTIVE par défaut) ; un 429 est rejoué après Retry-After jusqu'à
+    max_retries fois.
+    Si un MatchCache est fourni, la projection compacte (MatchRecord) de chaque
+    match récupéré y est conservée et relue sans appel réseau.
+    Les erreurs HTTP remontent sous forme d'aiohttp.ClientResponseError.
+    """
 
-
-class RiotApiClient:
     def __init__(
         self,
         api_key: str,
         lol_region: str = "euw1",
         riot_region: str = "europe",
+        limit_per_host: int = 10,
+        timeout: float = 10.0,
+        rate_limiter: RateLimiter | None = None,
+        max_retries: int = 3,
+        match_cache: MatchCache | None = None,
+        match_concurrency: int = 5,
     ):
+        self.api_key = api_key
         self.lol_region = lol_region
         self.riot_region = riot_region
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.match_cache = match_cache
+        self.match_concurrency = match_concurrency
+
+        self._session: aiohttp.ClientSession | None = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Crée la session HTTP au premier appel (il faut une boucle asyncio active)."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=self.limit_per_host, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"X-Riot-Token": self.api_key},
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def close(self):
+        """Ferme la session HTTP et ses connexions."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _request(self, region: str, method: str, path: str, params: dict | None = None, priority: Priority = Priority.INTERACTIVE):
+        session = await self._get_session()
+        url = f"https://{region}.api.riotgames.com{path}"
+        query = {k: v for k, v in (params or {}).items() if v is not None}
+
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire(region, method, priority)
+
+            async with session.get(url, params=query) as response:
+                self.rate_limiter.update(region, method, response.headers)
+
+                if response.status == 429 and attempt < self.max_retries:
+                    retry_after = float(response.headers.get("Retry-After", 1))
+                    self.rate_limiter.block(region, method, retry_after, response.headers.get("X-Rate-Limit-Type"))
+                    logger.warning(f"429 Riot sur {method} ({region}), nouvel essai dans {retry_after}s")
+                    continue
+
+                response.raise_for_status()
+                return await response.json()
+
+    async def get_account(self, pseudo: str, tag: str, priority: Priority = Priority.INTERACTIVE) -> dict:
+        """Compte Riot d'un Riot ID : puuid, gameName et tagLine tels qu'écrits chez Riot."""
+        path = f"/riot/account/v1/accounts/by-riot-id/{quote(pseudo, safe='')}/{quote(tag, safe='')}"
+        account: dict = await self._request(self.riot_region, "account.by_riot_id", path, priority=priority)
+        return account
+
+    async def get_puuid(self, pseudo: str, tag: str, priority: Priority = Priority.INTERACTIVE):
+        account = await self.get_account(pseudo, tag, priority=priority)
+        return account["puuid"]
+
+    async def make_profile(self, puuid: str, riot_id: tuple[str, str] | None = None, priority: Priority = Priority.INTERACTIVE):
+        """
+        Profil complet d'un joueur. Les trois appels sont lancés en parallèle ;
+        si riot_id (pseudo, tag) est déjà connu, l'appel account est évité.
+        """
+        summoner_call = self._request(self.lol_region, "summoner.by_puuid", f"/lol/summoner/v4/summoners/by-puuid/{puuid}", priority=priority)
+        league_call = self._request(self.lol_region, "league.by_puuid", f"/lol/league/v4/entries/by-puuid/{puuid}", priority=priority)
+
+        if riot_id:
+            summoner, ranked_entries = await asyncio.gather(summoner_call, league_call)
+            account = {"gameName": riot_id[0], "tagLine": riot_id[1]}
+        else:
+            account_call = self._request(self.riot_region, "account.by_puuid", f"/riot/account/v1/accounts/by-puuid/{puuid}", priority=priority)
+            account, summoner, ranked_entries = await asyncio.gather(account_call, summoner_call, league_call)
 
-        self.lol = LolWatcher(api_key)
-        self.riot = RiotWatcher(api_key)
-
-    def get_puuid(self, pseudo: str, tag: str):
-        account = self.riot.account.by_riot_id(self.riot_region, pseudo, tag)
-        puuid = account["puuid"]
-        return puuid
-
-    def make_profile(self, puuid: str):
-        account = self.riot.account.by_puuid(self.riot_region, puuid)
-        summoner = self.lol.summoner.by_puuid(self.lol_region, puuid)
-        ranked_entries = self.lol.league.by_puuid(self.lol_region, puuid)
-
-        def extract(queue_type):
-            for entry in ranked_entries:
-                if entry["queueType"] == queue_type:
-                    wins = entry["wins"]
-                    losses = entry["losses"]
-                    total = wins + losses
-
-                    return {
-                        "tier": entry["tier"],
-                        "rank": entry["rank"],
-                        "lp": entry["leaguePoints"],
-                        "wins": wins,
-                        "losses": losses,
-                        "winrate": round((wins / total) * 100, 1) if total else 0.0,
-                    }
-            return None
-
-        return {
-            "name": account["gameName"],
-            "tag": account["tagLine"],
-            "level": summoner["summonerLevel"],
-            "profileIconId": summoner["profileIconId"],
-            "rankedStats": {
-                "soloq": extract("RANKED_SOLO_5x5"),
-                "flex": extract("RANKED_FLEX_SR"),
-            },
-        }
-
-    def get_match_ids(self, puuid: str, start: int = 0, count: int = 10, queue: int | None = None):
-        return self.lol.match.matchlist_by_puuid(self.lol_region, puuid, start=start, count=count, queue=queue)
-
-    def get_match_info(self, match_id: str):
-        return self.lol.match.by_id(self.lol_region, match_id)
-
-    def get_player_match_stats(self, match_id: str, puuid: str):
+        return _build_profile(account, summoner, ranked_entries)
+
+    async def get_match_ids(
+        self,
+        puuid: str,
+        start: int = 0,
+        count: int = 10,
+        queue: int | None = None,
+        start_time: int | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ):
+        # match-v5 utilise le routage régional (europe) et non la plateforme (euw1)
+        # start_time : timestamp en secondes, seuls les matchs commencés après sont renvoyés
+        params = {"start": start, "count": count, "queue": queue, "startTime": start_time}
+        path = f"/lol/match/v5/matches/by-puuid/{puuid}/ids"
+        return await self._request(self.riot_region, "match.matchlist_by_puuid", path, params, priority=priority)
+
+    async def get_match_info(self, match_id: str, priority: Priority = Priority.INTERACTIVE):
+        """JSON complet du match (toujours depuis l'API, seule la projection est cachée)."""
+        match = await self._request(self.riot_region, "match.by_id", f"/lol/match/v5/matches/{match_id}", priority=priority)
+
+        if self.match_cache is not None:
+            self.match_cache.put(MatchRecord.from_api(match))
+        return match
+
+    async def get_match_record(self, match_id: str, priority: Priority = Priority.INTERACTIVE) -> MatchRecord:
+        """Projection compacte du match, lue depuis le cache si possible."""
+        if self.match_cache is not None:
+            cached = self.match_cache.get(match_id)
+            if cached is not None:
+                return cached
+
+        match = await self._request(self.riot_region, "match.by_id", f"/lol/match/v5/matches/{match_id}", priority=priority)
+        record = MatchRecord.from_api(match)
+
+        if self.match_cache is not None:
+            self.match_cache.put(record)
+        return record
+
+    async def get_player_match_stats(self, match_id: str, puuid: str, priority: Priority = Priority.INTERACTIVE):
         """
         Stats principales d'un joueur pour un match.
         """
-        match = self.get_match_info(match_id)
-        info = match["info"]
-
-        participant = next((p for p in info["participants"] if p["puuid"] == puuid), None)
-        if not participant:
-            return None
-
-        duration_min = info["gameDuration"] / 60  # secondes -> minutes
-        total_minions = participant["totalMinionsKilled"] + participant.get("neutralMinionsKilled", 0)
-
-        return {
-            "champion": participant["championName"],
-            "kills": participant["kills"],
-            "deaths": participant["deaths"],
-            "assists": participant["assists"],
-            "kda": round(
-                (participant["kills"] + participant["assists"]) / max(1, participant["deaths"]),
-                2,
-            ),
-            "cs": total_minions,
-            "cs_per_min": round(total_minions / duration_min, 1),
-            "gold": participant["goldEarned"],
-            "gold_per_min": round(participant["goldEarned"] / duration_min, 1),
-            "damageDealt": participant["totalDamageDealtToChampions"],
-            "damage_per_min": round(participant["totalDamageDealtToChampions"] / duration_min, 1),
-            "win": participant["win"],
-            "duration_min": round(duration_min, 1),
-            "summonerSpells": [participant["summoner1Id"], participant["summoner2Id"]],
-            "items": [participant[f"item{i}"] for i in range(7)],
-        }
-
-    def get_matches_summary(self, puuid: str, count: int = 10, queue: int | None = None):
-        match_ids = self.get_match_ids(puuid, count=count, queue=queue)
-        summaries = []
-
-        for match_id in match_ids:
-            stats = self.get_player_match_stats(match_id, puuid)
-            if stats:
-                summaries.append(stats)
-
-        return summaries
+        record = await self.get_match_record(match_id, priority=priority)
+        return record.player_stats(puuid)
+
+    async def iter_matches_summary(
+        self,
+        puuid: str,
+        count: int = 10,
+        queue: int | None = None,
+        concurrency: int | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> AsyncIterator[dict]:
+        """
+        Stats des derniers matchs, dans l'ordre de l'historique.
+
+        Les matchs sont récupérés en parallèle (au plus `concurrency` à la fois,
+        toujours sous le RateLimiter) et chaque résultat est produit dès que lui
+        et les précédents sont disponibles.
+        """
+        match_ids = await self.get_match_ids(puuid, count=count, queue=queue, priority=priority)
+        semaphore = asyncio.Semaphore(concurrency or self.match_concurrency)
+
+        async def fetch(match_id: str):
+            async with semaphore:
+                return await self.get_player_match_stats(match_id, puuid, priority=priority)
+
+        tasks = [asyncio.create_task(fetch(match_id)) for match_id in match_ids]
+        try:
+            for task in tasks:
+                stats = await task
+                if stats:
+                    yield stats
+        finally:
+            # Consommateur arrêté en route (ou erreur) : on n'attend pas les matchs restants
+            for task in tasks:
+                task.cancel()
+
+    async def get_matches_summary(
+        self,
+        puuid: str,
+        count: int = 10,
+        queue: int | None = None,
+        concurrency: int | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ):
+        return [stats async for stats in self.iter_matches_summary(puuid, count=count, queue=queue, concurrency=concurrency, priority=priority)]
@@ -0,0 +1,222 @@
+import bisect
+import json
+import os
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+from loguru import logger
+
+from src.storage.atomic import atomic_write_text
+
+DAY = 24 * 3600
+
+
+@dataclass(slots=True, frozen=True)
+class LpWindow:
+    """LP totaux d'un joueur sur une fenêtre de temps (cf. SetupLol._get_total_lp)."""
+
+    start: int  # Au début de la fenêtre (ou première mesure si le suivi a commencé après)
+    end: int
+    peak: int
+    low: int
+
+    @property
+    def delta(self) -> int:
+        return self.end - self.start
+
+
+class LpHistory:
+    """
+    Historique des LP en journal append-only : une ligne JSON [timestamp, puuid, file, LP total]
+    par changement de LP observé.
+
+    Le journal est relu une fois au démarrage et indexé par (puuid, file) ; une
+    nouvelle mesure n'ajoute qu'une ligne en fin de fichier (rien n'est réécrit).
+    Une mesure identique à la précédente n'est pas enregistrée : la valeur d'un
+    joueur à un instant donné est celle de sa dernière mesure antérieure.
+
+    Les mesures sont aussi agrégées par jour UTC (plus haut / plus bas) : une
+    requête sur une fenêtre ne parcourt les mesures brutes que pour ses deux
+    jours extrêmes, quelle que soit sa longueur (semaine, mois, saison).
+
+    `compact` réécrit le journal en ne gardant, au-delà de `full_resolution_days`,
+    que les mesures portant le plus haut, le plus bas et la dernière valeur de
+    chaque jour.
+    """
+
+    def __init__(self, path: str = "./data/lp_samples.jsonl", full_resolution_days: int = 30):
+        self.path = path
+        self.full_resolution_days = full_resolution_days
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        self._samples: dict[tuple[str, str], list[tuple[int, int]]] = defaultdict(list)
+        # Agrégats journaliers : jour -> (plus haut, plus bas), et jours triés
+        self._buckets: dict[tuple[str, str], dict[int, tuple[int, int]]] = defaultdict(dict)
+        self._days: dict[tuple[str, str], list[int]] = defaultdict(list)
+        self._lines = 0
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    timestamp, puuid, queue_type, lp = json.loads(line)
+                except ValueError:
+                    # Dernière ligne tronquée par un arrêt brutal
+                    logger.warning(f"Ligne illisible ignorée dans {self.path}")
+                    continue
+                self._insert((puuid, queue_type), timestamp, lp)
+                self._lines += 1
+
+        logger.debug(f"Historique LP : {self._lines} mesures pour {len(self._samples)} joueurs/files")
+
+    def __len__(self) -> int:
+        return sum(len(samples) for samples in self._samples.values())
+
+    def _insert(self, key: tuple[str, str], timestamp: int, lp: int):
+        bisect.insort(self._samples[key], (timestamp, lp))
+
+        day = timestamp // DAY
+        buckets = self._buckets[key]
+        if day in buckets:
+            high, low = buckets[day]
+            buckets[day] = (max(high, lp), min(low, lp))
+        else:
+            buckets[day] = (lp, lp)
+            bisect.insort(self._days[key], day)
+
+    def record(self, puuid: str, queue_type: str, lp: int, timestamp: int | None = None) -> bool:
+        """Enregistre une mesure ; renvoie False si le LP n'a pas changé depuis la précédente."""
+        return self.record_many([(puuid, queue_type, lp)], timestamp) == 1
+
+    def record_many(self, measures: list[tuple[str, str, int]], timestamp: int | None = None) -> int:
+        """Enregistre plusieurs mesures prises au même instant, en un seul ajout au journal."""
+        timestamp = int(time.time()) if timestamp is None else timestamp
+        rows = []
+
+        for puuid, queue_type, lp in measures:
+            previous = self._value_before(self._samples.get((puuid, queue_type), []), timestamp)
+            if previous is not None and previous == lp:
+                continue
+
+            self._insert((puuid, queue_type), timestamp, lp)
+            rows.append(json.dumps([timestamp, puuid, queue_type, lp], separators=(",", ":")))
+
+        if rows:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(rows) + "\n")
+            self._lines += len(rows)
+
+        return len(rows)
+
+    @staticmethod
+    def _value_before(samples: list[tuple[int, int]], timestamp: int) -> int | None:
+        index = bisect.bisect_right(samples, (timestamp, float("inf")))
+        return samples[index - 1][1] if index else None
+
+    def samples(self, puuid: str, queue_type: str, since: int | None = None, until: int | None = None) -> list[tuple[int, int]]:
+        """Mesures (timestamp, LP) d'un joueur, dans l'ordre chronologique."""
+        samples = self._samples.get((puuid, queue_type), [])
+        start = 0 if since is None else bisect.bisect_left(samples, (since, float("-inf")))
+        end = len(samples) if until is None else bisect.bisect_right(samples, (until, float("inf")))
+        return samples[start:end]
+
+    def value_at(self, puuid: str, queue_type: str, timestamp: int) -> int | None:
+        """LP du joueur à cet instant (dernière mesure antérieure), None s'il n'était pas suivi."""
+        return self._value_before(self._samples.get((puuid, queue_type), []), timestamp)
+
+    def window(self, puuid: str, queue_type: str, since: int, until: int | None = None) -> LpWindow | None:
+        """
+        LP de départ, d'arrivée, plus haut et plus bas sur la fenêtre [since, until].
+
+        Si le joueur n'était pas encore suivi au début de la fenêtre, la première
+        mesure de la fenêtre sert de référence. None s'il n'y a aucune mesure.
+        """
+        until = int(time.time()) if until is None else until
+        key = (puuid, queue_type)
+
+        end = self.value_at(puuid, queue_type, until)
+        if end is None:
+            return None
+
+        start = self.value_at(puuid, queue_type, since)
+        if start is None:
+            in_window = self.samples(puuid, queue_type, since, until)
+            if not in_window:
+                return None
+            start = in_window[0][1]
+
+        peak = low = start
+        first_day, last_day = since // DAY, until // DAY
+
+        if last_day - first_day < 2:
+            edges = [(since, until)]
+        else:
+            # Jours complets : agrégats journaliers ; jours extrêmes : mesures brutes
+            edges = [(since, (first_day + 1) * DAY - 1), (last_day * DAY, until)]
+            days = self._days.get(key, [])
+            buckets = self._buckets[key]
+            for day in days[bisect.bisect_right(days, first_day) : bisect.bisect_left(days, last_day)]:
+                high, day_low = buckets[day]
+                peak, low = max(peak, high), min(low, day_low)
+
+        for edge_since, edge_until in edges:
+            for _, lp in self.samples(puuid, queue_type, edge_since, edge_until):
+                peak, low = max(peak, lp), min(low, lp)
+
+        return LpWindow(start=start, end=end, peak=peak, low=low)
+
+    def windows(self, puuids: list[str], queue_type: str, since: int, until: int | None = None) -> dict[str, LpWindow]:
+        """Fenêtres de plusieurs joueurs (ex : tout un serveur) ; les joueurs sans mesure sont exclus."""
+        until = int(time.time()) if until is None else until
+        results = {}
+        for puuid in puuids:
+            window = self.window(puuid, queue_type, since, until)
+            if window:
+                results[puuid] = window
+        return results
+
+    def delta(self, puuid: str, queue_type: str, since: int, until: int | None = None) -> int | None:
+        """Variation de LP sur la fenêtre [since, until] (None s'il n'y a aucune mesure)."""
+        window = self.window(puuid, queue_type, since, until)
+        return window.delta if window else None
+
+    def players(self) -> set[str]:
+        return {puuid for puuid, _ in self._samples}
+
+    def compact(self, now: int | None = None):
+        """Réécrit le journal en ne gardant que les extrêmes de chaque jour au-delà de `full_resolution_days`."""
+        now = int(time.time()) if now is None else now
+        cutoff = now - self.full_resolution_days * DAY
+
+        rows = []
+        for (puuid, queue_type), samples in self._samples.items():
+            by_day: dict[int, list[tuple[int, int]]] = defaultdict(list)
+            for sample in samples:
+                by_day[sample[0] // DAY].append(sample)
+
+            kept = []
+            for day_samples in by_day.values():
+                extremes = self._daily_extremes(day_samples)
+                kept += [sample for sample in day_samples if sample[0] >= cutoff or sample in extremes]
+
+            samples[:] = kept
+            rows += [(timestamp, puuid, queue_type, lp) for timestamp, lp in kept]
+
+        rows.sort()
+        atomic_write_text(self.path, "".join(json.dumps(list(row), separators=(",", ":")) + "\n" for row in rows))
+
+        logger.info(f"Historique LP compacté : {self._lines} -> {len(rows)} lignes")
+        self._lines = len(rows)
+
+    @staticmethod
+    def _daily_extremes(day_samples: list[tuple[int, int]]) -> set[tuple[int, int]]:
+        """Mesures d'un jour qui portent son plus haut, son plus bas et sa dernière valeur."""
+        high = max(day_samples, key=lambda sample: sample[1])
+        low = min(day_samples, key=lambda sample: sample[1])
+        return {high, low, day_samples[-1]}
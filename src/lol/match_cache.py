@@ -0,0 +1,115 @@
+import gzip
+import json
+import os
+from collections import OrderedDict
+
+from loguru import logger
+
+from src.lol.match_record import MatchRecord
+
+
+class MatchCache:
+    """
+    Cache disque des matchs, indexé par match ID.
+
+    Un match terminé ne change plus : chaque match est stocké une seule fois,
+    sous forme de MatchRecord compact (tableau JSON gzip), dans `directory`. Quand la taille totale dépasse `max_bytes`,
+    les matchs les moins récemment lus sont supprimés (LRU). L'ordre d'accès est
+    conservé entre deux redémarrages via la date de modification des fichiers.
+    """
+
+    SUFFIX = ".json.gz"
+
+    def __init__(self, directory: str = "./data/matches", max_bytes: int = 500 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._index: OrderedDict[str, int] = OrderedDict()
+        self._total_bytes = 0
+        self._load_index()
+
+    def _load_index(self):
+        """Reconstruit l'index LRU depuis le disque (du moins au plus récemment utilisé)."""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(self.SUFFIX):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.name[: -len(self.SUFFIX)], stat.st_size))
+
+        for _, match_id, size in sorted(entries):
+            self._index[match_id] = size
+            self._total_bytes += size
+
+        logger.debug(f"Cache matchs : {len(self._index)} matchs ({self._total_bytes} octets)")
+
+    def _path(self, match_id: str) -> str:
+        return os.path.join(self.directory, f"{match_id}{self.SUFFIX}")
+
+    def __contains__(self, match_id: str) -> bool:
+        return match_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def get(self, match_id: str) -> MatchRecord | None:
+        """Retourne le match en cache, ou None s'il est absent ou illisible."""
+        if match_id not in self._index:
+            return None
+
+        path = self._path(match_id)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+
+            if isinstance(data, dict):
+                # Ancienne entrée contenant le JSON Riot complet : on la compacte
+                record = MatchRecord.from_api(data)
+                self.put(record)
+                return record
+
+            record = MatchRecord.from_row(data)
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Entrée de cache illisible pour {match_id}: {e}")
+            self._discard(match_id)
+            return None
+
+        self._index.move_to_end(match_id)
+        os.utime(path)
+        return record
+
+    def put(self, record: MatchRecord):
+        """Ajoute un match au cache puis évince les plus anciens si besoin."""
+        match_id = record.match_id
+        path = self._path(match_id)
+        tmp_path = f"{path}.tmp"
+
+        payload = gzip.compress(json.dumps(record.to_row(), separators=(",", ":")).encode("utf-8"))
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+        self._total_bytes -= self._index.pop(match_id, 0)
+        self._index[match_id] = len(payload)
+        self._total_bytes += len(payload)
+
+        self._evict()
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            match_id = next(iter(self._index))
+            self._discard(match_id)
+            logger.debug(f"Match {match_id} évincé du cache")
+
+    def _discard(self, match_id: str):
+        self._total_bytes -= self._index.pop(match_id, 0)
+        try:
+            os.remove(self._path(match_id))
+        except FileNotFoundError:
+            pass
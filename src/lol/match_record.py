@@ -0,0 +1,111 @@
+from dataclasses import astuple, dataclass
+
+
+@dataclass(slots=True, frozen=True)
+class ParticipantRecord:
+    """Les quelques champs d'un participant réellement utilisés par le bot."""
+
+    puuid: str
+    champion: str
+    kills: int
+    deaths: int
+    assists: int
+    cs: int
+    gold: int
+    damage: int
+    win: bool
+    summoner_spells: tuple[int, int]
+    items: tuple[int, ...]
+
+    @classmethod
+    def from_api(cls, participant: dict) -> "ParticipantRecord":
+        return cls(
+            puuid=participant["puuid"],
+            champion=participant["championName"],
+            kills=participant["kills"],
+            deaths=participant["deaths"],
+            assists=participant["assists"],
+            cs=participant["totalMinionsKilled"] + participant.get("neutralMinionsKilled", 0),
+            gold=participant["goldEarned"],
+            damage=participant["totalDamageDealtToChampions"],
+            win=participant["win"],
+            summoner_spells=(participant["summoner1Id"], participant["summoner2Id"]),
+            items=tuple(participant[f"item{i}"] for i in range(7)),
+        )
+
+    @classmethod
+    def from_row(cls, row: list) -> "ParticipantRecord":
+        puuid, champion, kills, deaths, assists, cs, gold, damage, win, summoner_spells, items = row
+        return cls(puuid, champion, kills, deaths, assists, cs, gold, damage, win, (summoner_spells[0], summoner_spells[1]), tuple(items))
+
+
+@dataclass(slots=True, frozen=True)
+class MatchRecord:
+    """
+    Projection compacte d'un match-v5 : quelques dizaines d'octets par joueur
+    au lieu des centaines de champs du JSON Riot.
+
+    Stockée sous forme de tableau (to_row / from_row), dans l'ordre des champs.
+    """
+
+    match_id: str
+    game_creation: int  # Timestamp en millisecondes
+    game_duration: int  # Secondes
+    queue_id: int
+    participants: tuple[ParticipantRecord, ...]
+
+    @classmethod
+    def from_api(cls, match: dict) -> "MatchRecord":
+        info = match["info"]
+        return cls(
+            match_id=match.get("metadata", {}).get("matchId", ""),
+            game_creation=info.get("gameCreation", 0),
+            game_duration=info["gameDuration"],
+            queue_id=info.get("queueId", 0),
+            participants=tuple(ParticipantRecord.from_api(p) for p in info["participants"]),
+        )
+
+    def to_row(self) -> list:
+        return list(astuple(self))
+
+    @classmethod
+    def from_row(cls, row: list) -> "MatchRecord":
+        match_id, game_creation, game_duration, queue_id, participants = row
+        return cls(
+            match_id=match_id,
+            game_creation=game_creation,
+            game_duration=game_duration,
+            queue_id=queue_id,
+            participants=tuple(ParticipantRecord.from_row(p) for p in participants),
+        )
+
+    def participant(self, puuid: str) -> ParticipantRecord | None:
+        return next((p for p in self.participants if p.puuid == puuid), None)
+
+    def player_stats(self, puuid: str):
+        """
+        Stats principales d'un joueur pour ce match (None s'il n'y a pas participé).
+        """
+        participant = self.participant(puuid)
+        if not participant:
+            return None
+
+        duration_min = self.game_duration / 60  # secondes -> minutes
+
+        return {
+            "champion": participant.champion,
+            "kills": participant.kills,
+            "deaths": participant.deaths,
+            "assists": participant.assists,
+            "kda": round((participant.kills + participant.assists) / max(1, participant.deaths), 2),
+            "cs": participant.cs,
+            "cs_per_min": round(participant.cs / duration_min, 1),
+            "gold": participant.gold,
+            "gold_per_min": round(participant.gold / duration_min, 1),
+            "damageDealt": participant.damage,
+            "damage_per_min": round(participant.damage / duration_min, 1),
+            "win": participant.win,
+            "duration_min": round(duration_min, 1),
+            "summonerSpells": list(participant.summoner_spells),
+            "items": list(participant.items),
+        }
@@ -0,0 +1,106 @@
+import asyncio
+import os
+from typing import Any
+
+from aiohttp import ClientResponseError
+from loguru import logger
+
+from src.lol.client import AsyncRiotApiClient
+from src.lol.match_record import MatchRecord
+from src.lol.rate_limiter import Priority
+from src.storage.atomic import atomic_write_text
+from src.storage.yaml_io import dump_yaml, load_yaml
+
+
+class MatchHistorySync:
+    """
+    Synchronisation incrémentale de l'historique de matchs, par PUUID.
+
+    Un curseur (dernier match vu + son heure de début) est conservé pour chaque
+    joueur : une synchronisation ne demande que les matchs commencés depuis
+    (paramètre startTime), soit en général un seul appel matchlist par joueur,
+    puis ingère uniquement les nouveaux matchs dans le MatchCache du client.
+    """
+
+    PAGE_SIZE = 100
+
+    def __init__(self, client: AsyncRiotApiClient, cursor_path: str = "./data/match_cursors.yml", initial_count: int = 20):
+        self.client = client
+        self.cursor_path = cursor_path
+        self.initial_count = initial_count
+
+        os.makedirs(os.path.dirname(self.cursor_path), exist_ok=True)
+        self._cursors: dict[str, dict[str, Any]] = self._load_cursors()
+
+    def _load_cursors(self) -> dict:
+        if not os.path.exists(self.cursor_path):
+            return {}
+
+        with open(self.cursor_path, "r", encoding="utf-8") as f:
+            return load_yaml(f)
+
+    def save(self):
+        """Sauvegarde les curseurs de tous les joueurs."""
+        atomic_write_text(self.cursor_path, dump_yaml(self._cursors))
+
+    def cursor(self, puuid: str) -> dict | None:
+        return self._cursors.get(puuid)
+
+    async def _new_match_ids(self, puuid: str, priority: Priority) -> list[str]:
+        """IDs des matchs plus récents que le curseur (du plus récent au plus ancien)."""
+        cursor = self._cursors.get(puuid)
+
+        # Premier passage : on ne remonte pas tout l'historique
+        if not cursor:
+            match_ids: list[str] = await self.client.get_match_ids(puuid, count=self.initial_count, priority=priority)
+            return match_ids
+
+        new_ids: list[str] = []
+        start = 0
+        while True:
+            page = await self.client.get_match_ids(puuid, start=start, count=self.PAGE_SIZE, start_time=cursor["start_time"], priority=priority)
+
+            for match_id in page:
+                if match_id == cursor["last_match_id"]:
+                    return new_ids
+                new_ids.append(match_id)
+
+            if len(page) < self.PAGE_SIZE:
+                return new_ids
+            start += self.PAGE_SIZE
+
+    async def sync(self, puuid: str, priority: Priority = Priority.BACKFILL) -> list[MatchRecord]:
+        """Récupère et met en cache les nouveaux matchs du joueur, puis avance son curseur."""
+        new_ids = await self._new_match_ids(puuid, priority)
+        if not new_ids:
+            return []
+
+        # Même borne que les autres récupérations de matchs : une reprise après une longue absence
+        # ne met pas des centaines de requêtes en file d'un coup
+        semaphore = asyncio.Semaphore(self.client.match_concurrency)
+
+        async def fetch(match_id: str) -> MatchRecord:
+            async with semaphore:
+                return await self.client.get_match_record(match_id, priority=priority)
+
+        records = await asyncio.gather(*(fetch(match_id) for match_id in new_ids))
+
+        # Le curseur n'avance qu'une fois tous les matchs ingérés
+        self._cursors[puuid] = {"last_match_id": new_ids[0], "start_time": records[0].game_creation // 1000}
+
+        return list(records)
+
+    async def sync_many(self, puuids: list[str], priority: Priority = Priority.BACKFILL) -> dict[str, list[MatchRecord]]:
+        """Synchronise plusieurs joueurs puis sauvegarde les curseurs en une seule écriture."""
+        results: dict[str, list[MatchRecord]] = {}
+
+        for puuid in puuids:
+            try:
+                results[puuid] = await self.sync(puuid, priority=priority)
+            except ClientResponseError as e:
+                logger.warning(f"Synchro historique impossible pour {puuid[:15]}... : {e.status}")
+
+        self.save()
+        new_matches = sum(len(records) for records in results.values())
+        logger.info(f"Synchro historique : {new_matches} nouveaux matchs pour {len(results)}/{len(puuids)} joueurs")
+        return results
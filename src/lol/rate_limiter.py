@@ -0,0 +1,229 @@
+import asyncio
+import heapq
+import itertools
+import time
+from enum import IntEnum
+
+# Limites d'une clé de développement Riot : 20 requêtes/1s et 100 requêtes/2min
+DEFAULT_APP_LIMITS = "20:1,100:120"
+
+
+class Priority(IntEnum):
+    """Files de priorité des requêtes Riot (la plus petite valeur passe en premier)."""
+
+    INTERACTIVE = 0  # Commandes slash
+    REFRESH = 1  # Rafraîchissements planifiés (leaderboards, reset quotidien)
+    BACKFILL = 2  # Rattrapage d'historique en tâche de fond
+
+
+def parse_limits(header: str | None) -> list[tuple[int, float]]:
+    """Parse un en-tête Riot du type "20:1,100:120" en [(20, 1.0), (100, 120.0)]."""
+    if not header:
+        return []
+
+    limits = []
+    for part in header.split(","):
+        count, _, window = part.strip().partition(":")
+        if count and window:
+            limits.append((int(count), float(window)))
+    return limits
+
+
+class _Bucket:
+    """
+    Seau de `limit` jetons rechargé entièrement toutes les `window` secondes.
+
+    Riot compte les requêtes sur des fenêtres fixes qui démarrent à la première
+    requête : le seau se remplit donc d'un coup à la fin de la fenêtre.
+    """
+
+    __slots__ = ("limit", "window", "count", "reset_at")
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.count = 0
+        self.reset_at = 0.0
+
+    def _roll(self, now: float):
+        if now >= self.reset_at:
+            self.count = 0
+            self.reset_at = 0.0
+
+    def wait_time(self, now: float) -> float:
+        self._roll(now)
+        if self.count < self.limit:
+            return 0.0
+        return self.reset_at - now
+
+    def consume(self, now: float):
+        self._roll(now)
+        if not self.reset_at:
+            self.reset_at = now + self.window
+        self.count += 1
+
+    def sync(self, count: int, now: float):
+        """Recale le compteur sur celui renvoyé par Riot (il ne peut qu'augmenter)."""
+        self._roll(now)
+        if not self.reset_at:
+            self.reset_at = now + self.window
+        self.count = max(self.count, count)
+
+    def state(self, now: float) -> dict:
+        self._roll(now)
+        return {
+            "limit": self.limit,
+            "window": self.window,
+            "used": self.count,
+            "resets_in": round(max(0.0, self.reset_at - now), 2),
+        }
+
+
+class RateLimiter:
+    """
+    Ordonnanceur des requêtes Riot respectant les limites applicatives et par méthode.
+
+    Les limites sont lues dans les en-têtes X-App-Rate-Limit / X-Method-Rate-Limit
+    de chaque réponse ; une requête qui dépasserait une limite attend son tour au
+    lieu d'échouer, et un 429 bloque la région (ou la méthode) pendant Retry-After.
+    Les limites Riot s'appliquent par région de routage (euw1, europe, ...).
+
+    Les requêtes en attente d'une même région sont servies par priorité puis par
+    ordre d'arrivée : une commande slash passe devant un rafraîchissement en cours.
+    Une requête dont la méthode est bloquée (429, seau de méthode plein) ne retient
+    pas celles des autres méthodes : la première requête prête de la file passe.
+    """
+
+    def __init__(self, app_limits: str = DEFAULT_APP_LIMITS):
+        self._default_app_limits = parse_limits(app_limits)
+
+        self._app: dict[str, list[_Bucket]] = {}
+        self._methods: dict[tuple[str, str], list[_Bucket]] = {}
+        self._blocked_until: dict[str, float] = {}
+        self._method_blocked_until: dict[tuple[str, str], float] = {}
+        self._conditions: dict[str, asyncio.Condition] = {}
+        self._queues: dict[str, list[tuple[int, int, str]]] = {}
+        self._tickets = itertools.count()
+
+    def _app_buckets(self, region: str) -> list[_Bucket]:
+        if region not in self._app:
+            self._app[region] = [_Bucket(limit, window) for limit, window in self._default_app_limits]
+        return self._app[region]
+
+    def _app_delay(self, region: str, now: float) -> float:
+        """Temps d'attente imposé par les limites applicatives de la région (0 si immédiat)."""
+        delays = [self._blocked_until.get(region, 0.0) - now]
+        delays += [bucket.wait_time(now) for bucket in self._app_buckets(region)]
+        return max(0.0, *delays)
+
+    def _method_delay(self, region: str, method: str, now: float) -> float:
+        """Temps d'attente imposé par les limites de la méthode (0 si immédiat)."""
+        delays = [self._method_blocked_until.get((region, method), 0.0) - now]
+        delays += [bucket.wait_time(now) for bucket in self._methods.get((region, method), [])]
+        return max(0.0, *delays)
+
+    def _delay(self, region: str, method: str, now: float) -> float:
+        """Temps d'attente avant de pouvoir envoyer une requête (0 si immédiat)."""
+        return max(self._app_delay(region, now), self._method_delay(region, method, now))
+
+    async def acquire(self, region: str, method: str, priority: Priority = Priority.INTERACTIVE):
+        """Attend son tour et qu'un jeton soit disponible, puis le consomme."""
+        condition = self._conditions.setdefault(region, asyncio.Condition())
+        queue = self._queues.setdefault(region, [])
+        ticket = (int(priority), next(self._tickets), method)
+
+        async with condition:
+            heapq.heappush(queue, ticket)
+            was_first_ready = False
+            try:
+                while True:
+                    # Seule la première requête dont la méthode est prête attend les jetons
+                    # applicatifs, les autres attendent leur tour (ou le déblocage de leur méthode)
+                    now = time.monotonic()
+                    timeout: float | None = self._method_delay(region, method, now)
+                    if not timeout:
+                        first_ready = min(entry for entry in queue if not self._method_delay(region, entry[2], now))
+                        was_first_ready = first_ready == ticket
+                        timeout = self._app_delay(region, now) if was_first_ready else None
+                        if timeout is not None and timeout <= 0:
+                            break
+                    elif was_first_ready:
+                        # Méthode bloquée pendant l'attente (429) : la requête prête suivante prend la main
+                        was_first_ready = False
+                        condition.notify_all()
+                    try:
+                        await asyncio.wait_for(condition.wait(), timeout)
+                    except TimeoutError:
+                        pass
+
+                now = time.monotonic()
+                for bucket in self._app_buckets(region) + self._methods.get((region, method), []):
+                    bucket.consume(now)
+            finally:
+                queue.remove(ticket)
+                heapq.heapify(queue)
+                condition.notify_all()
+
+    def pending(self) -> dict[str, dict[str, int]]:
+        """Nombre de requêtes en attente par région et par priorité."""
+        return {region: {p.name.lower(): sum(1 for prio, _, _ in queue if prio == p) for p in Priority} for region, queue in self._queues.items() if queue}
+
+    def update(self, region: str, method: str, headers):
+        """Met à jour les seaux à partir des en-têtes de la réponse Riot."""
+        now = time.monotonic()
+
+        app_limits = parse_limits(headers.get("X-App-Rate-Limit"))
+        if app_limits:
+            self._app[region] = self._resize(self._app_buckets(region), app_limits)
+            self._sync(self._app[region], headers.get("X-App-Rate-Limit-Count"), now)
+
+        method_limits = parse_limits(headers.get("X-Method-Rate-Limit"))
+        if method_limits:
+            key = (region, method)
+            self._methods[key] = self._resize(self._methods.get(key, []), method_limits)
+            self._sync(self._methods[key], headers.get("X-Method-Rate-Limit-Count"), now)
+
+    def block(self, region: str, method: str, retry_after: float, limit_type: str | None = None):
+        """Suspend les requêtes après un 429 (toute la région si la limite applicative est atteinte)."""
+        until = time.monotonic() + retry_after
+        if limit_type == "application":
+            self._blocked_until[region] = max(self._blocked_until.get(region, 0.0), until)
+        else:
+            key = (region, method)
+            self._method_blocked_until[key] = max(self._method_blocked_until.get(key, 0.0), until)
+
+    def snapshot(self) -> dict:
+        """Remplissage actuel des seaux, par région et par méthode."""
+        now = time.monotonic()
+        status: dict[str, dict] = {}
+
+        for region in self._app.keys() | self._blocked_until.keys():
+            status[region] = {
+                "app": [bucket.state(now) for bucket in self._app_buckets(region)],
+                "methods": {},
+                "blocked_for": round(max(0.0, self._blocked_until.get(region, 0.0) - now), 2),
+            }
+
+        for (region, method), buckets in self._methods.items():
+            region_status = status.setdefault(region, {"app": [], "methods": {}, "blocked_for": 0.0})
+            region_status["methods"][method] = [bucket.state(now) for bucket in buckets]
+
+        return status
+
+    @staticmethod
+    def _resize(buckets: list[_Bucket], limits: list[tuple[int, float]]) -> list[_Bucket]:
+        """Adapte les seaux aux limites annoncées en gardant les compteurs existants."""
+        existing = {bucket.window: bucket for bucket in buckets}
+        resized = []
+        for limit, window in limits:
+            bucket = existing.get(window) or _Bucket(limit, window)
+            bucket.limit = limit
+            resized.append(bucket)
+        return resized
+
+    @staticmethod
+    def _sync(buckets: list[_Bucket], header: str | None, now: float):
+        counts = {window: count for count, window in parse_limits(header)}
+        for bucket in buckets:
+            if bucket.window in counts:
+                bucket.sync(counts[bucket.window], now)
@@ -0,0 +1,52 @@
+import random
+import zlib
+from typing import Iterable
+
+
+class RefreshScheduler:
+    """
+    Répartit le rafraîchissement des joueurs sur l'intervalle de fraîcheur visé.
+
+    L'intervalle est découpé en `slots` créneaux ; chaque joueur est affecté à
+    un créneau fixe d'après un hash de son PUUID (même créneau d'un cycle et
+    d'un redémarrage à l'autre), ce qui répartit les joueurs uniformément. À
+    chaque créneau, seuls ses joueurs sont interrogés : chaque profil a au plus
+    `interval` secondes de retard, sans pic de requêtes toutes les heures.
+
+    Dans un créneau, chaque requête est décalée d'un délai aléatoire entre 0 et
+    `jitter` x la durée du créneau, pour lisser aussi les appels à l'intérieur
+    du créneau.
+    """
+
+    def __init__(self, interval: float = 3600, slots: int = 12, jitter: float = 0.5, rng: random.Random | None = None):
+        if slots < 1:
+            raise ValueError("Le nombre de créneaux doit être au moins 1")
+
+        self.interval = interval
+        self.slots = slots
+        self.jitter = jitter
+        self._rng = rng or random.Random()
+        # Premier créneau tiré au hasard : deux redémarrages rapprochés ne rafraîchissent pas les mêmes joueurs
+        self._cursor = self._rng.randrange(slots)
+
+    @property
+    def slot_seconds(self) -> float:
+        """Durée d'un créneau (intervalle entre deux passages de la boucle)."""
+        return self.interval / self.slots
+
+    def slot_of(self, puuid: str) -> int:
+        return zlib.crc32(puuid.encode()) % self.slots
+
+    def shard(self, puuids: Iterable[str], slot: int) -> set[str]:
+        """Joueurs à rafraîchir pendant ce créneau."""
+        return {puuid for puuid in puuids if self.slot_of(puuid) == slot}
+
+    def next_slot(self) -> int:
+        """Créneau courant ; avance au suivant pour le prochain passage."""
+        slot = self._cursor
+        self._cursor = (self._cursor + 1) % self.slots
+        return slot
+
+    def delay(self) -> float:
+        """Décalage aléatoire d'une requête dans le créneau."""
+        return self._rng.uniform(0, self.jitter * self.slot_seconds) if self.jitter else 0.0
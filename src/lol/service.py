@@ -1,54 +1,111 @@
-from riotwatcher import ApiError
+import time
 
-from src.lol.client import RiotApiClient
+from aiohttp import ClientResponseError
+
+from src.lol.client import AsyncRiotApiClient
 from src.lol.exceptions import InvalidApiKey, PlayerNotFound, RateLimited
+from src.lol.rate_limiter import Priority
 
 
 class LeagueService:
-    def __init__(self, client: RiotApiClient):
+    # Un PUUID ne change jamais pour un compte ; le TTL couvre les changements de Riot ID
+    PUUID_TTL = 24 * 3600
+    # Les Riot ID introuvables (fautes de frappe) sont mémorisés moins longtemps
+    NOT_FOUND_TTL = 5 * 60
+    MAX_CACHED_IDS = 10_000
+
+    def __init__(self, client: AsyncRiotApiClient):
         self.client = client
 
-    def get_puuid(self, pseudo: str, tag: str):
+        # Riot ID -> compte (puuid, gameName et tagLine canoniques)
+        self._account_cache: dict[str, tuple[dict, float]] = {}
+        self._not_found: dict[str, float] = {}
+
+    @staticmethod
+    def _riot_id_key(pseudo: str, tag: str) -> str:
+        """Les Riot ID ne sont pas sensibles à la casse."""
+        return f"{pseudo.strip().casefold()}#{tag.strip().casefold()}"
+
+    def _prune_riot_id_cache(self, now: float):
+        """Purge les entrées expirées quand le cache devient trop gros (spam d'ID invalides)."""
+        if len(self._account_cache) + len(self._not_found) < self.MAX_CACHED_IDS:
+            return
+        self._account_cache = {k: v for k, v in self._account_cache.items() if v[1] > now}
+        self._not_found = {k: v for k, v in self._not_found.items() if v > now}
+
+    async def get_puuid(self, pseudo: str, tag: str, priority: Priority = Priority.INTERACTIVE):
+        account = await self.get_account(pseudo, tag, priority=priority)
+        return account["puuid"]
+
+    async def get_account(self, pseudo: str, tag: str, priority: Priority = Priority.INTERACTIVE) -> dict:
+        """Compte Riot d'un Riot ID (puuid, gameName et tagLine avec la casse enregistrée chez Riot)."""
+        key = self._riot_id_key(pseudo, tag)
+        now = time.monotonic()
+
+        cached = self._account_cache.get(key)
+        if cached and cached[1] > now:
+            return cached[0]
+        if self._not_found.get(key, 0.0) > now:
+            raise PlayerNotFound()
+
         try:
-            return self.client.get_puuid(pseudo, tag)
+            account = await self.client.get_account(pseudo, tag, priority=priority)
 
-        except ApiError as err:
+        except ClientResponseError as err:
+            if err.status == 404:
+                self._prune_riot_id_cache(now)
+                self._not_found[key] = now + self.NOT_FOUND_TTL
             self._handle_api_error(err)
 
-    def make_profile(self, puuid: str):
+        self._prune_riot_id_cache(now)
+        self._account_cache[key] = (account, now + self.PUUID_TTL)
+        self._not_found.pop(key, None)
+        return account
+
+    async def make_profile(self, puuid: str, riot_id: tuple[str, str] | None = None, priority: Priority = Priority.INTERACTIVE):
         try:
-            return self.client.make_profile(puuid)
-        except ApiError as err:
+            return await self.client.make_profile(puuid, riot_id=riot_id, priority=priority)
+        except ClientResponseError as err:
             self._handle_api_error(err)
 
-    def get_match_history(
+    async def get_match_history(
         self,
         pseudo: str,
         tag: str,
         count: int = 10,
         queue: int | None = None,
+        priority: Priority = Priority.INTERACTIVE,
     ):
         try:
-            puuid = self.get_puuid(pseudo, tag)
-            return self.client.get_match_ids(
+            puuid = await self.get_puuid(pseudo, tag, priority=priority)
+            return await self.client.get_match_ids(
                 puuid=puuid,
                 count=count,
                 queue=queue,
+                priority=priority,
             )
 
-        except ApiError as err:
+        except ClientResponseError as err:
             self._handle_api_error(err)
 
-    def get_match_details(self, match_id: str):
+    async def get_match_details(self, match_id: str, priority: Priority = Priority.INTERACTIVE):
         try:
-            return self.client.get_match_info(match_id)
+            return await self.client.get_match_info(match_id, priority=priority)
 
-        except ApiError as err:
+        except ClientResponseError as err:
             self._handle_api_error(err)
 
+    def rate_limit_status(self) -> dict:
+        """Remplissage actuel des limites Riot (voir RateLimiter.snapshot)."""
+        return self.client.rate_limiter.snapshot()
+
+    async def close(self):
+        """Libère la session HTTP du client."""
+        await self.client.close()
+
     @staticmethod
-    def _handle_api_error(err: ApiError):
-        code = getattr(err.response, "status_code", None)
+    def _handle_api_error(err: ClientResponseError):
+        code = err.status
 
         if code == 404:
             raise PlayerNotFound()
@@ -1,6 +1,7 @@
 # src/main.py
 import asyncio
 import os
+import signal
 import sys
 from pathlib import Path
 
@@ -9,6 +10,7 @@ from discord.ext import commands
 from dotenv import load_dotenv
 from loguru import logger
 
+from .storage.yaml_store import default_store
 from .utils.logger import setup_logger
 
 # Charger les variables d'environnement
@@ -116,6 +118,34 @@ class DiscordBot(commands.Bot):
         logger.exception(f"Erreur dans l'événement {event_method}")
 
 
+async def shutdown(bot: DiscordBot, sig: signal.Signals):
+    """Ferme le bot à la réception d'un signal d'arrêt (docker stop, Ctrl+C)"""
+    logger.warning(f"Signal {sig.name} reçu, arrêt du bot...")
+    # Décharge les cogs (cog_unload) et fait retourner bot.start()
+    await bot.close()
+
+
+_shutdown_tasks: set[asyncio.Task] = set()
+
+
+def _schedule_shutdown(bot: DiscordBot, sig: signal.Signals):
+    # Référence gardée : la boucle ne conserve qu'une référence faible vers la tâche
+    task = asyncio.create_task(shutdown(bot, sig))
+    _shutdown_tasks.add(task)
+    task.add_done_callback(_shutdown_tasks.discard)
+
+
+def install_signal_handlers(bot: DiscordBot):
+    """Arrête proprement le bot sur SIGTERM/SIGINT au lieu de tuer le processus"""
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, _schedule_shutdown, bot, sig)
+        except NotImplementedError:
+            # Windows : pas de gestionnaire de signaux sur la boucle asyncio
+            logger.debug(f"Gestionnaire de {sig.name} indisponible sur cette plateforme")
+
+
 async def main():
     """Fonction principale pour lancer le bot"""
 
@@ -131,6 +161,7 @@ async def main():
 
     # Créer et lancer le bot
     bot = DiscordBot()
+    install_signal_handlers(bot)
 
     try:
         logger.info("Démarrage du bot...")
@@ -146,6 +177,10 @@ async def main():
         sys.exit(1)
     finally:
         logger.info("Fermeture du bot...")
+        if not bot.is_closed():
+            await bot.close()
+        # Écriture des données encore en attente dans le store YAML
+        default_store.flush()
         logger.success("Bot arrêté proprement")
 
 
@@ -0,0 +1,58 @@
+import os
+import shutil
+import tempfile
+
+
+def backup_path(path: str, index: int = 1) -> str:
+    return f"{path}.bak.{index}"
+
+
+def atomic_write_text(path: str, text: str, backups: int = 0):
+    """
+    Écrit `text` dans `path` sans jamais laisser de fichier tronqué.
+
+    Le contenu est écrit dans un fichier temporaire du même dossier, synchronisé
+    sur disque (fsync) puis renommé sur la cible : en cas d'arrêt brutal, on
+    retrouve soit l'ancien fichier, soit le nouveau. Avec `backups` > 0, les
+    versions précédentes sont conservées en `path.bak.1` (la plus récente) à
+    `path.bak.N`.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+
+        if backups and os.path.exists(path):
+            _rotate_backups(path, backups)
+
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+    _fsync_directory(directory)
+
+
+def _rotate_backups(path: str, backups: int):
+    for index in range(backups - 1, 0, -1):
+        if os.path.exists(backup_path(path, index)):
+            os.replace(backup_path(path, index), backup_path(path, index + 1))
+    shutil.copy2(path, backup_path(path, 1))
+
+
+def _fsync_directory(directory: str):
+    """Rend le renommage durable (POSIX uniquement)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,65 @@
+from abc import ABC, abstractmethod
+
+# Sections de la config des messages permanents, par type de message
+BOARD_SECTIONS = {"leaderboard": "leaderboards", "lp_recap": "lp_recaps"}
+
+
+class LolStorage(ABC):
+    """
+    Stockage des données du cog SetupLol : comptes liés, messages permanents
+    et tracking LP.
+
+    Les structures échangées sont celles des anciens fichiers YAML :
+    - utilisateurs : {discord_id: {"puuid", "pseudo", "tag", "cached_stats"?}}
+    - config : {"leaderboards" | "lp_recaps": {guild_id: {queue_type: {"channel_id", "message_id"}}}}
+    - tracking : {discord_id: {queue_type: {"start_lp", "start_date", "daily_lp", "last_reset"}}}
+    Les identifiants Discord sont toujours des chaînes.
+    """
+
+    # --- Utilisateurs ---
+
+    @abstractmethod
+    def load_users(self) -> dict:
+        """Tous les utilisateurs liés."""
+
+    @abstractmethod
+    def get_user(self, discord_id: str) -> dict | None:
+        """Un utilisateur par son ID Discord."""
+
+    @abstractmethod
+    def find_user_by_puuid(self, puuid: str) -> tuple[str, dict] | None:
+        """(discord_id, utilisateur) lié à ce PUUID."""
+
+    @abstractmethod
+    def upsert_users(self, users: dict):
+        """Crée ou remplace les utilisateurs donnés (les autres sont conservés)."""
+
+    def upsert_user(self, discord_id: str, entry: dict):
+        self.upsert_users({discord_id: entry})
+
+    # --- Messages permanents ---
+
+    @abstractmethod
+    def load_config(self) -> dict:
+        """Config de tous les messages permanents."""
+
+    @abstractmethod
+    def upsert_board(self, config_type: str, guild_id: str, queue_type: str, channel_id: int, message_id: int):
+        """Enregistre le message permanent d'un serveur pour une file."""
+
+    # --- Tracking LP ---
+
+    @abstractmethod
+    def load_lp_tracking(self) -> dict:
+        """Tracking LP de tous les utilisateurs."""
+
+    @abstractmethod
+    def get_lp_tracking(self, discord_id: str, queue_type: str) -> dict | None:
+        """Tracking LP d'un utilisateur pour une file."""
+
+    @abstractmethod
+    def upsert_lp_tracking(self, tracking: dict):
+        """Crée ou remplace les entrées données ({discord_id: {queue_type: entrée}})."""
+
+    def close(self):
+        """Libère les ressources du stockage."""
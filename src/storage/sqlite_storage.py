@@ -0,0 +1,158 @@
+import json
+import os
+import sqlite3
+
+from loguru import logger
+
+from src.storage.base import BOARD_SECTIONS, LolStorage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    discord_id TEXT PRIMARY KEY,
+    puuid TEXT NOT NULL,
+    pseudo TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    cached_stats TEXT
+);
+CREATE INDEX IF NOT EXISTS users_puuid ON users (puuid);
+
+CREATE TABLE IF NOT EXISTS boards (
+    config_type TEXT NOT NULL,
+    guild_id TEXT NOT NULL,
+    queue_type TEXT NOT NULL,
+    channel_id INTEGER NOT NULL,
+    message_id INTEGER NOT NULL,
+    PRIMARY KEY (config_type, guild_id, queue_type)
+);
+
+CREATE TABLE IF NOT EXISTS lp_tracking (
+    discord_id TEXT NOT NULL,
+    queue_type TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (discord_id, queue_type)
+);
+"""
+
+
+class SqliteStorage(LolStorage):
+    """
+    Stockage SQLite (mode WAL) : lectures indexées par ID Discord ou PUUID et
+    écritures ligne par ligne, quel que soit le nombre d'utilisateurs.
+
+    Les stats en cache et les entrées de tracking sont stockées en JSON pour
+    garder exactement les structures de l'ancien format YAML.
+    """
+
+    def __init__(self, path: str = "./data/floshy.db"):
+        self.path = path
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def is_empty(self) -> bool:
+        """Vrai si aucune donnée n'a encore été enregistrée."""
+        return not any(self._conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() for table in ("users", "boards", "lp_tracking"))
+
+    # --- Utilisateurs ---
+
+    @staticmethod
+    def _user_entry(row: sqlite3.Row) -> dict:
+        entry = {"puuid": row["puuid"], "pseudo": row["pseudo"], "tag": row["tag"]}
+        if row["cached_stats"] is not None:
+            entry["cached_stats"] = json.loads(row["cached_stats"])
+        return entry
+
+    def load_users(self) -> dict:
+        return {row["discord_id"]: self._user_entry(row) for row in self._conn.execute("SELECT * FROM users")}
+
+    def get_user(self, discord_id: str) -> dict | None:
+        row = self._conn.execute("SELECT * FROM users WHERE discord_id = ?", (discord_id,)).fetchone()
+        return self._user_entry(row) if row else None
+
+    def find_user_by_puuid(self, puuid: str) -> tuple[str, dict] | None:
+        row = self._conn.execute("SELECT * FROM users WHERE puuid = ?", (puuid,)).fetchone()
+        return (row["discord_id"], self._user_entry(row)) if row else None
+
+    def upsert_users(self, users: dict):
+        rows = [
+            (discord_id, entry["puuid"], entry["pseudo"], entry["tag"], json.dumps(entry["cached_stats"]) if "cached_stats" in entry else None)
+            for discord_id, entry in users.items()
+        ]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO users (discord_id, puuid, pseudo, tag, cached_stats) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (discord_id) DO UPDATE SET puuid = excluded.puuid, pseudo = excluded.pseudo, "
+                "tag = excluded.tag, cached_stats = excluded.cached_stats",
+                rows,
+            )
+
+    # --- Messages permanents ---
+
+    def load_config(self) -> dict:
+        config: dict = {}
+        for row in self._conn.execute("SELECT * FROM boards"):
+            boards = config.setdefault(BOARD_SECTIONS[row["config_type"]], {}).setdefault(row["guild_id"], {})
+            boards[row["queue_type"]] = {"channel_id": row["channel_id"], "message_id": row["message_id"]}
+        return config
+
+    def upsert_board(self, config_type: str, guild_id: str, queue_type: str, channel_id: int, message_id: int):
+        if config_type not in BOARD_SECTIONS:
+            raise KeyError(config_type)
+
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO boards (config_type, guild_id, queue_type, channel_id, message_id) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (config_type, guild_id, queue_type) DO UPDATE SET channel_id = excluded.channel_id, message_id = excluded.message_id",
+                (config_type, guild_id, queue_type, channel_id, message_id),
+            )
+
+    # --- Tracking LP ---
+
+    def load_lp_tracking(self) -> dict:
+        tracking: dict = {}
+        for row in self._conn.execute("SELECT * FROM lp_tracking"):
+            tracking.setdefault(row["discord_id"], {})[row["queue_type"]] = json.loads(row["data"])
+        return tracking
+
+    def get_lp_tracking(self, discord_id: str, queue_type: str) -> dict | None:
+        row = self._conn.execute("SELECT data FROM lp_tracking WHERE discord_id = ? AND queue_type = ?", (discord_id, queue_type)).fetchone()
+        if not row:
+            return None
+
+        entry: dict = json.loads(row["data"])
+        return entry
+
+    def upsert_lp_tracking(self, tracking: dict):
+        rows = [(discord_id, queue_type, json.dumps(entry)) for discord_id, queues in tracking.items() for queue_type, entry in queues.items()]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO lp_tracking (discord_id, queue_type, data) VALUES (?, ?, ?) "
+                "ON CONFLICT (discord_id, queue_type) DO UPDATE SET data = excluded.data",
+                rows,
+            )
+
+
+def import_from(source: LolStorage, target: LolStorage):
+    """Copie toutes les données d'un stockage vers un autre (migration YAML -> SQLite)."""
+    users = source.load_users()
+    target.upsert_users({str(d_id): u_data for d_id, u_data in users.items()})
+
+    config = source.load_config()
+    boards = 0
+    for config_type, section in BOARD_SECTIONS.items():
+        for guild_id, queues in config.get(section, {}).items():
+            for queue_type, board in queues.items():
+                target.upsert_board(config_type, str(guild_id), queue_type, board["channel_id"], board["message_id"])
+                boards += 1
+
+    tracking = source.load_lp_tracking()
+    target.upsert_lp_tracking({str(d_id): queues for d_id, queues in tracking.items()})
+
+    logger.success(f"Import terminé : {len(users)} utilisateurs, {boards} messages permanents, {len(tracking)} trackings LP")
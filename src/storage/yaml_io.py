@@ -0,0 +1,18 @@
+import yaml
+
+# Implémentation C (libyaml) si PyYAML a été compilé avec, sinon Python pur
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+LIBYAML = SafeLoader is not yaml.SafeLoader
+
+
+def load_yaml(stream) -> dict:
+    """Équivalent de yaml.safe_load (un document vide donne {})."""
+    data: dict = yaml.load(stream, Loader=SafeLoader) or {}
+    return data
+
+
+def dump_yaml(data: dict) -> str:
+    """Équivalent de yaml.safe_dump avec le format des fichiers de données du bot."""
+    text: str = yaml.dump(data, Dumper=SafeDumper, default_flow_style=False, allow_unicode=True)
+    return text
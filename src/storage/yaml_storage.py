@@ -0,0 +1,77 @@
+import os
+
+from src.storage.base import BOARD_SECTIONS, LolStorage
+from src.storage.yaml_store import YamlStore, default_store
+
+
+class YamlStorage(LolStorage):
+    """
+    Stockage historique : un fichier YAML par type de données (users.yml,
+    config.yml, lp_history.yml), gardé en mémoire par un YamlStore partagé.
+    """
+
+    def __init__(
+        self,
+        users_path: str = "./data/users.yml",
+        config_path: str = "./data/config.yml",
+        tracking_path: str = "./data/lp_history.yml",
+        store: YamlStore | None = None,
+    ):
+        self.users_path = users_path
+        self.config_path = config_path
+        self.tracking_path = tracking_path
+        self.store = store or default_store
+
+        for path in (self.users_path, self.config_path, self.tracking_path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def _read(self, path: str) -> dict:
+        return self.store.get(path)
+
+    def _write(self, path: str, data: dict):
+        self.store.set(path, data)
+
+    def close(self):
+        self.store.flush()
+
+    # --- Utilisateurs ---
+
+    def load_users(self) -> dict:
+        return self._read(self.users_path)
+
+    def get_user(self, discord_id: str) -> dict | None:
+        return self.load_users().get(discord_id)
+
+    def find_user_by_puuid(self, puuid: str) -> tuple[str, dict] | None:
+        return next(((d_id, u_data) for d_id, u_data in self.load_users().items() if u_data.get("puuid") == puuid), None)
+
+    def upsert_users(self, users: dict):
+        data = self.load_users()
+        data.update(users)
+        self._write(self.users_path, data)
+
+    # --- Messages permanents ---
+
+    def load_config(self) -> dict:
+        return self._read(self.config_path)
+
+    def upsert_board(self, config_type: str, guild_id: str, queue_type: str, channel_id: int, message_id: int):
+        config = self.load_config()
+        boards = config.setdefault(BOARD_SECTIONS[config_type], {}).setdefault(guild_id, {})
+        boards[queue_type] = {"channel_id": channel_id, "message_id": message_id}
+        self._write(self.config_path, config)
+
+    # --- Tracking LP ---
+
+    def load_lp_tracking(self) -> dict:
+        return self._read(self.tracking_path)
+
+    def get_lp_tracking(self, discord_id: str, queue_type: str) -> dict | None:
+        entry: dict | None = self.load_lp_tracking().get(discord_id, {}).get(queue_type)
+        return entry
+
+    def upsert_lp_tracking(self, tracking: dict):
+        data = self.load_lp_tracking()
+        for discord_id, queues in tracking.items():
+            data.setdefault(discord_id, {}).update(queues)
+        self._write(self.tracking_path, data)
@@ -0,0 +1,95 @@
+import asyncio
+import os
+
+import yaml
+from loguru import logger
+
+from src.storage.atomic import atomic_write_text, backup_path
+from src.storage.yaml_io import dump_yaml, load_yaml
+
+
+class YamlStore:
+    """
+    Fichiers YAML gardés en mémoire, avec écriture différée (write-behind).
+
+    Le bot est le seul à écrire dans ses fichiers de données : chaque fichier est
+    lu une seule fois, puis toutes les lectures sont servies depuis la mémoire.
+    Les modifications marquent le fichier comme modifié ; les fichiers modifiés
+    sont écrits ensemble au plus `flush_delay` secondes après la première
+    modification, et au déchargement des cogs (flush). Chaque écriture est
+    atomique et garde `backups` versions précédentes du fichier.
+
+    Les dictionnaires renvoyés par `get` sont l'état du store lui-même : après
+    les avoir modifiés, il faut appeler `set` pour qu'ils soient écrits.
+    """
+
+    def __init__(self, flush_delay: float = 2.0, backups: int = 0):
+        self.flush_delay = flush_delay
+        self.backups = backups
+
+        self._data: dict[str, dict] = {}
+        self._dirty: set[str] = set()
+        self._timer: asyncio.TimerHandle | None = None
+        self._timer_loop: asyncio.AbstractEventLoop | None = None
+
+    def get(self, path: str) -> dict:
+        """Contenu du fichier (lu sur disque au premier accès seulement)."""
+        if path not in self._data:
+            data: dict = {}
+            if os.path.exists(path):
+                try:
+                    data = self._read(path)
+                except yaml.YAMLError as e:
+                    if not os.path.exists(backup_path(path)):
+                        raise
+                    logger.error(f"YAML illisible {path} ({e}), restauration depuis la sauvegarde")
+                    data = self._read(backup_path(path))
+            self._data[path] = data
+        return self._data[path]
+
+    @staticmethod
+    def _read(path: str) -> dict:
+        with open(path, "r", encoding="utf-8") as f:
+            return load_yaml(f)
+
+    def set(self, path: str, data: dict):
+        """Remplace le contenu du fichier et planifie son écriture."""
+        self._data[path] = data
+        self._dirty.add(path)
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Hors de la boucle asyncio (scripts, tests synchrones) : écriture immédiate
+            self.flush()
+            return
+
+        if self._timer is None or self._timer_loop is not loop:
+            self._timer = loop.call_later(self.flush_delay, self.flush)
+            self._timer_loop = loop
+
+    def flush(self):
+        """Écrit tous les fichiers modifiés."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        for path in sorted(self._dirty):
+            try:
+                self._write(path, self._data[path])
+            except Exception as e:
+                logger.error(f"Erreur écriture YAML {path}: {e}")
+                continue
+            self._dirty.discard(path)
+
+    def _write(self, path: str, data: dict):
+        atomic_write_text(path, dump_yaml(data), backups=self.backups)
+
+    def is_dirty(self, path: str) -> bool:
+        return path in self._dirty
+
+
+# Store partagé par tous les cogs du bot (une sauvegarde par fichier)
+default_store = YamlStore(backups=1)
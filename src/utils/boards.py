@@ -0,0 +1,17 @@
+import discord
+from loguru import logger
+
+
+async def edit_board(channel: discord.TextChannel, message_id: int, embed: discord.Embed) -> discord.Message | None:
+    """
+    Édite un message permanent directement par ses IDs, sans fetch_message préalable.
+
+    Si le message a été supprimé, il est recréé dans le salon : le nouveau
+    message est renvoyé pour que l'appelant enregistre son ID (None sinon).
+    """
+    try:
+        await channel.get_partial_message(message_id).edit(embed=embed)
+        return None
+    except discord.NotFound:
+        logger.warning(f"Message permanent {message_id} introuvable, recréation")
+        return await channel.send(embed=embed)
@@ -0,0 +1,33 @@
+import hashlib
+import json
+
+import discord
+
+
+def embed_hash(embed: discord.Embed) -> str:
+    """Empreinte du contenu affiché d'un embed (le timestamp est ignoré)."""
+    data = embed.to_dict()
+    data.pop("timestamp", None)
+    return hashlib.sha1(json.dumps(data, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+
+class EmbedHashes:
+    """
+    Dernier contenu publié de chaque message permanent, par ID de message.
+
+    Permet de sauter l'edit quand l'embed recalculé est identique à celui
+    déjà affiché. Gardé en mémoire : après un redémarrage, chaque message est
+    réédité une fois.
+    """
+
+    def __init__(self) -> None:
+        self._hashes: dict[int, str] = {}
+
+    def unchanged(self, message_id: int, embed: discord.Embed) -> bool:
+        return self._hashes.get(message_id) == embed_hash(embed)
+
+    def remember(self, message_id: int, embed: discord.Embed):
+        self._hashes[message_id] = embed_hash(embed)
+
+    def forget(self, message_id: int):
+        self._hashes.pop(message_id, None)
@@ -0,0 +1,75 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+from loguru import logger
+
+
+class RefreshCoordinator:
+    """
+    Regroupe les demandes de rafraîchissement d'un même affichage (ex : un serveur).
+
+    Une demande marque la clé comme à rafraîchir ; le rafraîchissement n'a lieu
+    qu'après `delay` secondes sans nouvelle demande, et au plus tard `max_delay`
+    secondes après la première. Une rafale de commandes ne coûte ainsi qu'un
+    rafraîchissement par clé, avec une latence maximale garantie.
+    """
+
+    def __init__(self, callback: Callable[[Any], Awaitable[None]], delay: float = 5.0, max_delay: float = 30.0):
+        self.callback = callback
+        self.delay = delay
+        self.max_delay = max_delay
+
+        self._first: dict[Hashable, float] = {}
+        self._last: dict[Hashable, float] = {}
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+
+    def request(self, key: Hashable):
+        """Demande un rafraîchissement de `key` (à appeler depuis la boucle asyncio)."""
+        now = asyncio.get_running_loop().time()
+        self._last[key] = now
+
+        if key not in self._tasks:
+            self._first[key] = now
+            self._tasks[key] = asyncio.create_task(self._run(key))
+
+    def pending(self) -> set[Hashable]:
+        return set(self._tasks)
+
+    async def _run(self, key: Hashable):
+        loop = asyncio.get_running_loop()
+        while True:
+            deadline = min(self._last[key] + self.delay, self._first[key] + self.max_delay)
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(remaining)
+
+        # Une demande arrivée pendant le rafraîchissement en programme un nouveau
+        self._forget(key)
+        await self._refresh(key)
+
+    async def _refresh(self, key: Hashable):
+        try:
+            await self.callback(key)
+        except Exception:
+            logger.exception(f"Erreur lors du rafraîchissement de {key}")
+
+    def _forget(self, key: Hashable) -> asyncio.Task | None:
+        self._first.pop(key, None)
+        self._last.pop(key, None)
+        return self._tasks.pop(key, None)
+
+    async def flush(self):
+        """Rafraîchit immédiatement toutes les clés en attente."""
+        for key in list(self._tasks):
+            task = self._forget(key)
+            if task:
+                task.cancel()
+            await self._refresh(key)
+
+    def cancel(self):
+        """Abandonne les rafraîchissements en attente (déchargement du cog)."""
+        for key in list(self._tasks):
+            task = self._forget(key)
+            if task:
+                task.cancel()
@@ -7,6 +7,7 @@ import pytest
 import yaml
 
 from src.cogs.birthday import Birthday
+from src.storage.yaml_store import YamlStore
 
 # --- FIXTURES (Configuration) ---
 
@@ -35,6 +36,7 @@ def mock_channel():
     channel.id = 111
     channel.send = AsyncMock()
     channel.fetch_message = AsyncMock()
+    channel.get_partial_message = MagicMock()
 
     mock_msg = MagicMock()
     mock_msg.id = 999
@@ -42,6 +44,7 @@ def mock_channel():
 
     channel.send.return_value = mock_msg
     channel.fetch_message.return_value = mock_msg
+    channel.get_partial_message.return_value = mock_msg
 
     return channel
 
@@ -78,7 +81,7 @@ def mock_interaction(mock_guild):
 def birthday_cog(mock_bot, temp_paths):
     """Instancie le Cog."""
     db, config = temp_paths
-    cog = Birthday(mock_bot, db_path=db, config_path=config)
+    cog = Birthday(mock_bot, db_path=db, config_path=config, store=YamlStore())
     cog.reminder_task.cancel()
     return cog
 
@@ -92,6 +95,8 @@ async def test_set_my_birthday_valid(birthday_cog, mock_interaction):
     # CORRECTION : Utilisation de .callback(self, ...)
     await birthday_cog.set_my_birthday.callback(birthday_cog, mock_interaction, 15, 5, 2000)
 
+    # Écriture différée : on force l'écriture avant de relire le fichier
+    birthday_cog.store.flush()
     assert os.path.exists(birthday_cog.db_path)
 
     with open(birthday_cog.db_path, "r") as f:
@@ -105,6 +110,22 @@ async def test_set_my_birthday_valid(birthday_cog, mock_interaction):
     assert "✅" in mock_interaction.response.send_message.call_args[0][0]
 
 
+@pytest.mark.asyncio
+async def test_birthday_burst_refreshes_once(birthday_cog, mock_interaction):
+    """Une rafale de commandes ne déclenche qu'un rafraîchissement différé par serveur."""
+    refresh = birthday_cog._display_refresher.callback = AsyncMock()
+
+    for day in range(1, 6):
+        await birthday_cog.set_my_birthday.callback(birthday_cog, mock_interaction, day, 5, 2000)
+    await birthday_cog.birthday_delete.callback(birthday_cog, mock_interaction)
+
+    refresh.assert_not_called()
+    assert birthday_cog._display_refresher.pending() == {mock_interaction.guild.id}
+
+    await birthday_cog._display_refresher.flush()
+    refresh.assert_awaited_once_with(mock_interaction.guild.id)
+
+
 @pytest.mark.asyncio
 async def test_set_my_birthday_invalid_date(birthday_cog, mock_interaction):
     """Test le rejet d'une date invalide."""
@@ -127,6 +148,7 @@ async def test_birthday_delete(birthday_cog, mock_interaction):
     await birthday_cog.birthday_delete.callback(birthday_cog, mock_interaction)
 
     # Vérification
+    birthday_cog.store.flush()
     with open(birthday_cog.db_path, "r") as f:
         new_data = yaml.safe_load(f)
 
@@ -176,6 +198,7 @@ async def test_setup_birthday(birthday_cog, mock_interaction, mock_guild, mock_c
         mock_guild.create_text_channel.assert_called_once()
         assert mock_channel.send.call_count == 2
 
+        birthday_cog.store.flush()
         with open(birthday_cog.config_path, "r") as f:
             config = yaml.safe_load(f)
 
@@ -183,21 +206,28 @@ async def test_setup_birthday(birthday_cog, mock_interaction, mock_guild, mock_c
         assert config[str(mock_guild.id)]["channel_id"] == 111
 
         mock_guild.get_channel.assert_called()
-        assert mock_channel.fetch_message.call_count >= 2
+        assert mock_channel.get_partial_message.call_count >= 2
+        mock_channel.fetch_message.assert_not_called()
 
 
 @pytest.mark.asyncio
-async def test_yaml_errors(birthday_cog):
+async def test_yaml_errors(birthday_cog, tmp_path):
     """Vérifie la robustesse si le YAML est corrompu ou illisible."""
+    fake_path = str(tmp_path / "fake_path.yml")
+    with open(fake_path, "w") as f:
+        f.write("test: 1")
+
     # Simulation d'une erreur de lecture
     with patch("builtins.open", side_effect=OSError("Disque plein")):
-        data = birthday_cog._load_data("fake_path.yml")
+        data = birthday_cog._load_data(fake_path)
         assert data == {}  # Doit retourner dict vide, pas crasher
 
-    # Simulation d'une erreur d'écriture
-    with patch("builtins.open", side_effect=OSError("Permission denied")):
+    # Simulation d'une erreur d'écriture (au moment de l'écriture différée)
+    birthday_cog._save_data(fake_path, {"test": 2})
+    with patch("src.storage.yaml_store.atomic_write_text", side_effect=OSError("Permission denied")):
         # Ne doit pas lever d'exception
-        birthday_cog._save_data("fake_path.yml", {"test": 1})
+        birthday_cog.store.flush()
+    assert birthday_cog.store.is_dirty(fake_path)
 
 
 @pytest.mark.asyncio
@@ -224,17 +254,39 @@ async def test_refresh_displays_edge_cases(birthday_cog, mock_channel):
 
     await birthday_cog._refresh_displays(guild_id)
     # Le code doit s'arrêter à "if not isinstance(..., TextChannel)"
-    # On vérifie que fetch_message n'est JAMAIS appelé
-    voice_channel.fetch_message.assert_not_called()
+    # On vérifie qu'aucun message n'est JAMAIS édité
+    voice_channel.get_partial_message.assert_not_called()
 
     # Cas 3 : Les messages ont été supprimés manuellement
     # On remet un bon salon textuel
     mock_guild.get_channel.return_value = mock_channel
-    # On simule une erreur 404 Not Found sur le fetch_message
-    mock_channel.fetch_message.side_effect = discord.NotFound(MagicMock(), "Msg deleted")
+    # On simule une erreur 404 Not Found sur l'edit : les messages sont recréés
+    mock_channel.get_partial_message.return_value.edit.side_effect = discord.NotFound(MagicMock(), "Msg deleted")
+    mock_channel.send.return_value = MagicMock(id=555)
 
     await birthday_cog._refresh_displays(guild_id)
-    # Doit logger un warning mais pas crasher
+
+    assert mock_channel.send.await_count == 2
+    assert birthday_cog._load_data(birthday_cog.config_path)[str(guild_id)] == {"channel_id": 111, "msg_global_id": 555, "msg_month_id": 555}
+
+
+@pytest.mark.asyncio
+async def test_refresh_displays_skips_unchanged_messages(birthday_cog, mock_guild, mock_channel):
+    """Un message dont le contenu n'a pas changé n'est pas réédité."""
+    birthday_cog._save_data(birthday_cog.config_path, {str(mock_guild.id): {"channel_id": 111, "msg_global_id": 999, "msg_month_id": 888}})
+    birthday_cog.bot.get_guild.return_value = mock_guild
+
+    await birthday_cog._refresh_displays(mock_guild.id)
+    await birthday_cog._refresh_displays(mock_guild.id)
+
+    assert mock_channel.get_partial_message.call_count == 2
+    assert mock_channel.get_partial_message.return_value.edit.await_count == 2
+
+    # Nouvel anniversaire : seule la liste globale change (pas le mois en cours, sauf en juin)
+    birthday_cog._save_data(birthday_cog.db_path, {"123": {"jour": 15, "mois": 6 if datetime.now().month != 6 else 7, "annee": 2000, "username": "Bob"}})
+    await birthday_cog._refresh_displays(mock_guild.id)
+
+    assert mock_channel.get_partial_message.call_count == 3
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,33 @@
+import datetime
+
+import discord
+
+from src.utils.embed_hash import EmbedHashes, embed_hash
+
+
+def make_embed(description: str = "Contenu") -> discord.Embed:
+    embed = discord.Embed(title="Leaderboard", description=description)
+    embed.set_footer(text="Footer")
+    return embed
+
+
+def test_hash_ignores_timestamp():
+    first, second = make_embed(), make_embed()
+    first.timestamp = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+    second.timestamp = datetime.datetime(2026, 1, 2, tzinfo=datetime.timezone.utc)
+
+    assert embed_hash(first) == embed_hash(second)
+    assert embed_hash(first) != embed_hash(make_embed("Autre contenu"))
+
+
+def test_embed_hashes():
+    hashes = EmbedHashes()
+
+    assert not hashes.unchanged(1, make_embed())
+    hashes.remember(1, make_embed())
+    assert hashes.unchanged(1, make_embed())
+    assert not hashes.unchanged(1, make_embed("Autre contenu"))
+    assert not hashes.unchanged(2, make_embed())
+
+    hashes.forget(1)
+    assert not hashes.unchanged(1, make_embed())
@@ -1,280 +1,279 @@
 # tests/test_lol_client.py - Ajoutez ces tests
 
-from unittest.mock import MagicMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from src.lol.client import RiotApiClient
+from src.lol.client import AsyncRiotApiClient, _build_profile
+from src.lol.match_cache import MatchCache
+from src.lol.rate_limiter import Priority
 
+ACCOUNT = {"gameName": "Player", "tagLine": "EUW"}
+SUMMONER = {"summonerLevel": 100, "profileIconId": 5}
 
-@pytest.fixture
-def client():
-    # On mock les watchers pour éviter tout appel réseau réel
-    with patch("src.lol.client.LolWatcher"), patch("src.lol.client.RiotWatcher"):
-        return RiotApiClient("FAKE_KEY")
 
+def test_build_profile_without_ranked():
+    profile = _build_profile(ACCOUNT, SUMMONER, [])
 
-def test_get_puuid_success(client):
-    """Couvre RiotApiClient.get_puuid (0% -> 100%)"""
-    client.riot.account.by_riot_id.return_value = {"puuid": "puuid_de_test_123"}
+    assert profile["name"] == "Player"
+    assert profile["tag"] == "EUW"
+    assert profile["level"] == 100
+    assert profile["rankedStats"]["soloq"] is None
+    assert profile["rankedStats"]["flex"] is None
 
-    puuid = client.get_puuid("Pseudo", "Tag")
 
-    assert puuid == "puuid_de_test_123"
-    client.riot.account.by_riot_id.assert_called_once_with("europe", "Pseudo", "Tag")
+def test_build_profile_with_ranked():
+    """Couvre les calculs de winrate"""
+    ranked_entries = [
+        {"queueType": "RANKED_SOLO_5x5", "tier": "DIAMOND", "rank": "II", "leaguePoints": 75, "wins": 60, "losses": 40},
+        {"queueType": "RANKED_FLEX_SR", "tier": "PLATINUM", "rank": "I", "leaguePoints": 50, "wins": 30, "losses": 20},
+    ]
 
+    profile = _build_profile(ACCOUNT, SUMMONER, ranked_entries)
 
-def test_make_profile_extract_none(client):
-    """Couvre RiotApiClient.make_profile.extract (29% -> 100%)"""
-    client.riot.account.by_puuid.return_value = {"gameName": "Nom", "tagLine": "Tag"}
-    client.lol.summoner.by_puuid.return_value = {
-        "summonerLevel": 30,
-        "profileIconId": 1,
-    }
+    assert profile["rankedStats"]["soloq"] == {"tier": "DIAMOND", "rank": "II", "lp": 75, "wins": 60, "losses": 40, "winrate": 60.0}
+    assert profile["rankedStats"]["flex"]["tier"] == "PLATINUM"
+    assert profile["rankedStats"]["flex"]["winrate"] == 60.0
 
-    # Liste vide pour forcer extract à retourner None
-    client.lol.league.by_puuid.return_value = []
 
-    profile = client.make_profile("puuid-vide")
+def test_build_profile_zero_games():
+    """0 partie jouée : winrate à 0 sans division par zéro"""
+    ranked_entries = [{"queueType": "RANKED_SOLO_5x5", "tier": "IRON", "rank": "IV", "leaguePoints": 0, "wins": 0, "losses": 0}]
 
-    assert profile["rankedStats"]["soloq"] is None
-    assert profile["rankedStats"]["flex"] is None
+    profile = _build_profile(ACCOUNT, SUMMONER, ranked_entries)
 
+    assert profile["rankedStats"]["soloq"]["winrate"] == 0.0
 
-def test_make_profile_extract_with_stats(client):
-    """Test extract avec des stats ranked (couvre les calculs de winrate)"""
-    client.riot.account.by_puuid.return_value = {"gameName": "Player", "tagLine": "EUW"}
-    client.lol.summoner.by_puuid.return_value = {
-        "summonerLevel": 100,
-        "profileIconId": 5,
-    }
 
-    # Mock avec stats soloq et flex
-    client.lol.league.by_puuid.return_value = [
-        {
-            "queueType": "RANKED_SOLO_5x5",
-            "tier": "DIAMOND",
-            "rank": "II",
-            "leaguePoints": 75,
-            "wins": 60,
-            "losses": 40,
-        },
-        {
-            "queueType": "RANKED_FLEX_SR",
-            "tier": "PLATINUM",
-            "rank": "I",
-            "leaguePoints": 50,
-            "wins": 30,
-            "losses": 20,
-        },
-    ]
+# ============================================================================
+# CLIENT ASYNCHRONE
+# ============================================================================
 
-    profile = client.make_profile("puuid-with-stats")
 
-    # Vérifier soloq
-    assert profile["rankedStats"]["soloq"]["tier"] == "DIAMOND"
-    assert profile["rankedStats"]["soloq"]["rank"] == "II"
-    assert profile["rankedStats"]["soloq"]["lp"] == 75
-    assert profile["rankedStats"]["soloq"]["wins"] == 60
-    assert profile["rankedStats"]["soloq"]["losses"] == 40
-    assert profile["rankedStats"]["soloq"]["winrate"] == 60.0  # 60/(60+40) * 100
+@pytest.fixture
+def async_client():
+    c = AsyncRiotApiClient("FAKE_KEY")
+    c._request = AsyncMock()
+    return c
 
-    # Vérifier flex
-    assert profile["rankedStats"]["flex"]["tier"] == "PLATINUM"
-    assert profile["rankedStats"]["flex"]["winrate"] == 60.0  # 30/(30+20) * 100
+
+async def test_async_get_puuid(async_client):
+    async_client._request.return_value = {"puuid": "puuid_async"}
+
+    puuid = await async_client.get_puuid("Pseudo Espace", "EUW")
+
+    assert puuid == "puuid_async"
+    async_client._request.assert_awaited_once_with(
+        "europe", "account.by_riot_id", "/riot/account/v1/accounts/by-riot-id/Pseudo%20Espace/EUW", priority=Priority.INTERACTIVE
+    )
 
 
-def test_make_profile_extract_zero_games(client):
-    """Test extract avec 0 games (couvre le cas winrate = 0)"""
-    client.riot.account.by_puuid.return_value = {"gameName": "New", "tagLine": "EUW"}
-    client.lol.summoner.by_puuid.return_value = {
-        "summonerLevel": 30,
-        "profileIconId": 1,
+async def test_async_make_profile(async_client):
+    responses = {
+        "/riot/account/v1/accounts/by-puuid/p1": {"gameName": "Player", "tagLine": "EUW"},
+        "/lol/summoner/v4/summoners/by-puuid/p1": {"summonerLevel": 42, "profileIconId": 7},
+        "/lol/league/v4/entries/by-puuid/p1": [
+            {"queueType": "RANKED_FLEX_SR", "tier": "GOLD", "rank": "I", "leaguePoints": 10, "wins": 3, "losses": 1},
+        ],
     }
+    async_client._request.side_effect = lambda region, method, path, params=None, priority=None: responses[path]
 
-    # Ranked avec 0 wins et 0 losses
-    client.lol.league.by_puuid.return_value = [
-        {
-            "queueType": "RANKED_SOLO_5x5",
-            "tier": "IRON",
-            "rank": "IV",
-            "leaguePoints": 0,
-            "wins": 0,
-            "losses": 0,
-        }
-    ]
+    profile = await async_client.make_profile("p1")
 
-    profile = client.make_profile("puuid-zero-games")
+    assert profile["name"] == "Player"
+    assert profile["level"] == 42
+    assert profile["rankedStats"]["soloq"] is None
+    assert profile["rankedStats"]["flex"]["winrate"] == 75.0
 
-    assert profile["rankedStats"]["soloq"]["winrate"] == 0.0
 
+async def test_async_make_profile_runs_calls_concurrently(async_client):
+    """Les trois appels doivent être en vol en même temps."""
+    in_flight = 0
+    max_in_flight = 0
 
-def test_get_match_ids(client):
-    """Couvre RiotApiClient.get_match_ids (0% -> 100%)"""
-    client.lol.match.matchlist_by_puuid.return_value = [
-        "EUW1_123456",
-        "EUW1_123457",
-        "EUW1_123458",
-    ]
+    async def fake_request(region, method, path, params=None, priority=None):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if "account" in path:
+            return {"gameName": "Player", "tagLine": "EUW"}
+        if "summoner" in path:
+            return {"summonerLevel": 1, "profileIconId": 1}
+        return []
 
-    match_ids = client.get_match_ids("puuid-test", start=0, count=3)
+    async_client._request.side_effect = fake_request
 
-    assert len(match_ids) == 3
-    assert "EUW1_123456" in match_ids
-    client.lol.match.matchlist_by_puuid.assert_called_once_with("euw1", "puuid-test", start=0, count=3, queue=None)
+    await async_client.make_profile("p1")
 
+    assert max_in_flight == 3
 
-def test_get_match_ids_with_queue(client):
-    """Test get_match_ids avec filtre de queue"""
-    client.lol.match.matchlist_by_puuid.return_value = ["EUW1_ranked"]
 
-    match_ids = client.get_match_ids("puuid-test", count=5, queue=420)
+async def test_async_make_profile_skips_account_with_riot_id(async_client):
+    async_client._request.side_effect = lambda region, method, path, params=None, priority=None: (
+        {"summonerLevel": 3, "profileIconId": 2} if "summoner" in path else []
+    )
 
-    # Vérifier le résultat
-    assert match_ids == ["EUW1_ranked"]
+    profile = await async_client.make_profile("p1", riot_id=("Cached", "TAG"))
 
-    # Vérifier l'appel
-    client.lol.match.matchlist_by_puuid.assert_called_once_with("euw1", "puuid-test", start=0, count=5, queue=420)
+    assert profile["name"] == "Cached"
+    assert profile["tag"] == "TAG"
+    assert async_client._request.await_count == 2
+    assert all("account" not in c.args[2] for c in async_client._request.await_args_list)
 
 
-def test_get_match_info(client):
-    """Couvre RiotApiClient.get_match_info (0% -> 100%)"""
-    mock_match_data = {"info": {"gameDuration": 1800, "participants": []}}
-    client.lol.match.by_id.return_value = mock_match_data
+async def test_async_get_match_ids_uses_regional_routing(async_client):
+    async_client._request.return_value = ["EUW1_1"]
 
-    match_info = client.get_match_info("EUW1_123456")
+    match_ids = await async_client.get_match_ids("p1", count=5, queue=420)
 
-    assert match_info == mock_match_data
-    client.lol.match.by_id.assert_called_once_with("euw1", "EUW1_123456")
+    assert match_ids == ["EUW1_1"]
+    async_client._request.assert_awaited_once_with(
+        "europe",
+        "match.matchlist_by_puuid",
+        "/lol/match/v5/matches/by-puuid/p1/ids",
+        {"start": 0, "count": 5, "queue": 420, "startTime": None},
+        priority=Priority.INTERACTIVE,
+    )
 
 
-def test_get_player_match_stats_full_calculation(client):
-    """Couvre RiotApiClient.get_player_match_stats (88% -> 100%)"""
-    mock_match = {
-        "info": {
-            "gameDuration": 1200,  # 20 minutes
-            "participants": [
-                {
-                    "puuid": "target-puuid",
-                    "championName": "Aatrox",
-                    "kills": 10,
-                    "deaths": 2,
-                    "assists": 5,
-                    "totalMinionsKilled": 150,
-                    "neutralMinionsKilled": 10,
-                    "goldEarned": 10000,
-                    "totalDamageDealtToChampions": 25000,
-                    "win": True,
-                    "summoner1Id": 4,
-                    "summoner2Id": 12,
-                    **{f"item{i}": i for i in range(7)},
-                }
-            ],
-        }
-    }
-    client.get_match_info = MagicMock(return_value=mock_match)
-
-    stats = client.get_player_match_stats("MATCH_ID", "target-puuid")
-
-    # Vérifier tous les calculs
-    assert stats["champion"] == "Aatrox"
-    assert stats["kills"] == 10
-    assert stats["deaths"] == 2
-    assert stats["assists"] == 5
-    assert stats["kda"] == 7.5  # (10 + 5) / 2
-    assert stats["cs"] == 160  # 150 + 10
-    assert stats["cs_per_min"] == 8.0  # 160 / 20
-    assert stats["gold"] == 10000
-    assert stats["gold_per_min"] == 500.0  # 10000 / 20
-    assert stats["damageDealt"] == 25000
-    assert stats["damage_per_min"] == 1250.0  # 25000 / 20
-    assert stats["win"] is True
-    assert stats["duration_min"] == 20.0
-    assert stats["summonerSpells"] == [4, 12]
-    assert len(stats["items"]) == 7
-
-
-def test_get_player_match_stats_player_not_found(client):
-    """Test quand le joueur n'est pas dans le match (ligne manquante)"""
-    mock_match = {
-        "info": {
-            "gameDuration": 1200,
-            "participants": [
-                {
-                    "puuid": "other-player",
-                    "championName": "Yasuo",
-                    "kills": 5,
-                    "deaths": 10,
-                    "assists": 3,
-                    "totalMinionsKilled": 100,
-                    "goldEarned": 5000,
-                    "totalDamageDealtToChampions": 10000,
-                    "win": False,
-                    "summoner1Id": 4,
-                    "summoner2Id": 7,
-                    **{f"item{i}": 0 for i in range(7)},
-                }
-            ],
-        }
-    }
-    client.get_match_info = MagicMock(return_value=mock_match)
-
-    # Le puuid demandé n'est pas dans les participants
-    stats = client.get_player_match_stats("MATCH_ID", "wrong-puuid")
-
-    # Doit retourner None (couvre le return None ligne 77)
-    assert stats is None
-
-
-def test_get_matches_summary(client):
-    """Couvre RiotApiClient.get_matches_summary (0% -> 100%)"""
-    # Mock les IDs de matchs
-    client.get_match_ids = MagicMock(return_value=["MATCH_1", "MATCH_2", "MATCH_3"])
-
-    # Mock les stats pour chaque match
-    client.get_player_match_stats = MagicMock(
-        side_effect=[
-            {
-                "champion": "Zed",
-                "kills": 10,
-                "deaths": 2,
-                "assists": 5,
-                "kda": 7.5,
-                "win": True,
-            },
-            {
-                "champion": "Yasuo",
-                "kills": 5,
-                "deaths": 8,
-                "assists": 3,
-                "kda": 1.0,
-                "win": False,
-            },
-            None,  # Un match où le joueur n'est pas trouvé
-        ]
+async def test_async_make_profile_forwards_priority(async_client):
+    async_client._request.side_effect = lambda region, method, path, params=None, priority=None: (
+        {"summonerLevel": 1, "profileIconId": 1} if "summoner" in path else []
     )
 
-    summaries = client.get_matches_summary("puuid-test", count=3)
+    await async_client.make_profile("p1", riot_id=("Cached", "TAG"), priority=Priority.REFRESH)
+
+    assert all(c.kwargs["priority"] == Priority.REFRESH for c in async_client._request.await_args_list)
+
+
+async def test_async_get_match_record_uses_cache(async_client, tmp_path):
+    async_client.match_cache = MatchCache(str(tmp_path))
+    async_client._request.return_value = {"metadata": {"matchId": "EUW1_1"}, "info": {"gameDuration": 1800, "participants": []}}
+
+    first = await async_client.get_match_record("EUW1_1")
+    second = await async_client.get_match_record("EUW1_1")
+
+    assert first == second
+    assert first.match_id == "EUW1_1"
+    async_client._request.assert_awaited_once()
+
+
+async def test_async_get_match_info_stores_projection(async_client, tmp_path):
+    async_client.match_cache = MatchCache(str(tmp_path))
+    raw = {"metadata": {"matchId": "EUW1_2"}, "info": {"gameDuration": 1800, "participants": []}}
+    async_client._request.return_value = raw
+
+    assert await async_client.get_match_info("EUW1_2") == raw
+    assert "EUW1_2" in async_client.match_cache
+
+
+async def test_async_get_matches_summary(async_client):
+    async_client.get_match_ids = AsyncMock(return_value=["M1", "M2"])
+    async_client.get_player_match_stats = AsyncMock(side_effect=[{"champion": "Ahri"}, None])
+
+    summaries = await async_client.get_matches_summary("p1", count=2)
+
+    assert summaries == [{"champion": "Ahri"}]
+
+
+def fake_response(status=200, headers=None, payload=None):
+    response = MagicMock()
+    response.status = status
+    response.headers = headers or {}
+    response.raise_for_status = MagicMock()
+    response.json = AsyncMock(return_value=payload)
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=response)
+    context.__aexit__ = AsyncMock(return_value=False)
+    return context
+
+
+async def test_async_get_matches_summary_bounded_and_ordered(async_client):
+    """Les matchs sont récupérés en parallèle (borné) mais restitués dans l'ordre."""
+    async_client.get_match_ids = AsyncMock(return_value=[f"M{i}" for i in range(6)])
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_stats(match_id, puuid, priority=None):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # Les premiers matchs arrivent en dernier
+        await asyncio.sleep(0.01 * (6 - int(match_id[1:])))
+        in_flight -= 1
+        return {"match": match_id}
+
+    async_client.get_player_match_stats = fake_stats
+
+    summaries = await async_client.get_matches_summary("p1", count=6, concurrency=3)
+
+    assert [s["match"] for s in summaries] == [f"M{i}" for i in range(6)]
+    assert max_in_flight == 3
+
+
+async def test_async_iter_matches_summary_streams_first_results(async_client):
+    async_client.get_match_ids = AsyncMock(return_value=["FAST", "SLOW"])
+    slow_done = asyncio.Event()
+
+    async def fake_stats(match_id, puuid, priority=None):
+        if match_id == "SLOW":
+            await slow_done.wait()
+        return {"match": match_id}
+
+    async_client.get_player_match_stats = fake_stats
+
+    stream = async_client.iter_matches_summary("p1", count=2)
+    first = await anext(stream)
+
+    assert first == {"match": "FAST"}
+    assert not slow_done.is_set()
+    slow_done.set()
+    assert [s async for s in stream] == [{"match": "SLOW"}]
+
+
+async def test_async_request_drops_empty_params():
+    c = AsyncRiotApiClient("FAKE_KEY")
+
+    session = MagicMock()
+    session.get.return_value = fake_response(payload={"ok": True})
+    c._get_session = AsyncMock(return_value=session)
+
+    data = await c._request("euw1", "test.method", "/path", {"start": 0, "queue": None})
+
+    assert data == {"ok": True}
+    session.get.assert_called_once_with("https://euw1.api.riotgames.com/path", params={"start": 0})
+
+
+async def test_async_request_retries_after_429():
+    """Un 429 est rejoué après Retry-After au lieu d'échouer."""
+    c = AsyncRiotApiClient("FAKE_KEY")
+    c.rate_limiter = MagicMock()
+    c.rate_limiter.acquire = AsyncMock()
+
+    session = MagicMock()
+    session.get.side_effect = [
+        fake_response(status=429, headers={"Retry-After": "2", "X-Rate-Limit-Type": "application"}),
+        fake_response(payload={"ok": True}),
+    ]
+    c._get_session = AsyncMock(return_value=session)
 
-    # Vérifie qu'on a bien 2 résultats (le None est exclu)
-    assert len(summaries) == 2
-    assert summaries[0]["champion"] == "Zed"
-    assert summaries[0]["win"] is True
-    assert summaries[1]["champion"] == "Yasuo"
-    assert summaries[1]["win"] is False
+    data = await c._request("euw1", "summoner.by_puuid", "/path")
 
-    # Vérifie les appels
-    client.get_match_ids.assert_called_once_with("puuid-test", count=3, queue=None)
-    assert client.get_player_match_stats.call_count == 3
+    assert data == {"ok": True}
+    assert c.rate_limiter.acquire.await_count == 2
+    c.rate_limiter.acquire.assert_awaited_with("euw1", "summoner.by_puuid", Priority.INTERACTIVE)
+    c.rate_limiter.block.assert_called_once_with("euw1", "summoner.by_puuid", 2.0, "application")
 
 
-def test_get_matches_summary_with_queue_filter(client):
-    """Test get_matches_summary avec filtre de queue"""
-    client.get_match_ids = MagicMock(return_value=["RANKED_1"])
-    client.get_player_match_stats = MagicMock(return_value={"champion": "Jinx", "win": True})
+async def test_async_session_is_reused_and_closed():
+    c = AsyncRiotApiClient("FAKE_KEY")
 
-    summaries = client.get_matches_summary("puuid-test", count=5, queue=420)
+    session = await c._get_session()
+    assert await c._get_session() is session
+    assert session.headers["X-Riot-Token"] == "FAKE_KEY"
 
-    # Vérifie que le filtre queue est bien passé
-    client.get_match_ids.assert_called_once_with("puuid-test", count=5, queue=420)
-    assert len(summaries) == 1
+    await c.close()
+    assert session.closed
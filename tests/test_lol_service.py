@@ -1,15 +1,21 @@
-from unittest.mock import MagicMock
+import time
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
-from riotwatcher import ApiError
+from aiohttp import ClientResponseError
 
 from src.lol.exceptions import InvalidApiKey, PlayerNotFound, RateLimited
+from src.lol.rate_limiter import Priority
 from src.lol.service import LeagueService
 
 
+def api_error(status: int) -> ClientResponseError:
+    return ClientResponseError(MagicMock(), (), status=status)
+
+
 @pytest.fixture
 def client_mock():
-    return MagicMock()
+    return AsyncMock()
 
 
 @pytest.fixture
@@ -20,66 +26,145 @@ def service(client_mock):
 # --- Tests de succès ---
 
 
-def test_get_match_history_calls_client(service, client_mock):
-    client_mock.get_puuid.return_value = "PUUID_123"
+async def test_get_match_history_calls_client(service, client_mock):
+    client_mock.get_account.return_value = {"puuid": "PUUID_123", "gameName": "Pseudo", "tagLine": "TAG"}
     client_mock.get_match_ids.return_value = ["M1", "M2"]
 
-    history = service.get_match_history("Pseudo", "TAG", count=2)
+    history = await service.get_match_history("Pseudo", "TAG", count=2)
 
     assert history == ["M1", "M2"]
-    client_mock.get_puuid.assert_called_once_with("Pseudo", "TAG")
-
+    client_mock.get_account.assert_called_once_with("Pseudo", "TAG", priority=Priority.INTERACTIVE)
 
-# --- Tests d'erreurs (Fix des échecs MagicMock) ---
 
+# --- Tests d'erreurs ---
 
-def test_get_match_history_error(service, client_mock):
-    """Couvre les lignes 39-40 : ApiError dans l'historique"""
-    client_mock.get_puuid.return_value = "PUUID_123"
 
-    # Utilisation d'un objet response mocké avec status_code
-    mock_res = MagicMock(status_code=403)
-    client_mock.get_match_ids.side_effect = ApiError(response=mock_res)
+async def test_get_match_history_error(service, client_mock):
+    """ApiError dans l'historique"""
+    client_mock.get_account.return_value = {"puuid": "PUUID_123", "gameName": "Pseudo", "tagLine": "TAG"}
+    client_mock.get_match_ids.side_effect = api_error(403)
 
     with pytest.raises(InvalidApiKey):
-        service.get_match_history("Pseudo", "TAG")
+        await service.get_match_history("Pseudo", "TAG")
 
 
-def test_get_match_details_success(service, client_mock):
-    """Couvre les lignes 43-44 : Succès de get_match_details"""
+async def test_get_match_details_success(service, client_mock):
+    """Succès de get_match_details"""
     client_mock.get_match_info.return_value = {"info": "ok"}
-    res = service.get_match_details("MATCH_ID")
+    res = await service.get_match_details("MATCH_ID")
     assert res == {"info": "ok"}
 
 
-def test_get_match_details_error(service, client_mock):
-    """Couvre les lignes 46-47 : Erreur dans get_match_details"""
-    mock_res = MagicMock(status_code=404)
-    client_mock.get_match_info.side_effect = ApiError(response=mock_res)
+async def test_get_match_details_error(service, client_mock):
+    """Erreur dans get_match_details"""
+    client_mock.get_match_info.side_effect = api_error(404)
 
     with pytest.raises(PlayerNotFound):
-        service.get_match_details("BAD_ID")
+        await service.get_match_details("BAD_ID")
 
 
 @pytest.mark.parametrize(
     "status_code, expected_exception",
     [(403, InvalidApiKey), (404, PlayerNotFound), (429, RateLimited)],
 )
-def test_handle_api_errors(service, client_mock, status_code, expected_exception):
-    """Vérifie le mapping de _handle_api_error (lignes 53-58)"""
-    mock_response = MagicMock(status_code=status_code)
-    client_mock.make_profile.side_effect = ApiError(response=mock_response)
+async def test_handle_api_errors(service, client_mock, status_code, expected_exception):
+    """Vérifie le mapping de _handle_api_error"""
+    client_mock.make_profile.side_effect = api_error(status_code)
 
     with pytest.raises(expected_exception):
-        service.make_profile("any-puuid")
+        await service.make_profile("any-puuid")
+
+
+async def test_unknown_error_propagation(service, client_mock):
+    """Propagation d'erreur inconnue"""
+    err = api_error(500)
+    client_mock.get_account.side_effect = err
+
+    with pytest.raises(ClientResponseError) as exc_info:
+        await service.get_puuid("Pseudo", "TAG")
+    assert exc_info.value == err
+
+
+async def test_close_closes_client(service, client_mock):
+    await service.close()
+    client_mock.close.assert_awaited_once()
+
+
+def test_rate_limit_status(service, client_mock):
+    client_mock.rate_limiter = MagicMock()
+    client_mock.rate_limiter.snapshot.return_value = {"euw1": {}}
+
+    assert service.rate_limit_status() == {"euw1": {}}
+
+
+# --- Cache Riot ID -> compte ---
+
+
+async def test_get_puuid_is_cached_case_insensitively(service, client_mock):
+    client_mock.get_account.return_value = {"puuid": "PUUID_123", "gameName": "Pseudo", "tagLine": "TAG"}
+
+    assert await service.get_puuid("Pseudo", "TAG") == "PUUID_123"
+    assert await service.get_puuid("pseudo", "tag") == "PUUID_123"
+    await service.get_match_history("PSEUDO", "Tag")
+
+    client_mock.get_account.assert_awaited_once()
+
+
+async def test_get_puuid_cache_expires(service, client_mock, monkeypatch):
+    client_mock.get_account.return_value = {"puuid": "PUUID_123", "gameName": "Pseudo", "tagLine": "TAG"}
+    await service.get_puuid("Pseudo", "TAG")
+
+    now = time.monotonic()
+    monkeypatch.setattr("src.lol.service.time.monotonic", lambda: now + service.PUUID_TTL + 1)
+    await service.get_puuid("Pseudo", "TAG")
+
+    assert client_mock.get_account.await_count == 2
+
+
+async def test_get_puuid_negative_cache(service, client_mock, monkeypatch):
+    client_mock.get_account.side_effect = api_error(404)
+
+    for _ in range(3):
+        with pytest.raises(PlayerNotFound):
+            await service.get_puuid("Typo", "EUW")
+
+    client_mock.get_account.assert_awaited_once()
+
+    # Après expiration, l'API est de nouveau interrogée
+    now = time.monotonic()
+    monkeypatch.setattr("src.lol.service.time.monotonic", lambda: now + service.NOT_FOUND_TTL + 1)
+    client_mock.get_account.side_effect = None
+    client_mock.get_account.return_value = {"puuid": "PUUID_NEW", "gameName": "Pseudo", "tagLine": "TAG"}
+
+    assert await service.get_puuid("Typo", "EUW") == "PUUID_NEW"
+
+
+async def test_get_account_returns_canonical_riot_id(service, client_mock):
+    client_mock.get_account.return_value = {"puuid": "PUUID_123", "gameName": "Faker", "tagLine": "KR1"}
+
+    account = await service.get_account("faker", "kr1")
+
+    assert (account["gameName"], account["tagLine"]) == ("Faker", "KR1")
+    assert await service.get_puuid("FAKER", "KR1") == "PUUID_123"
+    client_mock.get_account.assert_awaited_once()
+
+
+async def test_get_puuid_other_errors_not_cached(service, client_mock):
+    client_mock.get_account.side_effect = api_error(429)
+
+    for _ in range(2):
+        with pytest.raises(RateLimited):
+            await service.get_puuid("Pseudo", "TAG")
+
+    assert client_mock.get_account.await_count == 2
+
 
+def test_riot_id_cache_is_pruned(service):
+    service.MAX_CACHED_IDS = 2
+    service._not_found = {"a#1": 0.0, "b#2": 0.0}
+    service._puuid_cache = {"c#3": ("P", 10.0)}
 
-def test_unknown_error_propagation(service, client_mock):
-    """Couvre la ligne 60 : Propagation d'erreur inconnue"""
-    mock_response = MagicMock(status_code=500)
-    api_error = ApiError(response=mock_response)
-    client_mock.get_puuid.side_effect = api_error
+    service._prune_riot_id_cache(now=5.0)
 
-    with pytest.raises(ApiError) as exc_info:
-        service.get_puuid("Pseudo", "TAG")
-    assert exc_info.value == api_error
+    assert service._not_found == {}
+    assert service._puuid_cache == {"c#3": ("P", 10.0)}
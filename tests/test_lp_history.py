@@ -0,0 +1,116 @@
+import random
+
+import pytest
+
+from src.lol.lp_history import DAY, LpHistory, LpWindow
+
+
+@pytest.fixture
+def history(tmp_path):
+    return LpHistory(str(tmp_path / "lp_samples.jsonl"))
+
+
+def test_only_changes_are_appended(history):
+    assert history.record("p1", "soloq", 1200, timestamp=100)
+    assert not history.record("p1", "soloq", 1200, timestamp=200)
+    assert history.record("p1", "soloq", 1220, timestamp=300)
+
+    with open(history.path) as f:
+        assert f.read().splitlines() == ['[100,"p1","soloq",1200]', '[300,"p1","soloq",1220]']
+
+
+def test_record_many_writes_one_batch(history):
+    recorded = history.record_many([("p1", "soloq", 1200), ("p1", "flex", 800), ("p2", "soloq", 400)], timestamp=100)
+
+    assert recorded == 3
+    assert history.samples("p1", "flex") == [(100, 800)]
+    assert history.players() == {"p1", "p2"}
+
+
+def test_history_is_reloaded_from_disk(history):
+    history.record("p1", "soloq", 1200, timestamp=100)
+    history.record("p1", "soloq", 1250, timestamp=200)
+
+    reloaded = LpHistory(history.path)
+
+    assert reloaded.samples("p1", "soloq") == [(100, 1200), (200, 1250)]
+    assert len(reloaded) == 2
+
+
+def test_truncated_line_is_ignored(history):
+    history.record("p1", "soloq", 1200, timestamp=100)
+    with open(history.path, "a") as f:
+        f.write('[200,"p1","so')
+
+    assert LpHistory(history.path).samples("p1", "soloq") == [(100, 1200)]
+
+
+def test_value_at_and_delta(history):
+    history.record("p1", "soloq", 1200, timestamp=100)
+    history.record("p1", "soloq", 1250, timestamp=200)
+    history.record("p1", "soloq", 1230, timestamp=300)
+
+    assert history.value_at("p1", "soloq", 50) is None
+    assert history.value_at("p1", "soloq", 250) == 1250
+    assert history.delta("p1", "soloq", since=150, until=400) == 30
+    assert history.delta("p1", "soloq", since=150, until=250) == 50
+    assert history.delta("p1", "soloq", since=250, until=400) == -20
+    # Joueur suivi en cours de fenêtre : la première mesure sert de référence
+    assert history.delta("p1", "soloq", since=0, until=400) == 30
+    assert history.delta("p2", "soloq", since=0, until=400) is None
+
+
+def test_window_peak_and_low(history):
+    history.record("p1", "soloq", 1200, timestamp=100)
+    history.record("p1", "soloq", 1300, timestamp=200)
+    history.record("p1", "soloq", 1150, timestamp=300)
+    history.record("p1", "soloq", 1220, timestamp=400)
+
+    window = history.window("p1", "soloq", since=150, until=500)
+
+    assert window == LpWindow(start=1200, end=1220, peak=1300, low=1150)
+    assert window.delta == 20
+
+
+def test_long_window_uses_daily_buckets(history):
+    random.seed(1)
+    lp = 1500
+    for hour in range(0, 60 * 24, 5):
+        lp += random.randint(-25, 25)
+        history.record("p1", "soloq", lp, timestamp=hour * 3600)
+
+    since, until = 3 * DAY + 5000, 50 * DAY + 7000
+    window = history.window("p1", "soloq", since, until)
+
+    # Même résultat qu'un parcours complet des mesures
+    values = [history.value_at("p1", "soloq", since)] + [lp for _, lp in history.samples("p1", "soloq", since, until)]
+    assert window == LpWindow(start=values[0], end=values[-1], peak=max(values), low=min(values))
+
+
+def test_windows_for_a_whole_guild(history):
+    history.record_many([("p1", "soloq", 1200), ("p2", "soloq", 800)], timestamp=100)
+    history.record_many([("p1", "soloq", 1250), ("p2", "soloq", 780)], timestamp=200)
+
+    windows = history.windows(["p1", "p2", "p3"], "soloq", since=150, until=300)
+
+    assert {puuid: window.delta for puuid, window in windows.items()} == {"p1": 50, "p2": -20}
+
+
+def test_compact_keeps_daily_extremes_for_old_history(tmp_path):
+    history = LpHistory(str(tmp_path / "lp_samples.jsonl"), full_resolution_days=1)
+    now = 10 * DAY
+    for offset, lp in [(10, 1000), (20, 1050), (30, 1030), (40, 1020)]:
+        history.record("p1", "soloq", lp, timestamp=2 * DAY + offset)
+    history.record("p1", "soloq", 1040, timestamp=3 * DAY + 10)
+    history.record("p1", "soloq", 1060, timestamp=now - 20)
+    history.record("p1", "soloq", 1080, timestamp=now - 10)
+    before = history.window("p1", "soloq", since=0, until=now)
+
+    history.compact(now=now)
+
+    # Jour 2 : plus bas (1000), plus haut (1050) et dernière valeur (1020) ; 1030 disparaît
+    expected = [(2 * DAY + 10, 1000), (2 * DAY + 20, 1050), (2 * DAY + 40, 1020), (3 * DAY + 10, 1040), (now - 20, 1060), (now - 10, 1080)]
+    assert history.samples("p1", "soloq") == expected
+    reloaded = LpHistory(history.path)
+    assert reloaded.samples("p1", "soloq") == expected
+    assert reloaded.window("p1", "soloq", since=0, until=now) == before
@@ -1,5 +1,7 @@
 # tests/test_main.py (ajoutez ces tests)
+import asyncio
 import os
+import signal
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
 
@@ -358,3 +360,24 @@ class TestMainFunction:
                     mock_logger.critical.assert_called_once()
                     # On ajuste ici pour correspondre au message de src/main.py
                     assert "DISCORD_TOKEN non défini" in str(mock_logger.critical.call_args)
+
+    @pytest.mark.asyncio
+    async def test_main_sigterm_closes_bot_and_flushes(self):
+        """SIGTERM (docker stop) ferme le bot puis écrit les données en attente"""
+        closed = asyncio.Event()
+
+        async def start(self, token):
+            os.kill(os.getpid(), signal.SIGTERM)
+            await closed.wait()
+
+        async def close(self):
+            closed.set()
+
+        with patch.dict(os.environ, {"DISCORD_TOKEN": "test_token"}):
+            with patch("src.main.setup_logger"), patch("src.main.logger"):
+                with patch.object(DiscordBot, "start", start), patch.object(DiscordBot, "close", close):
+                    with patch("src.main.default_store") as mock_store:
+                        await asyncio.wait_for(main(), timeout=2)
+
+        assert closed.is_set()
+        mock_store.flush.assert_called_once()
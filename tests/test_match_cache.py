@@ -0,0 +1,93 @@
+import gzip
+import json
+import os
+
+from src.lol.match_cache import MatchCache
+from src.lol.match_record import MatchRecord, ParticipantRecord
+
+
+def make_record(match_id: str, players: int = 1) -> MatchRecord:
+    participants = tuple(
+        ParticipantRecord(os.urandom(39).hex(), "Ahri", 5, 2, 7, 180, 11000, 21000, True, (4, 14), (1, 2, 3, 4, 5, 6, 7)) for _ in range(players)
+    )
+    return MatchRecord(match_id, 1700000000000, 1800, 420, participants)
+
+
+def test_put_and_get(tmp_path):
+    cache = MatchCache(str(tmp_path))
+    record = make_record("EUW1_1")
+
+    cache.put(record)
+
+    assert "EUW1_1" in cache
+    assert cache.get("EUW1_1") == record
+    assert cache.get("EUW1_404") is None
+    assert (tmp_path / "EUW1_1.json.gz").exists()
+
+
+def test_index_survives_restart(tmp_path):
+    MatchCache(str(tmp_path)).put(make_record("EUW1_1"))
+
+    reopened = MatchCache(str(tmp_path))
+
+    assert len(reopened) == 1
+    assert reopened.get("EUW1_1").match_id == "EUW1_1"
+    assert reopened.total_bytes == os.path.getsize(tmp_path / "EUW1_1.json.gz")
+
+
+def test_lru_eviction(tmp_path):
+    cache = MatchCache(str(tmp_path), max_bytes=1_500)
+
+    cache.put(make_record("EUW1_1", players=10))
+    cache.put(make_record("EUW1_2", players=10))
+    cache.get("EUW1_1")  # EUW1_1 redevient le plus récent
+    cache.put(make_record("EUW1_3", players=10))
+
+    assert "EUW1_2" not in cache
+    assert "EUW1_1" in cache
+    assert "EUW1_3" in cache
+    assert cache.total_bytes <= 1_500
+    assert not (tmp_path / "EUW1_2.json.gz").exists()
+
+
+def test_corrupted_entry_is_dropped(tmp_path):
+    cache = MatchCache(str(tmp_path))
+    cache.put(make_record("EUW1_1"))
+    (tmp_path / "EUW1_1.json.gz").write_bytes(b"not gzip")
+
+    assert cache.get("EUW1_1") is None
+    assert "EUW1_1" not in cache
+
+
+def test_legacy_raw_entry_is_compacted(tmp_path):
+    """Les entrées contenant le JSON Riot complet sont converties à la lecture."""
+    raw = {
+        "metadata": {"matchId": "EUW1_1"},
+        "info": {
+            "gameDuration": 1200,
+            "participants": [
+                {
+                    "puuid": "p1",
+                    "championName": "Jinx",
+                    "kills": 1,
+                    "deaths": 1,
+                    "assists": 1,
+                    "totalMinionsKilled": 100,
+                    "goldEarned": 5000,
+                    "totalDamageDealtToChampions": 9000,
+                    "win": False,
+                    "summoner1Id": 4,
+                    "summoner2Id": 7,
+                    **{f"item{i}": 0 for i in range(7)},
+                }
+            ],
+        },
+    }
+    with gzip.open(tmp_path / "EUW1_1.json.gz", "wt", encoding="utf-8") as f:
+        json.dump(raw, f)
+
+    record = MatchCache(str(tmp_path)).get("EUW1_1")
+
+    assert record.participant("p1").champion == "Jinx"
+    with gzip.open(tmp_path / "EUW1_1.json.gz", "rt", encoding="utf-8") as f:
+        assert isinstance(json.load(f), list)
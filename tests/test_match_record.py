@@ -0,0 +1,69 @@
+import json
+
+from src.lol.match_record import MatchRecord
+
+
+def make_participant(puuid: str, **overrides) -> dict:
+    participant = {
+        "puuid": puuid,
+        "championName": "Aatrox",
+        "kills": 10,
+        "deaths": 2,
+        "assists": 5,
+        "totalMinionsKilled": 150,
+        "neutralMinionsKilled": 10,
+        "goldEarned": 10000,
+        "totalDamageDealtToChampions": 25000,
+        "win": True,
+        "summoner1Id": 4,
+        "summoner2Id": 12,
+        **{f"item{i}": i for i in range(7)},
+        # Champs ignorés par la projection
+        "challenges": {"kda": 7.5, "damagePerMinute": 1250.0},
+        "perks": {"styles": []},
+    }
+    participant.update(overrides)
+    return participant
+
+
+MATCH = {
+    "metadata": {"matchId": "EUW1_42", "participants": ["target", "other"]},
+    "info": {
+        "gameCreation": 1700000000000,
+        "gameDuration": 1200,
+        "queueId": 420,
+        "participants": [make_participant("target"), make_participant("other", championName="Zed", win=False)],
+        "teams": [],
+    },
+}
+
+
+def test_from_api_keeps_only_used_fields():
+    record = MatchRecord.from_api(MATCH)
+
+    assert record.match_id == "EUW1_42"
+    assert record.queue_id == 420
+    assert len(record.participants) == 2
+    target = record.participant("target")
+    assert target.cs == 160
+    assert target.items == (0, 1, 2, 3, 4, 5, 6)
+    assert not hasattr(target, "__dict__")  # slots
+
+
+def test_row_roundtrip_through_json():
+    record = MatchRecord.from_api(MATCH)
+
+    row = json.loads(json.dumps(record.to_row()))
+
+    assert MatchRecord.from_row(row) == record
+    assert len(json.dumps(row)) < len(json.dumps(MATCH))
+
+
+def test_player_stats():
+    stats = MatchRecord.from_api(MATCH).player_stats("target")
+
+    assert stats["kda"] == 7.5
+    assert stats["cs_per_min"] == 8.0
+    assert stats["damage_per_min"] == 1250.0
+    assert stats["summonerSpells"] == [4, 12]
+    assert MatchRecord.from_api(MATCH).player_stats("nobody") is None
@@ -0,0 +1,105 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import yaml
+from aiohttp import ClientResponseError
+
+from src.lol.match_record import MatchRecord
+from src.lol.match_sync import MatchHistorySync
+from src.lol.rate_limiter import Priority
+
+
+def record(match_id: str, creation_s: int) -> MatchRecord:
+    return MatchRecord(match_id, creation_s * 1000, 1800, 420, ())
+
+
+@pytest.fixture
+def client():
+    c = MagicMock()
+    c.match_concurrency = 2
+    c.get_match_ids = AsyncMock()
+    c.get_match_record = AsyncMock(side_effect=lambda match_id, priority=None: record(match_id, int(match_id.split("_")[1])))
+    return c
+
+
+@pytest.fixture
+def sync(client, tmp_path):
+    return MatchHistorySync(client, cursor_path=str(tmp_path / "cursors.yml"), initial_count=3)
+
+
+async def test_first_sync_fetches_recent_matches(sync, client):
+    client.get_match_ids.return_value = ["EUW1_300", "EUW1_200", "EUW1_100"]
+
+    records = await sync.sync("p1")
+
+    assert [r.match_id for r in records] == ["EUW1_300", "EUW1_200", "EUW1_100"]
+    client.get_match_ids.assert_awaited_once_with("p1", count=3, priority=Priority.BACKFILL)
+    assert sync.cursor("p1") == {"last_match_id": "EUW1_300", "start_time": 300}
+
+
+async def test_next_sync_only_asks_for_newer_matches(sync, client):
+    client.get_match_ids.return_value = ["EUW1_300"]
+    await sync.sync("p1")
+
+    # Riot renvoie les matchs commencés depuis startTime, dont le dernier déjà vu
+    client.get_match_ids.reset_mock()
+    client.get_match_record.reset_mock()
+    client.get_match_ids.return_value = ["EUW1_400", "EUW1_300"]
+
+    records = await sync.sync("p1")
+
+    assert [r.match_id for r in records] == ["EUW1_400"]
+    client.get_match_ids.assert_awaited_once_with("p1", start=0, count=100, start_time=300, priority=Priority.BACKFILL)
+    client.get_match_record.assert_awaited_once_with("EUW1_400", priority=Priority.BACKFILL)
+    assert sync.cursor("p1")["last_match_id"] == "EUW1_400"
+
+
+async def test_sync_without_new_matches_is_one_call(sync, client):
+    client.get_match_ids.return_value = ["EUW1_300"]
+    await sync.sync("p1")
+    client.get_match_ids.reset_mock()
+    client.get_match_record.reset_mock()
+
+    assert await sync.sync("p1") == []
+    assert client.get_match_ids.await_count == 1
+    client.get_match_record.assert_not_awaited()
+
+
+async def test_sync_many_saves_cursors_once_and_skips_errors(sync, client, tmp_path):
+    async def match_ids(puuid, **kwargs):
+        if puuid == "broken":
+            raise ClientResponseError(MagicMock(), (), status=500)
+        return ["EUW1_500"]
+
+    client.get_match_ids.side_effect = match_ids
+
+    results = await sync.sync_many(["p1", "broken"])
+
+    assert list(results) == ["p1"]
+    with open(tmp_path / "cursors.yml") as f:
+        assert yaml.safe_load(f) == {"p1": {"last_match_id": "EUW1_500", "start_time": 500}}
+
+    # Les curseurs sont rechargés au redémarrage
+    reloaded = MatchHistorySync(client, cursor_path=str(tmp_path / "cursors.yml"))
+    assert reloaded.cursor("p1")["start_time"] == 500
+
+
+async def test_sync_bounds_concurrent_match_fetches(sync, client):
+    client.get_match_ids.return_value = [f"EUW1_{i}" for i in range(10, 0, -1)]
+    in_flight = peak = 0
+
+    async def get_match_record(match_id, priority=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return record(match_id, int(match_id.split("_")[1]))
+
+    client.get_match_record.side_effect = get_match_record
+
+    records = await sync.sync("p1")
+
+    assert [r.match_id for r in records] == client.get_match_ids.return_value
+    assert peak == client.match_concurrency
@@ -0,0 +1,166 @@
+import asyncio
+import time
+
+import pytest
+
+from src.lol.rate_limiter import Priority, RateLimiter, parse_limits
+
+
+def test_parse_limits():
+    assert parse_limits("20:1,100:120") == [(20, 1.0), (100, 120.0)]
+    assert parse_limits(None) == []
+    assert parse_limits("") == []
+
+
+async def test_acquire_within_limits_is_immediate():
+    limiter = RateLimiter("5:10")
+
+    start = time.monotonic()
+    for _ in range(5):
+        await limiter.acquire("euw1", "summoner.by_puuid")
+
+    assert time.monotonic() - start < 0.05
+    assert limiter.snapshot()["euw1"]["app"][0]["used"] == 5
+
+
+async def test_acquire_waits_for_window_reset():
+    limiter = RateLimiter("2:0.1")
+
+    start = time.monotonic()
+    for _ in range(3):
+        await limiter.acquire("euw1", "summoner.by_puuid")
+
+    # La 3e requête doit attendre la fin de la première fenêtre
+    assert time.monotonic() - start >= 0.09
+
+
+async def test_regions_are_independent():
+    limiter = RateLimiter("1:10")
+
+    await limiter.acquire("euw1", "m")
+    await asyncio.wait_for(limiter.acquire("europe", "m"), timeout=0.05)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(limiter.acquire("euw1", "m"), timeout=0.05)
+
+
+async def test_update_from_headers():
+    limiter = RateLimiter("20:1")
+    headers = {
+        "X-App-Rate-Limit": "20:1,100:120",
+        "X-App-Rate-Limit-Count": "3:1,40:120",
+        "X-Method-Rate-Limit": "2000:10",
+        "X-Method-Rate-Limit-Count": "7:10",
+    }
+
+    limiter.update("europe", "match.by_id", headers)
+
+    status = limiter.snapshot()["europe"]
+    assert [(b["limit"], b["used"]) for b in status["app"]] == [(20, 3), (100, 40)]
+    assert status["methods"]["match.by_id"][0]["used"] == 7
+
+
+async def test_method_limit_blocks_only_that_method():
+    limiter = RateLimiter("100:10")
+    limiter.update("euw1", "league.by_puuid", {"X-Method-Rate-Limit": "1:10", "X-Method-Rate-Limit-Count": "1:10"})
+
+    await asyncio.wait_for(limiter.acquire("euw1", "summoner.by_puuid"), timeout=0.05)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(limiter.acquire("euw1", "league.by_puuid"), timeout=0.05)
+
+
+async def test_block_honors_retry_after():
+    limiter = RateLimiter("100:10")
+    limiter.block("euw1", "summoner.by_puuid", 0.1, "application")
+
+    assert limiter.snapshot()["euw1"]["blocked_for"] > 0
+
+    start = time.monotonic()
+    await limiter.acquire("euw1", "league.by_puuid")
+    assert time.monotonic() - start >= 0.09
+
+
+async def test_interactive_requests_jump_the_queue():
+    """Une commande slash passe devant les requêtes de fond déjà en attente."""
+    limiter = RateLimiter("1:0.05")
+    await limiter.acquire("euw1", "m")  # Le seau est plein
+
+    order = []
+
+    async def request(name, priority):
+        await limiter.acquire("euw1", "m", priority)
+        order.append(name)
+
+    background = [asyncio.create_task(request(f"refresh{i}", Priority.REFRESH)) for i in range(2)]
+    await asyncio.sleep(0)
+    backfill = asyncio.create_task(request("backfill", Priority.BACKFILL))
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(request("interactive", Priority.INTERACTIVE))
+    await asyncio.sleep(0)
+
+    assert limiter.pending()["euw1"] == {"interactive": 1, "refresh": 2, "backfill": 1}
+
+    await asyncio.gather(*background, backfill, interactive)
+
+    assert order == ["interactive", "refresh0", "refresh1", "backfill"]
+    assert limiter.pending() == {}
+
+
+async def test_blocked_method_does_not_stall_other_methods():
+    """Une requête en attente sur une méthode bloquée ne retient pas les autres méthodes de la région."""
+    limiter = RateLimiter("100:10")
+    limiter.block("europe", "match.by_id", 2.0)
+
+    queued = asyncio.create_task(limiter.acquire("europe", "match.by_id", Priority.INTERACTIVE))
+    await asyncio.sleep(0.01)
+
+    start = time.monotonic()
+    await asyncio.wait_for(limiter.acquire("europe", "account.by_riot_id", Priority.INTERACTIVE), timeout=0.5)
+    assert time.monotonic() - start < 0.1
+
+    # Un seau de méthode plein ne retient pas non plus les autres méthodes
+    limiter.update("europe", "league.by_puuid", {"X-Method-Rate-Limit": "1:10", "X-Method-Rate-Limit-Count": "1:10"})
+    full = asyncio.create_task(limiter.acquire("europe", "league.by_puuid", Priority.INTERACTIVE))
+    await asyncio.sleep(0.01)
+    await asyncio.wait_for(limiter.acquire("europe", "summoner.by_puuid", Priority.BACKFILL), timeout=0.5)
+
+    assert limiter.pending()["europe"]["interactive"] == 2
+    for task in (queued, full):
+        task.cancel()
+    await asyncio.gather(queued, full, return_exceptions=True)
+    assert limiter.pending() == {}
+
+
+async def test_block_while_waiting_hands_over_to_other_methods():
+    """Une méthode bloquée alors que ses requêtes attendent déjà ne retient pas les autres méthodes."""
+    limiter = RateLimiter("1:0.2")
+    await limiter.acquire("euw1", "mA")  # Le seau applicatif est plein
+
+    first = asyncio.create_task(limiter.acquire("euw1", "mA"))
+    await asyncio.sleep(0.01)
+    start = time.monotonic()
+    second = asyncio.create_task(limiter.acquire("euw1", "mB"))
+    await asyncio.sleep(0.01)
+
+    limiter.block("euw1", "mA", 3.0)
+
+    await asyncio.wait_for(second, timeout=1)
+    assert time.monotonic() - start < 0.5
+    assert not first.done()
+
+    first.cancel()
+    await asyncio.gather(first, return_exceptions=True)
+
+
+async def test_cancelled_waiter_leaves_the_queue():
+    limiter = RateLimiter("1:10")
+    await limiter.acquire("euw1", "m")
+
+    waiter = asyncio.create_task(limiter.acquire("euw1", "m", Priority.REFRESH))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert limiter.pending() == {}
@@ -0,0 +1,60 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+from src.utils.refresh_coordinator import RefreshCoordinator
+
+
+async def test_burst_is_coalesced():
+    callback = AsyncMock()
+    coordinator = RefreshCoordinator(callback, delay=0.05, max_delay=1)
+
+    for _ in range(10):
+        coordinator.request(1)
+    coordinator.request(2)
+    await asyncio.sleep(0.1)
+
+    assert sorted(call.args[0] for call in callback.await_args_list) == [1, 2]
+    assert coordinator.pending() == set()
+
+
+async def test_max_delay_is_guaranteed():
+    callback = AsyncMock()
+    coordinator = RefreshCoordinator(callback, delay=0.1, max_delay=0.2)
+
+    # Demandes continues : sans latence maximale, le rafraîchissement serait repoussé indéfiniment
+    for _ in range(6):
+        coordinator.request(1)
+        await asyncio.sleep(0.05)
+
+    callback.assert_awaited_once_with(1)
+    coordinator.cancel()
+
+
+async def test_request_during_refresh_schedules_another():
+    coordinator = RefreshCoordinator(AsyncMock(), delay=0.01)
+    coordinator.callback = AsyncMock(side_effect=lambda key: coordinator.request(key))
+
+    coordinator.request(1)
+    await asyncio.sleep(0.03)
+
+    assert coordinator.callback.await_count >= 1
+    assert coordinator.pending() == {1}
+    coordinator.cancel()
+
+
+async def test_flush_and_cancel():
+    callback = AsyncMock(side_effect=[RuntimeError("Discord indisponible"), None])
+    coordinator = RefreshCoordinator(callback, delay=60)
+
+    coordinator.request(1)
+    coordinator.request(2)
+    # Une erreur sur une clé n'empêche pas les autres
+    await coordinator.flush()
+    assert callback.await_count == 2
+    assert coordinator.pending() == set()
+
+    coordinator.request(3)
+    coordinator.cancel()
+    await asyncio.sleep(0)
+    assert coordinator.pending() == set()
+    assert callback.await_count == 2
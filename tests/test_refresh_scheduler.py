@@ -0,0 +1,40 @@
+import random
+
+import pytest
+
+from src.lol.refresh_scheduler import RefreshScheduler
+
+
+def test_slots_cover_every_player_once():
+    scheduler = RefreshScheduler(interval=3600, slots=12)
+    puuids = [f"puuid-{i}" for i in range(1200)]
+
+    shards = [scheduler.shard(puuids, slot) for slot in range(12)]
+
+    assert set().union(*shards) == set(puuids)
+    assert sum(len(shard) for shard in shards) == len(puuids)
+    # Répartition uniforme : aucun créneau ne concentre les joueurs
+    assert all(60 <= len(shard) <= 140 for shard in shards)
+
+
+def test_slot_is_stable():
+    assert RefreshScheduler(slots=12).slot_of("puuid") == RefreshScheduler(slots=12).slot_of("puuid")
+
+
+def test_next_slot_cycles_through_all_slots():
+    scheduler = RefreshScheduler(slots=4)
+
+    assert sorted(scheduler.next_slot() for _ in range(4)) == [0, 1, 2, 3]
+
+
+def test_delay_stays_within_slot():
+    scheduler = RefreshScheduler(interval=600, slots=10, jitter=0.5, rng=random.Random(0))
+
+    assert scheduler.slot_seconds == 60
+    assert all(0 <= scheduler.delay() <= 30 for _ in range(100))
+    assert RefreshScheduler(jitter=0).delay() == 0
+
+
+def test_invalid_slots():
+    with pytest.raises(ValueError):
+        RefreshScheduler(slots=0)
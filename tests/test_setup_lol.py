@@ -1,4 +1,6 @@
-from datetime import datetime
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock
 
 import discord
@@ -8,6 +10,11 @@ from discord.ext import commands
 
 from src.cogs.setup_lol import SetupLol
 from src.lol.exceptions import InvalidApiKey, PlayerNotFound, RateLimited
+from src.lol.lp_history import DAY
+from src.lol.rate_limiter import Priority
+from src.lol.refresh_scheduler import RefreshScheduler
+from src.storage.yaml_storage import YamlStorage
+from src.storage.yaml_store import YamlStore
 
 # ============================================================================
 # FIXTURES
@@ -28,8 +35,10 @@ def bot():
 def league_service():
     """Mock du service League of Legends."""
     s = MagicMock()
-    s.get_puuid = MagicMock()
-    s.make_profile = MagicMock()
+    s.get_puuid = AsyncMock()
+    s.get_account = AsyncMock()
+    s.make_profile = AsyncMock()
+    s.close = AsyncMock()
     return s
 
 
@@ -47,6 +56,9 @@ def cog(bot, league_service, tmp_path):
         config_path=str(config_file),
         history_path=str(history_file),
         start_tasks=False,
+        storage=YamlStorage(str(db_file), str(config_file), str(history_file), store=YamlStore()),
+        # Un seul créneau, sans délai : chaque passage rafraîchit tous les joueurs
+        refresh_scheduler=RefreshScheduler(slots=1, jitter=0),
     )
 
     # Annulation des tâches pour éviter qu'elles tournent pendant les tests
@@ -121,15 +133,17 @@ class TestLolLink:
     @pytest.mark.asyncio
     async def test_lol_link_success_full(self, cog, interaction, league_service):
         """Test lien de compte complet avec initialisation tracking."""
-        league_service.get_puuid.return_value = "puuid_123"
+        league_service.get_account.return_value = {"puuid": "puuid_123", "gameName": "Joueur", "tagLine": "EUW"}
         # Simulation d'un profil classé pour déclencher le tracking
         league_service.make_profile.return_value = {"rankedStats": {"soloq": {"tier": "GOLD", "rank": "IV", "lp": 0}, "flex": None}}
 
-        await cog.lol_link.callback(cog, interaction, "Joueur#EUW")
+        await cog.lol_link.callback(cog, interaction, "joueur#euw")
 
-        # Vérifier sauvegarde user
+        # Vérifier sauvegarde user, avec le Riot ID écrit comme chez Riot
         users = cog._load_users()
         assert users[str(interaction.user.id)]["puuid"] == "puuid_123"
+        assert (users[str(interaction.user.id)]["pseudo"], users[str(interaction.user.id)]["tag"]) == ("Joueur", "EUW")
+        league_service.make_profile.assert_awaited_once_with("puuid_123", riot_id=("Joueur", "EUW"))
 
         # Vérifier tracking initialisé
         tracking = cog._load_lp_tracking()
@@ -139,8 +153,8 @@ class TestLolLink:
     @pytest.mark.asyncio
     async def test_lol_link_tracking_fail_sliently(self, cog, interaction, league_service):
         """Test lien réussi même si l'initialisation du tracking échoue (API down)."""
-        league_service.get_puuid.return_value = "puuid_123"
-        # get_puuid marche, mais make_profile plante
+        league_service.get_account.return_value = {"puuid": "puuid_123", "gameName": "Joueur", "tagLine": "EUW"}
+        # get_account marche, mais make_profile plante
         league_service.make_profile.side_effect = Exception("API Error")
 
         await cog.lol_link.callback(cog, interaction, "Joueur#EUW")
@@ -159,21 +173,52 @@ class TestLolLink:
         assert embed is not None
         assert "Compte lié avec succès" in embed.title
 
+    @pytest.mark.asyncio
+    async def test_lol_link_refreshes_only_the_player_guilds(self, cog, interaction, bot, league_service):
+        """Le link ne récupère que le nouveau joueur et ne met à jour que les leaderboards de ses serveurs."""
+        ranked = {"tier": "GOLD", "rank": "IV", "lp": 0, "wins": 5, "losses": 5, "winrate": 50.0}
+        cog._save_user(2, "uid_other", "Other", "EUW", stats={"name": "Other", "tag": "EUW", "level": 30, "soloq": ranked})
+        cog._save_config(111, 222, 333, "soloq")
+        cog._save_config(444, 555, 666, "soloq")
+
+        member_guild, other_guild = MagicMock(), MagicMock()
+        member_guild.name = other_guild.name = "Guild"
+        other_guild.get_member.side_effect = lambda d_id: d_id == 2 or None
+        bot.get_guild.side_effect = {111: member_guild, 444: other_guild}.get
+        message = MagicMock(edit=AsyncMock())
+        member_guild.get_channel.return_value = MagicMock(get_partial_message=MagicMock(return_value=message))
+
+        league_service.get_account.return_value = {"puuid": "puuid_123", "gameName": "Joueur", "tagLine": "EUW"}
+        league_service.make_profile.return_value = {"name": "Joueur", "tag": "EUW", "level": 30, "rankedStats": {"soloq": ranked, "flex": None}}
+
+        await cog.lol_link.callback(cog, interaction, "Joueur#EUW")
+
+        # Mise à jour différée, regroupée par serveur
+        assert cog._board_refresher.pending() == {"111"}
+        await cog._board_refresher.flush()
+
+        league_service.make_profile.assert_awaited_once()
+        other_guild.get_channel.assert_not_called()
+        embed = message.edit.await_args.kwargs["embed"]
+        # L'autre joueur vient de son cache, sans passer le leaderboard en mode hors-ligne
+        assert "Joueur#EUW" in embed.description and "Other#EUW" in embed.description
+        assert "Hors-Ligne" not in embed.title
+
     @pytest.mark.asyncio
     async def test_lol_link_errors(self, cog, interaction, league_service):
         """Test des différentes erreurs possibles lors du lien."""
         # Cas 1: PlayerNotFound
-        league_service.get_puuid.side_effect = PlayerNotFound()
+        league_service.get_account.side_effect = PlayerNotFound()
         await cog.lol_link.callback(cog, interaction, "Inconnu#TAG")
         assert "Impossible de trouver" in interaction.followup.send.call_args[0][0]
 
         # Cas 2: RateLimited
-        league_service.get_puuid.side_effect = RateLimited()
+        league_service.get_account.side_effect = RateLimited()
         await cog.lol_link.callback(cog, interaction, "Spam#TAG")
         assert "Trop de requêtes" in interaction.followup.send.call_args[0][0]
 
         # Cas 3: InvalidApiKey
-        league_service.get_puuid.side_effect = InvalidApiKey()
+        league_service.get_account.side_effect = InvalidApiKey()
         await cog.lol_link.callback(cog, interaction, "Key#TAG")
         assert "Clé API invalide" in interaction.followup.send.call_args[0][0]
 
@@ -305,15 +350,201 @@ class TestTasksEdgeCases:
 
         guild = MagicMock()
         channel = MagicMock()
-        # fetch_message lève NotFound
-        # CORRECTION: fetch_message est async, donc side_effect sur un AsyncMock ou résultat awaitable
-        channel.fetch_message = AsyncMock(side_effect=discord.NotFound(MagicMock(), "Msg gone"))
+        channel.id = 222
+        # L'edit direct (sans fetch_message) lève NotFound : le message est recréé
+        channel.get_partial_message.return_value.edit = AsyncMock(side_effect=discord.NotFound(MagicMock(), "Msg gone"))
+        channel.send = AsyncMock(return_value=MagicMock(id=777))
 
         bot.get_guild.return_value = guild
         guild.get_channel.return_value = channel
 
         await cog.refresh_leaderboard()
-        # Succès si pas de crash
+
+        channel.get_partial_message.assert_called_once_with(333)
+        channel.send.assert_awaited_once()
+        assert cog._load_config()["leaderboards"]["111"]["soloq"] == {"channel_id": 222, "message_id": 777}
+
+    @pytest.mark.asyncio
+    async def test_refresh_leaderboard_fetches_each_player_once(self, cog, bot, league_service):
+        """Un joueur présent dans 2 serveurs avec 2 leaderboards chacun n'est récupéré qu'une fois."""
+        for guild_id in (111, 444):
+            cog._save_config(guild_id, 222, guild_id + 1, "soloq")
+            cog._save_config(guild_id, 222, guild_id + 2, "flex")
+        cog._save_user(1, "uid", "Name", "Tag", stats=None)
+
+        guild = MagicMock()
+        guild.name = "Guild"
+        channel = MagicMock()
+        message = MagicMock()
+        message.edit = AsyncMock()
+        channel.get_partial_message.return_value = message
+        guild.get_channel.return_value = channel
+        bot.get_guild.return_value = guild
+
+        league_service.make_profile.return_value = {
+            "name": "Name",
+            "tag": "Tag",
+            "level": 30,
+            "rankedStats": {"soloq": {"tier": "GOLD", "rank": "I", "lp": 10, "wins": 5, "losses": 5, "winrate": 50.0}, "flex": None},
+        }
+
+        await cog.refresh_leaderboard()
+
+        league_service.make_profile.assert_awaited_once()
+        assert message.edit.await_count == 4
+        # Les deux files sont gardées en cache pour le mode hors-ligne
+        cached = cog._load_users()["1"]["cached_stats"]
+        assert cached["soloq"]["tier"] == "GOLD"
+        assert "flex" in cached
+        # Le rang observé est ajouté au journal LP (GOLD I 10 LP = 1510)
+        assert [lp for _, lp in cog.lp_history.samples("uid", "soloq")] == [1510]
+        assert cog.lp_history.samples("uid", "flex") == []
+
+    @pytest.mark.asyncio
+    async def test_refresh_leaderboard_writes_users_once(self, cog, bot, league_service):
+        """Les stats en cache de tous les joueurs sont écrites en une seule fois."""
+        cog._save_config(111, 222, 333, "soloq")
+        for d_id in range(1, 4):
+            cog._save_user(d_id, f"uid{d_id}", f"Name{d_id}", "Tag", stats=None)
+
+        guild = MagicMock()
+        guild.name = "Guild"
+        channel = MagicMock()
+        channel.get_partial_message.return_value = MagicMock(edit=AsyncMock())
+        guild.get_channel.return_value = channel
+        bot.get_guild.return_value = guild
+
+        league_service.make_profile.side_effect = lambda puuid, **kwargs: {
+            "name": puuid,
+            "tag": "Tag",
+            "level": 30,
+            "rankedStats": {"soloq": {"tier": "GOLD", "rank": "I", "lp": 10, "wins": 5, "losses": 5, "winrate": 50.0}, "flex": None},
+        }
+
+        cog._save_user = MagicMock(wraps=cog._save_user)
+        cog._save_users = MagicMock(wraps=cog._save_users)
+
+        await cog.refresh_leaderboard()
+
+        cog._save_user.assert_not_called()
+        cog._save_users.assert_called_once()
+        users = cog._load_users()
+        assert all(users[str(d_id)]["cached_stats"]["name"] == f"uid{d_id}" for d_id in range(1, 4))
+
+    @pytest.mark.asyncio
+    async def test_refresh_leaderboard_skips_unchanged_boards(self, cog, bot, league_service):
+        """Un leaderboard identique à celui déjà affiché n'est ni récupéré ni édité."""
+        cog._save_config(111, 222, 333, "soloq")
+        cog._save_user(1, "uid", "Name", "Tag", stats=None)
+
+        guild = MagicMock()
+        guild.name = "Guild"
+        message = MagicMock(edit=AsyncMock())
+        channel = MagicMock()
+        channel.get_partial_message.return_value = message
+        guild.get_channel.return_value = channel
+        bot.get_guild.return_value = guild
+
+        ranked = {"tier": "GOLD", "rank": "I", "lp": 10, "wins": 5, "losses": 5, "winrate": 50.0}
+        league_service.make_profile.return_value = {"name": "Name", "tag": "Tag", "level": 30, "rankedStats": {"soloq": ranked, "flex": None}}
+
+        await cog.refresh_leaderboard()
+        await cog.refresh_leaderboard()
+
+        channel.get_partial_message.assert_called_once_with(333)
+        message.edit.assert_awaited_once()
+
+        # Le LP a changé : le message est de nouveau édité
+        league_service.make_profile.return_value = {
+            "name": "Name",
+            "tag": "Tag",
+            "level": 30,
+            "rankedStats": {"soloq": {**ranked, "lp": 30}, "flex": None},
+        }
+        await cog.refresh_leaderboard()
+
+        assert message.edit.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_boards_are_updated_concurrently_per_channel(self, cog, bot):
+        """Un salon lent ne bloque pas les autres ; les messages d'un même salon passent l'un après l'autre."""
+        cog._save_config(111, 1, 11, "soloq")
+        cog._save_config(111, 1, 12, "flex")
+        cog._save_config(444, 2, 21, "soloq")
+
+        released = asyncio.Event()
+        active: dict[int, int] = {1: 0, 2: 0}
+        edited = []
+
+        def make_message(channel_id, message_id):
+            async def edit(**kwargs):
+                active[channel_id] += 1
+                assert active[channel_id] == 1  # Jamais deux edits simultanés dans un même salon
+                if channel_id == 1:
+                    # Le salon 1 attend que le salon 2 ait été mis à jour pendant ce temps
+                    await asyncio.wait_for(released.wait(), timeout=1)
+                else:
+                    released.set()
+                edited.append(message_id)
+                active[channel_id] -= 1
+
+            return MagicMock(edit=edit)
+
+        def make_channel(channel_id):
+            channel = MagicMock(id=channel_id)
+            channel.get_partial_message.side_effect = lambda message_id: make_message(channel_id, message_id)
+            return channel
+
+        channels = {1: make_channel(1), 2: make_channel(2)}
+        guild = MagicMock()
+        guild.get_channel.side_effect = channels.get
+        bot.get_guild.return_value = guild
+
+        async def render(guild, queue_type):
+            return discord.Embed(title=queue_type)
+
+        await cog._update_boards(cog._load_config(), "leaderboard", render)
+
+        assert edited[0] == 21
+        assert sorted(edited) == [11, 12, 21]
+
+    @pytest.mark.asyncio
+    async def test_refresh_leaderboard_only_fetches_current_slot(self, cog, bot, league_service):
+        """Un passage n'interroge que le créneau courant ; les autres joueurs viennent du cache, sans mode hors-ligne."""
+        cog.refresh_scheduler = RefreshScheduler(slots=2, jitter=0)
+        cog._save_config(111, 222, 333, "soloq")
+        stats = {"name": "Cached", "tag": "Tag", "level": 30, "soloq": {"tier": "SILVER", "rank": "I", "lp": 0, "wins": 1, "losses": 1, "winrate": 50.0}}
+        puuids = [f"uid{d_id}" for d_id in range(1, 9)]
+        for d_id, puuid in enumerate(puuids, start=1):
+            cog._save_user(d_id, puuid, f"Name{d_id}", "Tag", stats=stats)
+
+        guild = MagicMock()
+        guild.name = "Guild"
+        message = MagicMock(edit=AsyncMock())
+        guild.get_channel.return_value = MagicMock(get_partial_message=MagicMock(return_value=message))
+        bot.get_guild.return_value = guild
+
+        league_service.make_profile.side_effect = lambda puuid, **kwargs: {
+            "name": puuid,
+            "tag": "Tag",
+            "level": 30,
+            "rankedStats": {"soloq": {"tier": "GOLD", "rank": "I", "lp": 10, "wins": 5, "losses": 5, "winrate": 50.0}, "flex": None},
+        }
+
+        slot = cog.refresh_scheduler._cursor
+        await cog.refresh_leaderboard()
+
+        fetched = {call.args[0] for call in league_service.make_profile.await_args_list}
+        assert fetched == cog.refresh_scheduler.shard(puuids, slot)
+        assert set(cog._profiles) == fetched
+        embed = message.edit.await_args.kwargs["embed"]
+        assert "Hors-Ligne" not in embed.title
+
+        # Le passage suivant couvre le reste : tous les joueurs ont été rafraîchis en un intervalle
+        await cog.refresh_leaderboard()
+
+        assert league_service.make_profile.await_count == len(puuids)
+        assert set(cog._profiles) == set(puuids)
 
     @pytest.mark.asyncio
     async def test_daily_lp_reset_logic(self, cog, league_service):
@@ -325,7 +556,9 @@ class TestTasksEdgeCases:
 
         # API dit 1100 LP aujourd'hui
         league_service.make_profile.return_value = {
-            "rankedStats": {"soloq": {"tier": "SILVER", "rank": "II", "lp": 100}, "flex": None}  # 800+200+100=1100
+            "name": "Renamed",
+            "tag": "EUW",
+            "rankedStats": {"soloq": {"tier": "SILVER", "rank": "II", "lp": 100}, "flex": None},  # 800+200+100=1100
         }
 
         await cog.daily_lp_reset()
@@ -334,9 +567,44 @@ class TestTasksEdgeCases:
         # daily_lp doit être mis à jour à 1100 pour le nouveau jour
         assert new_tracking["1"]["soloq"]["daily_lp"] == 1100
         assert new_tracking["1"]["soloq"]["last_reset"] == datetime.utcnow().strftime("%d/%m/%Y")
+        # Le reset quotidien relit le compte Riot : les renommages sont reportés
+        league_service.make_profile.assert_awaited_with("uid", riot_id=None, priority=Priority.REFRESH)
+        user = cog._load_users()["1"]
+        assert (user["pseudo"], user["tag"]) == ("Renamed", "EUW")
+
+    @pytest.mark.asyncio
+    async def test_daily_lp_reset_retries_only_failed_players(self, cog, league_service):
+        """Les joueurs en échec à minuit sont réessayés seuls, avec la date du reset."""
+        cog._save_user(1, "uid1", "Ok", "Tag", stats=None)
+        cog._save_user(2, "uid2", "Down", "Tag", stats=None)
+        ranked = {"rankedStats": {"soloq": {"tier": "SILVER", "rank": "II", "lp": 100}, "flex": None}}
+
+        async def make_profile(puuid, **kwargs):
+            if puuid == "uid2":
+                raise RateLimited()
+            return ranked
+
+        league_service.make_profile.side_effect = make_profile
+        await cog.daily_lp_reset()
+
+        assert set(cog._load_lp_tracking()) == {"1"}
+        assert set(cog._pending_resets) == {"2"}
+
+        # Plus tard dans la nuit, l'API répond : seul le joueur en échec est interrogé
+        league_service.make_profile.reset_mock(side_effect=True)
+        league_service.make_profile.return_value = ranked
+        cog._reset_day = "01/01/2026"
+        cog._update_lp_recaps = AsyncMock()
+        await cog.retry_failed_resets.coro(cog)
+
+        league_service.make_profile.assert_awaited_once_with("uid2", riot_id=("Down", "Tag"), priority=Priority.REFRESH)
+        assert cog._load_lp_tracking()["2"]["soloq"] == {"start_lp": 1100, "start_date": "01/01/2026", "daily_lp": 1100, "last_reset": "01/01/2026"}
+        assert cog._pending_resets == {}
+        # Les récapitulatifs sont reconstruits avec le joueur rattrapé
+        cog._update_lp_recaps.assert_awaited_once()
 
     @pytest.mark.asyncio
-    async def test_daily_lp_reset_recap_update(self, cog, bot):
+    async def test_daily_lp_reset_recap_update(self, cog, bot, league_service):
         """Test que le reset met aussi à jour les messages de recap."""
         # Config recap
         cog._save_config(111, 222, 333, "soloq", "lp_recap")
@@ -350,16 +618,25 @@ class TestTasksEdgeCases:
         bot.get_guild.return_value = guild
         guild.get_channel.return_value = channel
 
-        # CORRECTION CRITIQUE : fetch_message est appelé avec await, donc il faut un AsyncMock
-        channel.fetch_message = AsyncMock(return_value=message)
+        # Edit direct par ID, sans fetch_message
+        channel.get_partial_message.return_value = message
 
-        # User fictif pour générer du contenu
+        # Joueur suivi depuis la veille, renommé entre-temps côté Riot
+        soloq = {"tier": "GOLD", "rank": "IV", "lp": 50, "wins": 10, "losses": 10, "winrate": 50.0}
         cog._save_user(1, "uid", "P", "T", stats=None)
+        cog._save_lp_tracking(
+            {"1": {"soloq": {"start_lp": 0, "start_date": "01/01/2026", "daily_lp": cog._get_total_lp(soloq) - 20, "last_reset": "01/01/2026"}}}
+        )
+        league_service.make_profile.return_value = {"name": "NewP", "tag": "NT", "level": 30, "rankedStats": {"soloq": soloq, "flex": None}}
 
         await cog.daily_lp_reset()
 
-        # Vérifier que le message a été édité
+        league_service.make_profile.assert_awaited_once_with("uid", riot_id=None, priority=Priority.REFRESH)
+        assert cog.storage.get_user("1")["pseudo"] == "NewP"
+
+        # Le recap est réédité avec le nouveau Riot ID et la variation de la journée
         message.edit.assert_called_once()
+        assert "NewP#NT : +20 LP" in message.edit.call_args.kwargs["embed"].description
 
 
 # ============================================================================
@@ -392,19 +669,128 @@ class TestEmbeds:
 
         assert "Mode Hors-Ligne" in embed.title
         assert "CacheUser" in embed.description  # Utilise le cache
+        assert cog.league_service.make_profile.await_args.kwargs["priority"] == Priority.INTERACTIVE
 
     @pytest.mark.asyncio
     async def test_create_lp_recap_embed_content(self, cog):
-        """Test le contenu visuel du recap."""
+        """Test le contenu visuel du recap, construit depuis le tracking enregistré."""
         guild = MagicMock()
         cog._save_user(1, "uid", "Player", "Tag", stats=None)
+        cog._save_user(2, "uid2", "Newcomer", "Tag", stats=None)
 
-        # Tracking: 1000 LP. Actuel: 1050 LP. Diff: +50
-        cog._save_lp_tracking({"1": {"soloq": {"daily_lp": 1000}}})
-
-        cog.league_service.make_profile.return_value = {"rankedStats": {"soloq": {"tier": "SILVER", "rank": "II", "lp": 50}, "flex": None}}  # 1050 total
+        # Référence de la veille : 1000 LP. Référence du jour : 1050 LP. Diff: +50
+        cog._save_lp_tracking(
+            {
+                "1": {"soloq": {"daily_lp": 1050, "last_reset": "15/10/2026", "previous_daily_lp": 1000, "previous_reset": "14/10/2026"}},
+                "2": {"soloq": {"daily_lp": 800, "last_reset": "15/10/2026"}},  # Pas encore de journée complète
+            }
+        )
 
-        embed = await cog._create_lp_recap_embed(guild, "soloq")
+        cog._reset_day = "15/10/2026"
+        embed = cog._create_lp_recap_embed(guild, "soloq")
 
         assert "+50 LP" in embed.description
         assert "📈" in embed.description  # Emoji gain
+        assert "Newcomer" not in embed.description
+        assert "Récolte du 14/10 au 15/10" in embed.footer.text
+        cog.league_service.make_profile.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_lp_recap_skips_players_whose_reset_failed(self, cog, league_service):
+        """Un joueur dont le profil est indisponible à minuit n'apparaît pas avec la variation de la veille."""
+        now = datetime.now(timezone.utc)
+        yesterday, before = ((now - timedelta(days=days)).strftime("%d/%m/%Y") for days in (1, 2))
+        cog._save_user(1, "uid_failed", "Failed", "Tag", stats=None)
+        cog._save_user(2, "uid_ok", "Ok", "Tag", stats=None)
+        cog._save_lp_tracking(
+            {
+                "1": {"soloq": {"daily_lp": 1080, "last_reset": yesterday, "previous_daily_lp": 1000, "previous_reset": before}},
+                "2": {"soloq": {"daily_lp": 1000, "last_reset": yesterday}},
+            }
+        )
+
+        async def make_profile(puuid, **kwargs):
+            if puuid == "uid_failed":
+                raise Exception("API Error")
+            return {"rankedStats": {"soloq": {"tier": "SILVER", "rank": "II", "lp": 20}, "flex": None}}  # 1020 total
+
+        league_service.make_profile.side_effect = make_profile
+        await cog.daily_lp_reset()
+
+        embed = cog._create_lp_recap_embed(MagicMock(), "soloq")
+
+        assert "Failed" not in embed.description
+        assert "Ok#Tag : +20 LP" in embed.description
+        assert embed.footer.text.endswith(f"Récolte du {now - timedelta(days=1):%d/%m} au {now:%d/%m}")
+
+    @pytest.mark.asyncio
+    async def test_reset_keeps_previous_baseline(self, cog):
+        """Le reset garde la référence de la veille ; un reset forcé le même jour ne l'écrase pas."""
+        tracking = {"1": {"soloq": {"daily_lp": 1000, "last_reset": "14/10/2026"}}}
+        u_data = {"puuid": "uid", "pseudo": "Player", "tag": "Tag"}
+        profile = {"rankedStats": {"soloq": {"tier": "SILVER", "rank": "II", "lp": 50}, "flex": None}}  # 1050 total
+
+        cog._apply_daily_reset(tracking, "1", u_data, profile, "15/10/2026")
+        cog._apply_daily_reset(tracking, "1", u_data, profile, "15/10/2026")
+
+        assert tracking["1"]["soloq"] == {
+            "daily_lp": 1050,
+            "last_reset": "15/10/2026",
+            "previous_daily_lp": 1000,
+            "previous_reset": "14/10/2026",
+        }
+
+
+# ============================================================================
+# TESTS COMMANDES : /lol_lp_progress
+# ============================================================================
+
+
+class TestLpProgress:
+    @pytest.mark.asyncio
+    async def test_lp_progress_guild_ranking(self, cog, interaction):
+        """Classement du serveur par LP gagnés sur la semaine, depuis l'historique."""
+        now = int(time.time())
+        cog._save_user(1, "uid1", "Alpha", "EUW", stats=None)
+        cog._save_user(2, "uid2", "Beta", "EUW", stats=None)
+        cog._save_user(3, "uid3", "Absent", "EUW", stats=None)
+        cog.lp_history.record_many([("uid1", "soloq", 1200), ("uid2", "soloq", 1500)], timestamp=now - 10 * DAY)
+        cog.lp_history.record_many([("uid1", "soloq", 1300), ("uid2", "soloq", 1400)], timestamp=now - 3 * DAY)
+        cog.lp_history.record_many([("uid1", "soloq", 1250), ("uid2", "soloq", 1420)], timestamp=now - DAY)
+        interaction.guild.get_member.side_effect = lambda d_id: MagicMock() if d_id in (1, 2) else None
+
+        await cog.lol_lp_progress.callback(cog, interaction, "week", "soloq", None)
+
+        embed = interaction.response.send_message.call_args.kwargs["embed"]
+        assert embed.description.splitlines() == [
+            "📈 Alpha#EUW : +50 LP (pic +100, creux +0)",
+            "📉 Beta#EUW : -80 LP (pic +0, creux -100)",
+        ]
+        cog.league_service.make_profile.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_lp_progress_single_member_season(self, cog, interaction):
+        """Progression d'un seul joueur depuis le début de saison."""
+        cog.season_start = datetime.now(timezone.utc) - timedelta(days=100)
+        now = int(time.time())
+        cog._save_user(1, "uid1", "Alpha", "EUW", stats=None)
+        cog.lp_history.record("uid1", "flex", 800, timestamp=now - 90 * DAY)
+        cog.lp_history.record("uid1", "flex", 1100, timestamp=now - 5 * DAY)
+        member = MagicMock(spec=discord.Member)
+        member.id = 1
+
+        await cog.lol_lp_progress.callback(cog, interaction, "season", "flex", member)
+
+        embed = interaction.response.send_message.call_args.kwargs["embed"]
+        assert embed.description == "📈 Alpha#EUW : +300 LP (pic +300, creux +0)"
+        assert "Saison" in embed.title
+
+    @pytest.mark.asyncio
+    async def test_lp_progress_without_history(self, cog, interaction):
+        member = MagicMock(spec=discord.Member)
+        member.id = 42
+
+        await cog.lol_lp_progress.callback(cog, interaction, "month", "soloq", member)
+
+        embed = interaction.response.send_message.call_args.kwargs["embed"]
+        assert embed.description == "Aucune donnée disponible"
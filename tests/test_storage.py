@@ -0,0 +1,87 @@
+import pytest
+import yaml
+
+from src.storage.sqlite_storage import SqliteStorage, import_from
+from src.storage.yaml_storage import YamlStorage
+
+
+@pytest.fixture(params=["yaml", "sqlite"])
+def storage(request, tmp_path):
+    if request.param == "yaml":
+        s = YamlStorage(str(tmp_path / "users.yml"), str(tmp_path / "config.yml"), str(tmp_path / "lp_history.yml"))
+    else:
+        s = SqliteStorage(str(tmp_path / "floshy.db"))
+    yield s
+    s.close()
+
+
+def test_users_roundtrip(storage):
+    storage.upsert_user("1", {"puuid": "p1", "pseudo": "Name", "tag": "EUW"})
+    storage.upsert_user("2", {"puuid": "p2", "pseudo": "Other", "tag": "EUW", "cached_stats": {"name": "Other", "soloq": None}})
+
+    assert storage.get_user("1") == {"puuid": "p1", "pseudo": "Name", "tag": "EUW"}
+    assert storage.get_user("3") is None
+    assert storage.load_users()["2"]["cached_stats"] == {"name": "Other", "soloq": None}
+
+
+def test_upsert_users_keeps_other_users(storage):
+    storage.upsert_users({"1": {"puuid": "p1", "pseudo": "A", "tag": "T"}, "2": {"puuid": "p2", "pseudo": "B", "tag": "T"}})
+
+    storage.upsert_users({"2": {"puuid": "p2", "pseudo": "B2", "tag": "T"}})
+
+    users = storage.load_users()
+    assert users["1"]["pseudo"] == "A"
+    assert users["2"]["pseudo"] == "B2"
+
+
+def test_find_user_by_puuid(storage):
+    storage.upsert_users({"1": {"puuid": "p1", "pseudo": "A", "tag": "T"}, "2": {"puuid": "p2", "pseudo": "B", "tag": "T"}})
+
+    assert storage.find_user_by_puuid("p2") == ("2", {"puuid": "p2", "pseudo": "B", "tag": "T"})
+    assert storage.find_user_by_puuid("unknown") is None
+
+
+def test_boards_config(storage):
+    storage.upsert_board("leaderboard", "111", "soloq", 222, 333)
+    storage.upsert_board("leaderboard", "111", "flex", 222, 334)
+    storage.upsert_board("lp_recap", "111", "soloq", 222, 335)
+    storage.upsert_board("leaderboard", "111", "soloq", 222, 999)
+
+    assert storage.load_config() == {
+        "leaderboards": {"111": {"soloq": {"channel_id": 222, "message_id": 999}, "flex": {"channel_id": 222, "message_id": 334}}},
+        "lp_recaps": {"111": {"soloq": {"channel_id": 222, "message_id": 335}}},
+    }
+
+
+def test_lp_tracking_upsert_merges_queues(storage):
+    storage.upsert_lp_tracking({"1": {"soloq": {"daily_lp": 100}}})
+    storage.upsert_lp_tracking({"1": {"flex": {"daily_lp": 50}}, "2": {"soloq": {"daily_lp": 10}}})
+
+    assert storage.get_lp_tracking("1", "soloq") == {"daily_lp": 100}
+    assert storage.get_lp_tracking("1", "flex") == {"daily_lp": 50}
+    assert storage.get_lp_tracking("2", "flex") is None
+    assert set(storage.load_lp_tracking()) == {"1", "2"}
+
+
+def test_sqlite_uses_wal(tmp_path):
+    storage = SqliteStorage(str(tmp_path / "floshy.db"))
+
+    assert storage._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert storage.is_empty()
+    storage.close()
+
+
+def test_import_from_yaml(tmp_path):
+    (tmp_path / "users.yml").write_text(yaml.dump({123: {"puuid": "p1", "pseudo": "A", "tag": "T", "cached_stats": {"level": 30}}}))
+    (tmp_path / "config.yml").write_text(yaml.dump({"leaderboards": {"111": {"soloq": {"channel_id": 222, "message_id": 333}}}}))
+    (tmp_path / "lp_history.yml").write_text(yaml.dump({"123": {"soloq": {"start_lp": 1000, "daily_lp": 1020, "last_reset": "01/01/2026"}}}))
+    source = YamlStorage(str(tmp_path / "users.yml"), str(tmp_path / "config.yml"), str(tmp_path / "lp_history.yml"))
+    target = SqliteStorage(str(tmp_path / "floshy.db"))
+
+    import_from(source, target)
+
+    assert target.get_user("123") == {"puuid": "p1", "pseudo": "A", "tag": "T", "cached_stats": {"level": 30}}
+    assert target.load_config() == source.load_config()
+    assert target.get_lp_tracking("123", "soloq")["daily_lp"] == 1020
+    assert not target.is_empty()
+    target.close()
@@ -0,0 +1,120 @@
+import asyncio
+from unittest.mock import patch
+
+import yaml
+
+from src.storage.yaml_io import LIBYAML, dump_yaml, load_yaml
+from src.storage.yaml_store import YamlStore
+
+
+def test_file_is_read_once(tmp_path):
+    path = tmp_path / "data.yml"
+    path.write_text(yaml.dump({"a": 1}))
+    store = YamlStore()
+
+    assert store.get(str(path)) == {"a": 1}
+
+    # Le bot est le seul écrivain : les lectures suivantes viennent de la mémoire
+    path.write_text(yaml.dump({"a": 2}))
+    assert store.get(str(path)) == {"a": 1}
+
+
+def test_missing_file_is_empty(tmp_path):
+    store = YamlStore()
+
+    assert store.get(str(tmp_path / "missing.yml")) == {}
+
+
+def test_set_outside_event_loop_writes_immediately(tmp_path):
+    path = tmp_path / "data.yml"
+    store = YamlStore()
+
+    store.set(str(path), {"a": 1})
+
+    assert yaml.safe_load(path.read_text()) == {"a": 1}
+    assert not store.is_dirty(str(path))
+
+
+async def test_writes_are_coalesced(tmp_path):
+    path = str(tmp_path / "data.yml")
+    store = YamlStore(flush_delay=0.01)
+
+    with patch.object(store, "_write", wraps=store._write) as write:
+        for i in range(10):
+            store.set(path, {"count": i})
+        assert write.call_count == 0
+        assert store.is_dirty(path)
+
+        await asyncio.sleep(0.05)
+
+    write.assert_called_once()
+    with open(path) as f:
+        assert yaml.safe_load(f) == {"count": 9}
+
+
+async def test_flush_writes_pending_changes(tmp_path):
+    path = str(tmp_path / "data.yml")
+    store = YamlStore(flush_delay=60)
+
+    store.set(path, {"a": 1})
+    store.flush()
+
+    with open(path) as f:
+        assert yaml.safe_load(f) == {"a": 1}
+    assert not store.is_dirty(path)
+
+
+async def test_failed_write_stays_dirty(tmp_path):
+    path = str(tmp_path / "data.yml")
+    store = YamlStore(flush_delay=60)
+    store.set(path, {"a": 1})
+
+    with patch.object(store, "_write", side_effect=OSError("Disque plein")):
+        store.flush()
+    assert store.is_dirty(path)
+
+    store.flush()
+    assert not store.is_dirty(path)
+
+
+def test_writes_are_atomic(tmp_path):
+    path = tmp_path / "data.yml"
+    store = YamlStore()
+    store.set(str(path), {"a": 1})
+
+    # Arrêt brutal pendant l'écriture du fichier temporaire : l'ancien fichier est intact
+    with patch("src.storage.atomic.os.fsync", side_effect=OSError("Arrêt du conteneur")):
+        store.set(str(path), {"a": 2})
+
+    assert yaml.safe_load(path.read_text()) == {"a": 1}
+    assert [p.name for p in tmp_path.iterdir()] == ["data.yml"]
+
+
+def test_backups_are_rotated(tmp_path):
+    path = tmp_path / "data.yml"
+    store = YamlStore(backups=2)
+
+    for i in range(4):
+        store.set(str(path), {"version": i})
+
+    assert yaml.safe_load(path.read_text()) == {"version": 3}
+    assert yaml.safe_load((tmp_path / "data.yml.bak.1").read_text()) == {"version": 2}
+    assert yaml.safe_load((tmp_path / "data.yml.bak.2").read_text()) == {"version": 1}
+    assert not (tmp_path / "data.yml.bak.3").exists()
+
+
+def test_corrupt_file_falls_back_to_backup(tmp_path):
+    path = tmp_path / "data.yml"
+    YamlStore(backups=1).set(str(path), {"a": 1})
+    YamlStore(backups=1).set(str(path), {"a": 2})
+    path.write_text("a: [1, 2")
+
+    assert YamlStore().get(str(path)) == {"a": 1}
+
+
+def test_yaml_io_roundtrip():
+    data = {"123": {"pseudo": "Joueur é", "cached_stats": {"soloq": None, "level": 30}}}
+
+    assert load_yaml(dump_yaml(data)) == data
+    assert load_yaml("") == {}
+    assert LIBYAML == yaml.__with_libyaml__